@@ -1,24 +1,128 @@
 import asyncio
+import json
 import logging
+import os
+import time
 from datetime import datetime, timedelta, timezone
-import fastf1
-from fastf1.ergast import Ergast
-import pandas as pd
 from requests import session
-from database import safe_fetch_one
+from async_database import safe_fetch_one
 from get_now import get_now, SEASON
+from config import FASTEST_LAP_SOURCE, enable_fastf1_cache, schedule_cache_file, entrants_cache_file
+from config import enforce_cache_policy as _enforce_cache_policy
+from utils.lazy_import import LazyModule
+from metrics import fastf1_fetch_duration
+
+# fastf1 and pandas take seconds to import and are only needed here, so they
+# load on first use, or from preload() on a worker thread once the bot is up
+fastf1 = LazyModule("fastf1", on_load=enable_fastf1_cache)
+fastf1_ergast = LazyModule("fastf1.ergast", on_load=lambda _: fastf1.load())
+pd = LazyModule("pandas")
 
 logger = logging.getLogger(__name__)
 
-async def season_calender(season):
+SCHEDULE_TTL = float(os.getenv("SCHEDULE_CACHE_TTL", 6 * 3600))
+
+# Bounds concurrent session loads and Ergast fetches; each parses a lot of data
+# on a worker thread. enforce_cache_policy() takes every slot, so the HTTP cache
+# is never purged under a running request.
+FASTF1_FETCH_SLOTS = int(os.getenv("FASTF1_SESSION_LOADS", 4))
+_session_load_slots = asyncio.Semaphore(FASTF1_FETCH_SLOTS)
+_cache_maintenance_lock = asyncio.Lock()
+
+_schedule_cache = {}  # year -> (loaded_at, normalized schedule)
+_schedule_lock = asyncio.Lock()
+
+def preload():
+    """Imports fastf1, its Ergast client and pandas. Blocking, run it off the event loop."""
+    for module in (fastf1, fastf1_ergast, pd):
+        module.load()
+
+def _normalize_schedule(schedule):
+    """UTC-aware session dates plus the derived columns every caller needs."""
+    for col in ["Session1DateUtc", "Session2DateUtc", "Session3DateUtc", "Session4DateUtc", "Session5DateUtc"]:
+        schedule[col] = pd.to_datetime(schedule[col], utc=True, errors="coerce")
+
+    schedule["race_end"] = schedule["Session5DateUtc"] + pd.Timedelta(hours=12)
+    schedule["is_sprint"] = schedule["EventFormat"].astype(str).str.lower().str.contains("sprint")
+    schedule["lock_time"] = schedule["Session4DateUtc"]
+    schedule["sprint_lock_time"] = schedule["Session2DateUtc"].where(schedule["is_sprint"])
+    return schedule
+
+def _fetch_schedule(year):
+    """Fetches and normalizes the schedule, keeping a copy in the pinned schedule file."""
+    schedule = _normalize_schedule(fastf1.get_event_schedule(year))
     try:
-        schedule = await asyncio.to_thread(fastf1.get_event_schedule, season)
-        return [
-            event for event in schedule['EventName'].tolist()
-            if 'test' not in event.lower()
-        ]
+        schedule.to_pickle(schedule_cache_file(year))
     except Exception:
-        logger.exception("Failed to fetch season calendar for %s", season)
+        logger.exception("Failed to store the %s schedule in the FastF1 cache dir", year)
+    return schedule
+
+def _read_schedule_file(year):
+    path = schedule_cache_file(year)
+    return pd.read_pickle(path) if path.exists() else None
+
+def _to_utc(value):
+    if value is None or pd.isna(value):
+        return None
+    return value.to_pydatetime().astimezone(timezone.utc)
+
+async def get_schedule(year=None):
+    """Normalized season schedule, loaded once and shared until SCHEDULE_TTL runs out.
+
+    Callers must treat the returned DataFrame as read-only. Returns None if the
+    schedule can't be loaded and nothing is cached.
+    """
+    if year is None:
+        year = SEASON
+
+    cached = _schedule_cache.get(year)
+    if cached and time.monotonic() - cached[0] < SCHEDULE_TTL:
+        return cached[1]
+
+    async with _schedule_lock:
+        # Another caller may have loaded it while we waited
+        cached = _schedule_cache.get(year)
+        if cached and time.monotonic() - cached[0] < SCHEDULE_TTL:
+            return cached[1]
+
+        try:
+            with fastf1_fetch_duration.time(kind="schedule"):
+                schedule = await asyncio.to_thread(_fetch_schedule, year)
+        except Exception:
+            if cached:
+                logger.exception("Failed to reload F1 schedule for %s, serving the cached one", year)
+                return cached[1]
+            try:
+                schedule = await asyncio.to_thread(_read_schedule_file, year)
+            except Exception:
+                logger.exception("Failed to read the stored %s schedule", year)
+                schedule = None
+            if schedule is None:
+                logger.exception("Failed to fetch F1 schedule for %s", year)
+                return None
+            logger.exception("Failed to fetch F1 schedule for %s, serving the stored one", year)
+            # Already expired, so the next call tries the network again
+            _schedule_cache[year] = (time.monotonic() - SCHEDULE_TTL, schedule)
+            return schedule
+
+        _schedule_cache[year] = (time.monotonic(), schedule)
+        return schedule
+
+def invalidate_schedule(year=None):
+    """Drops the cached schedule of ``year``, or of every season when None."""
+    if year is None:
+        _schedule_cache.clear()
+    else:
+        _schedule_cache.pop(year, None)
+
+async def season_calender(season):
+    schedule = await get_schedule(season)
+    if schedule is None:
+        return None
+    return [
+        event for event in schedule['EventName'].tolist()
+        if 'test' not in event.lower()
+    ]
 
         
 async def refresh_race_cache(now=None, year=None):
@@ -27,21 +131,10 @@ async def refresh_race_cache(now=None, year=None):
 
     if now is None:
         now = datetime.now(timezone.utc)
-    try:
-        schedule = await asyncio.to_thread(fastf1.get_event_schedule, year)
-    except Exception:
-        logger.exception("Failed to fetch F1 schedule for %s", year)
+    schedule = await get_schedule(year)
+    if schedule is None:
         return None
 
-    try:
-        # Convert dates
-        date_cols = ["Session1DateUtc","Session2DateUtc","Session4DateUtc","Session5DateUtc"]
-        for col in date_cols:
-            schedule[col] = pd.to_datetime(schedule[col], utc=True, errors='coerce')
-    except Exception:
-        logger.exception("Failed processing schedule dates for %s", year)
-        return None    
-    
     # Keep only future races
     future_races = schedule[schedule['Session5DateUtc'].notna() & 
                             (schedule['Session5DateUtc'] > now)]
@@ -57,26 +150,9 @@ async def refresh_race_cache(now=None, year=None):
     country = next_race["Country"]
     event_format = next_race["EventFormat"]
 
-    is_sprint = "sprint" in event_format.lower()
-
-    #lock_time = next_race["Session4DateUtc"]
-    #sprint_lock_time = next_race["Session2DateUtc"] if is_sprint else None
-
-    lock_time_panda = next_race["Session4DateUtc"]
-    if pd.isna(lock_time_panda):
-        lock_time_panda = None
-
-    if lock_time_panda is not None:
-        lock_time = lock_time_panda.to_pydatetime().astimezone(timezone.utc)
-    else: 
-        lock_time = None
-
-    sprint_lock_time_panda = next_race["Session2DateUtc"] if is_sprint and not pd.isna(next_race["Session2DateUtc"]) else None
-
-    if sprint_lock_time_panda is not None:
-        sprint_lock_time = sprint_lock_time_panda.to_pydatetime().astimezone(timezone.utc)
-    else:
-        sprint_lock_time = None
+    is_sprint = bool(next_race["is_sprint"])
+    lock_time = _to_utc(next_race["lock_time"])
+    sprint_lock_time = _to_utc(next_race["sprint_lock_time"])
 
     if next_race is not None:
         next_race_time = next_race["Session5DateUtc"].to_pydatetime().astimezone(timezone.utc)
@@ -96,25 +172,92 @@ async def refresh_race_cache(now=None, year=None):
         "next_refresh": next_refresh,
     }
 
-async def race_results(year=None):
+async def _load_session(year, event_name, identifier, **load_kwargs):
+    """Loads one session on a worker thread, at most FASTF1_SESSION_LOADS at a time."""
+    async with _session_load_slots:
+        def load():
+            session = fastf1.get_session(year, event_name, identifier)
+            session.load(**load_kwargs)
+            return session
+        with fastf1_fetch_duration.time(kind="session", session=identifier):
+            return await asyncio.to_thread(load)
+
+async def _fetch(func, *args):
+    """Runs a blocking Ergast fetch on a worker thread, holding a fetch slot."""
+    async with _session_load_slots:
+        return await asyncio.to_thread(func, *args)
+
+async def enforce_cache_policy():
+    """config.enforce_cache_policy on a worker thread, once no FastF1 request is running.
+
+    Holds every fetch slot and the schedule lock for the duration, so the HTTP
+    cache purge never deletes rows under a load on another thread.
+    """
+    async with _cache_maintenance_lock:
+        held = 0
+        try:
+            for _ in range(FASTF1_FETCH_SLOTS):
+                await _session_load_slots.acquire()
+                held += 1
+            async with _schedule_lock:
+                return await asyncio.to_thread(_enforce_cache_policy)
+        finally:
+            for _ in range(held):
+                _session_load_slots.release()
+
+def _session_results(sessions, key, label, event_name):
+    """Results DataFrame of a loaded session, empty if it failed to load."""
+    session = sessions.get(key)
+    if isinstance(session, Exception):
+        logger.error("Failed to load %s for %s", label, event_name, exc_info=session)
+        return pd.DataFrame()
+    results = session.results
+    if results.empty:
+        logger.warning("%s results are empty for %s", label, event_name)
+    return results
+
+def _ergast_fastest_lap(year, round_number):
+    """Driver code ranked 1st for fastest lap in Ergast's race results, None if not published yet."""
+    content = fastf1_ergast.Ergast().get_race_results(season=year, round=round_number).content
+    if not content or "fastestLapRank" not in content[0]:
+        return None
+    results = content[0]
+    fastest = results[results["fastestLapRank"] == 1]
+    if fastest.empty:
+        return None
+    return fastest.iloc[0]["driverCode"]
+
+async def _fastest_lap_driver(sessions, year, event_name, laps_loaded):
+    fastest = sessions.get("fastest_lap")
+    if isinstance(fastest, Exception):
+        logger.error("Failed to get fastest lap from Ergast for %s", event_name, exc_info=fastest)
+        fastest = None
+    if fastest is not None or FASTEST_LAP_SOURCE == "ergast":
+        return fastest
+
+    # Lap data is the biggest download of the weekend, only fetched when needed
+    if laps_loaded:
+        race_session = sessions["race"]
+    else:
+        logger.info("No fastest lap from Ergast for %s, loading laps", event_name)
+        race_session = await _load_session(year, event_name, "Race", laps=True,
+                                           telemetry=False, weather=False, messages=False)
+    return race_session.laps.pick_fastest()['Driver']
+
+async def weekend_results(year=None):
+    """Results of the last finished weekend, race and sprint sessions loaded concurrently.
+
+    Returns {"race": {...}, "sprint": {...} or None}, or None when nothing is
+    ready yet. On a sprint weekend missing sprint results also return None,
+    so the caller retries instead of scoring without them.
+    """
     if year is None:
         year = SEASON
 
-    try:
-        schedule = await asyncio.to_thread(fastf1.get_event_schedule, year)
-    except Exception:
-        logger.exception("Failed to fetch season calendar for %s", year)
+    schedule = await get_schedule(year)
+    if schedule is None:
         return None
 
-    # FORCE UTC-awareness
-    schedule["Session5DateUtc"] = pd.to_datetime(
-        schedule["Session5DateUtc"],
-        utc=True,
-        errors="coerce"
-    )
-
-    schedule["race_end"] = schedule["Session5DateUtc"] + pd.Timedelta(hours=12)
-
     now = get_now()
 
     finished = schedule[schedule["race_end"] < now]
@@ -126,55 +269,43 @@ async def race_results(year=None):
 
     finished_race = finished_race_list["EventName"]
     race_number = int(finished_race_list["RoundNumber"])
-    race_end_panda = finished_race_list["Session5DateUtc"] 
-    race_end = race_end_panda.to_pydatetime().astimezone(timezone.utc)
-    race_end += timedelta(hours=6)
+    race_end = _to_utc(finished_race_list["Session5DateUtc"]) + timedelta(hours=6)
     if now < race_end:
         return None # Too early
-    
-    race_results = pd.DataFrame()  # init before the try
-    quali_results = pd.DataFrame() 
+    is_sprint = bool(finished_race_list["is_sprint"])
 
-    try:
-        # Race session
-        race_session = fastf1.get_session(year, finished_race, "Race")
-        await asyncio.to_thread(race_session.load,
-                                laps=True, telemetry=False, weather=False, messages=False)
-        race_results = race_session.results
-        if race_results.empty:
-            logger.warning("Race results are empty for %s", finished_race)
-        logger.info("Driver codes: %s", race_results["Abbreviation"].tolist())
-        logger.info("Constructor names: %s", race_results["TeamName"].unique().tolist())
+    minimal = dict(telemetry=False, weather=False, messages=False)
+    laps_loaded = FASTEST_LAP_SOURCE == "laps"
+    loads = {
+        "race": _load_session(year, finished_race, "Race", laps=laps_loaded, **minimal),
+        "quali": _load_session(year, finished_race, "Qualifying", laps=False, **minimal),
+    }
+    if not laps_loaded:
+        loads["fastest_lap"] = _fetch(_ergast_fastest_lap, year, race_number)
+    if is_sprint:
+        loads["sprint"] = _load_session(year, finished_race, "Sprint", laps=False, **minimal)
+        loads["sprint_quali"] = _load_session(year, finished_race, "Sprint Qualifying", laps=False, **minimal)
 
-    except Exception:
-        logger.exception("Error when fetching race results for %s", finished_race)
+    sessions = dict(zip(loads, await asyncio.gather(*loads.values(), return_exceptions=True)))
 
+    race_results = _session_results(sessions, "race", "Race", finished_race)
     if race_results.empty:
         return None
+    logger.info("Driver codes: %s", race_results["Abbreviation"].tolist())
+    logger.info("Constructor names: %s", race_results["TeamName"].unique().tolist())
+
     pos1 = race_results.iloc[0]["Abbreviation"]
     pos2 = race_results.iloc[1]["Abbreviation"]
     pos3 = race_results.iloc[2]["Abbreviation"]
-    fastest_lap_driver = race_session.laps.pick_fastest()['Driver']
+    fastest_lap_driver = await _fastest_lap_driver(sessions, year, finished_race, laps_loaded)
     constructor_points = race_results.groupby("TeamName")["Points"].sum()
     winning_constructor = constructor_points.idxmax()
 
-    try:
-        # Qualifying session
-        quali_session = fastf1.get_session(year, finished_race, "Qualifying")
-        await asyncio.to_thread(quali_session.load,
-                                laps=False, telemetry=False, weather=False, messages=False)
-        quali_results = quali_session.results
-        if quali_results.empty:
-            logger.warning("Quali results are empty for %s", finished_race)
-
-    except Exception:
-        logger.exception("Failed to get quali results for %s", finished_race)
-    
+    quali_results = _session_results(sessions, "quali", "Quali", finished_race)
     pole = quali_results.iloc[0]["Abbreviation"] if not quali_results.empty else None
     quali_second = quali_results.iloc[1]["Abbreviation"] if not quali_results.empty else None
 
-
-    return {
+    race = {
         "race_number": race_number,
         "race_name": finished_race,
         "pos1": pos1,
@@ -186,81 +317,125 @@ async def race_results(year=None):
         "winning_constructor": winning_constructor
     }
 
-async def sprint_results(year=None):
-    if year is None:
-        year = SEASON
-
-    try:
-        schedule = await asyncio.to_thread(fastf1.get_event_schedule, year)
-    except Exception:
-        logger.exception("Failed to fetch season calendar for %s", year)
-        return None
-
-    # Get timing of the next Quali session
-    schedule["Session5DateUtc"] = pd.to_datetime(
-        schedule["Session5DateUtc"], utc=True, errors="coerce"
-    )
-    schedule["race_end"] = schedule["Session5DateUtc"] + pd.Timedelta(hours=12)
-
-    now = get_now()
-    finished = schedule[schedule["race_end"] < now]
+    sprint = None
+    if is_sprint:
+        sprint_results = _session_results(sessions, "sprint", "Sprint", finished_race)
+        if sprint_results.empty:
+            return None
 
-    if finished.empty:
-        return None
+        sprintquali_results = _session_results(sessions, "sprint_quali", "Sprint Quali", finished_race)
+        sprint_pole = sprintquali_results.iloc[0]["Abbreviation"] if not sprintquali_results.empty else None
 
-    finished_race_list = finished.iloc[-1]  # LAST finished race
+        sprint = {
+            "race_number": race_number,
+            "race_name": finished_race,
+            "sprint_winner": sprint_results.iloc[0]["Abbreviation"],
+            "is_sprint": is_sprint,
+            "sprint_pole": sprint_pole
+        }
 
-    finished_race = finished_race_list["EventName"]
-    race_number = int(finished_race_list["RoundNumber"])
-    race_end_panda = finished_race_list["Session5DateUtc"] 
-    race_end = race_end_panda.to_pydatetime().astimezone(timezone.utc)
-    race_end += timedelta(hours=6)
-    event_format = finished_race_list["EventFormat"]
-
-    # Check if it's a sprint weekend using EventFormat column
-    is_sprint = "sprint" in event_format.lower()
-    if not is_sprint:
+    return {"race": race, "sprint": sprint}
+ 
+def _text(value):
+    """``value`` as a string, None for NaN or empty results cells."""
+    if value is None or pd.isna(value) or not str(value).strip():
         return None
-    if  now < race_end:
-        return None # Too early
-    
-    sprint_results = pd.DataFrame()  # init before the try
-    sprintquali_results = pd.DataFrame() 
+    return str(value)
 
+def _read_entrants(year):
+    """{round_number: [driver]} stored by earlier season_entrants calls."""
+    path = entrants_cache_file(year)
     try:
-    # Sprint session
-        sprint_session = fastf1.get_session(year, finished_race, "Sprint")
-        await asyncio.to_thread(sprint_session.load,
-                                laps=False, telemetry=False, weather=False, messages=False)
-        sprint_results = sprint_session.results
-        if sprint_results.empty:
-            logger.warning("Sprint results are empty for %s", finished_race)
-
-    except Exception:
-        logger.exception("Failed to load Sprint results for %s", finished_race)
-
-    sprint_winner = sprint_results.iloc[0]["Abbreviation"]
-
-    try:
-        # Sprint Qualifying session
-        sprintquali_session = fastf1.get_session(year, finished_race, "Sprint Qualifying")
-        await asyncio.to_thread (sprintquali_session.load)
-        sprintquali_results = sprintquali_session.results
-        if sprintquali_results.empty:
-            logger.warning("Sprint Quali results are empty for %s", finished_race)
-    except Exception:
-        logger.exception("Failed to load Sprint Quali for %s", finished_race)
+        return {int(round_number): drivers for round_number, drivers in json.loads(path.read_text()).items()}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError):
+        logger.exception("Ignoring unreadable entrants file %s", path)
+        return {}
+
+def _write_entrants(year, rounds):
+    path = entrants_cache_file(year)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({str(round_number): drivers for round_number, drivers in sorted(rounds.items())}))
+    tmp.replace(path)
+
+async def finished_rounds(year=None):
+    """Round numbers of ``year`` whose race has ended, None if the schedule can't be loaded."""
+    schedule = await get_schedule(year)
+    if schedule is None:
+        return None
+    finished = schedule[(schedule["race_end"] < get_now()) & (schedule["RoundNumber"] > 0)]
+    return [int(round_number) for round_number in finished["RoundNumber"]]
+
+async def season_entrants(year=None):
+    """Every driver and team that raced in ``year`` so far, None before the first race.
+
+    Returns {"drivers": [{"code", "name", "team"}], "grid": [code],
+    "constructors": [team], "rounds": [round_number]}. Drivers are in order of
+    first appearance with the team of their latest race, so a one-off
+    substitute adds a driver instead of replacing one; "grid" lists the drivers
+    of the latest round. Each round's entrants are stored in the pinned
+    entrants file, so only rounds finished since the last call load a session.
+    """
+    if year is None:
+        year = SEASON
 
-    sprint_pole = sprintquali_results.iloc[0]["Abbreviation"] if not sprintquali_results.empty else None
+    schedule = await get_schedule(year)
+    if schedule is None:
+        return None
+    finished = schedule[(schedule["race_end"] < get_now()) & (schedule["RoundNumber"] > 0)]
+
+    rounds = await asyncio.to_thread(_read_entrants, year)
+    missing = [
+        (int(round_number), event_name)
+        for round_number, event_name in zip(finished["RoundNumber"], finished["EventName"])
+        if int(round_number) not in rounds
+    ]
+    if missing:
+        sessions = await asyncio.gather(
+            *(_load_session(year, event_name, "Race", laps=False,
+                            telemetry=False, weather=False, messages=False)
+              for _, event_name in missing),
+            return_exceptions=True
+        )
+        added = 0
+        for (round_number, event_name), session in zip(missing, sessions):
+            # Rounds that fail stay missing and are tried again on the next call
+            if isinstance(session, Exception):
+                logger.error("Failed to load entrants from %s", event_name, exc_info=session)
+                continue
+            results = session.results
+            if results is None or results.empty:
+                continue
+            drivers = []
+            for _, row in results.iterrows():
+                code = _text(row["Abbreviation"])
+                if code:
+                    drivers.append({"code": code, "name": _text(row["FullName"]), "team": _text(row["TeamName"])})
+            if drivers:
+                rounds[round_number] = drivers
+                added += 1
+        if added:
+            try:
+                await asyncio.to_thread(_write_entrants, year, rounds)
+            except OSError:
+                logger.exception("Failed to store the %s entrants", year)
+
+    if not rounds:
+        return None
 
+    drivers = {}
+    for round_number in sorted(rounds):
+        for driver in rounds[round_number]:
+            # Re-assigning keeps the first-seen position and takes the latest team
+            drivers[driver["code"]] = driver
     return {
-        "race_number": race_number,
-        "race_name": finished_race,
-        "sprint_winner": sprint_winner,
-        "is_sprint": is_sprint,
-        "sprint_pole": sprint_pole
+        "drivers": list(drivers.values()),
+        "grid": [driver["code"] for driver in rounds[max(rounds)]],
+        "constructors": list(dict.fromkeys(d["team"] for d in drivers.values() if d["team"])),
+        "rounds": sorted(rounds),
     }
- 
+
 async def get_final_champions_if_ready(year=None):
     if year is None:
         year = SEASON
@@ -269,14 +444,12 @@ async def get_final_champions_if_ready(year=None):
     logger.info("CHAMPIONS: now=%s, year=%s", now, year)
 
     # Get season calendar
-    try:
-        calendar = await asyncio.to_thread(fastf1.get_event_schedule, year)
-    except Exception:
-        logger.exception("Failed to fetch season calendar for %s", year)
+    calendar = await get_schedule(year)
+    if calendar is None:
         return None
 
     last_race = calendar.iloc[-1]
-    race_date = pd.to_datetime(last_race["Session5DateUtc"],utc=True,errors="coerce")
+    race_date = last_race["Session5DateUtc"]
     logger.info("CHAMPIONS: last race=%s, race_date=%s", last_race['EventName'], race_date)
     logger.info("CHAMPIONS: threshold=%s, passed=%s", race_date + timedelta(hours=12), now >= race_date + timedelta(hours=12))
     if pd.isna(race_date):
@@ -291,9 +464,11 @@ async def get_final_champions_if_ready(year=None):
     try:
         logger.info("CHAMPIONS: fetching Ergast standings...")
         # Fetch standings from Ergast
-        ergast = Ergast()
-        driver_standings = ergast.get_driver_standings(season=year, round='last').content[0]
-        constructor_standings = ergast.get_constructor_standings(season=year, round='last').content[0]
+        ergast = fastf1_ergast.Ergast()
+        driver_standings, constructor_standings = await _fetch(lambda: (
+            ergast.get_driver_standings(season=year, round='last').content[0],
+            ergast.get_constructor_standings(season=year, round='last').content[0],
+        ))
         logger.info("Driver standings codes: %s", [d['driverCode'] for d in driver_standings.to_dict('records')])
         logger.info("Constructor standings codes: %s", [c['constructorId'] for c in constructor_standings.to_dict('records')])
         logger.info("CHAMPIONS: WDC=%s, WCC=%s", driver_standings.iloc[0]['driverId'], constructor_standings.iloc[0]['constructorId'])
@@ -311,24 +486,17 @@ async def get_final_champions_if_ready(year=None):
     return wdc_winner, wdc_second, wcc_winner, wcc_second
 
 async def get_race_end_time(now):
-    try:
-        schedule = await asyncio.to_thread(fastf1.get_event_schedule, SEASON)
-    except Exception:
-        logger.exception("Failed to fetch season calendar for %s", SEASON)
+    schedule = await get_schedule(SEASON)
+    if schedule is None:
         return None
 
-    schedule["Session5DateUtc"] = pd.to_datetime(
-        schedule["Session5DateUtc"], utc=True, errors="coerce"
-    )
-    schedule["race_end"] = schedule["Session5DateUtc"] + pd.Timedelta(hours=12)
-
     finished = schedule[schedule["race_end"] < now]
 
     if not finished.empty:
         for idx in range(len(finished) - 1, -1, -1):
             race = finished.iloc[idx]
             race_number = int(race["RoundNumber"])
-            if not safe_fetch_one("SELECT 1 FROM scored_races WHERE race_number = %s", (race_number,)):
+            if not await safe_fetch_one("SELECT 1 FROM scored_races WHERE race_number = %s", (race_number,)):
                 return race["race_end"].to_pydatetime().astimezone(timezone.utc)
 
     upcoming = schedule[schedule["race_end"] >= now]
@@ -341,19 +509,12 @@ async def get_season_end_time(year=None):
     if year is None:
         year = SEASON
 
-    try:
-        calendar = await asyncio.to_thread(fastf1.get_event_schedule, year)
-    except Exception:
-        logger.exception("Failed to fetch season calendar for %s", year)
+    calendar = await get_schedule(year)
+    if calendar is None:
         return None
 
     last_race = calendar.iloc[-1]
-
-    race_start = pd.to_datetime(
-        last_race["Session5DateUtc"],
-        utc=True,
-        errors="coerce"
-    )
+    race_start = last_race["Session5DateUtc"]
 
     if pd.isna(race_start):
         return None
@@ -365,11 +526,11 @@ async def get_standings_leaders(race_num, year=None):
     if year is None:
         year = SEASON
     try:
-        ergast = Ergast()
-        driver_standings = await asyncio.to_thread(
+        ergast = fastf1_ergast.Ergast()
+        driver_standings = await _fetch(
             lambda: ergast.get_driver_standings(season=year, round=race_num).content[0]
         )
-        constructor_standings = await asyncio.to_thread(
+        constructor_standings = await _fetch(
             lambda: ergast.get_constructor_standings(season=year, round=race_num).content[0]
         )
         if driver_standings.empty or constructor_standings.empty:
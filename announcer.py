@@ -0,0 +1,115 @@
+# announcer.py
+"""Concurrent delivery of per-guild announcements.
+
+Jobs run on at most ANNOUNCE_CONCURRENCY workers. Jobs that share a channel
+run one after another, since they share a Discord rate-limit route; discord.py
+itself waits out any 429 on that route. Transient failures (5xx, timeouts,
+connection resets) are retried with backoff, while Forbidden/NotFound are not.
+"""
+import asyncio
+import logging
+import os
+import random
+import time
+import aiohttp
+import discord
+
+logger = logging.getLogger(__name__)
+
+ANNOUNCE_CONCURRENCY = int(os.getenv("ANNOUNCE_CONCURRENCY", 8))
+ANNOUNCE_MAX_ATTEMPTS = int(os.getenv("ANNOUNCE_MAX_ATTEMPTS", 3))
+RETRY_BASE_DELAY = 2  # seconds, doubled per attempt
+
+_totals = {"delivered": 0, "failed": 0, "retries": 0}
+_last_dispatch = {}
+
+class AnnouncementJob:
+    """One guild's announcement. ``send`` is an async callable doing the Discord calls.
+
+    Jobs with the same ``channel_id`` are serialized; without one the guild
+    is used, for jobs that post in the guild's own prediction channel.
+    """
+    __slots__ = ("guild_id", "send", "channel_id")
+
+    def __init__(self, guild_id, send, channel_id=None):
+        self.guild_id = guild_id
+        self.send = send
+        self.channel_id = channel_id
+
+    @property
+    def route(self):
+        return self.channel_id if self.channel_id is not None else ("guild", self.guild_id)
+
+def message_job(guild_id, channel, content):
+    """Job posting ``content`` to ``channel``."""
+    return AnnouncementJob(guild_id, lambda: channel.send(content), channel.id)
+
+def _is_transient(exc):
+    if isinstance(exc, discord.HTTPException):
+        return exc.status >= 500 or exc.status == 429
+    return isinstance(exc, (asyncio.TimeoutError, aiohttp.ClientError, ConnectionError))
+
+async def _deliver(job, label, started):
+    for attempt in range(1, ANNOUNCE_MAX_ATTEMPTS + 1):
+        try:
+            await job.send()
+            return {"ok": True, "attempts": attempt, "latency": time.monotonic() - started}
+        except Exception as e:
+            if attempt < ANNOUNCE_MAX_ATTEMPTS and _is_transient(e):
+                delay = RETRY_BASE_DELAY * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+                logger.warning("%s: attempt %s for guild %s failed (%s), retrying in %.1fs",
+                               label, attempt, job.guild_id, e, delay)
+                _totals["retries"] += 1
+                await asyncio.sleep(delay)
+                continue
+            logger.error("%s: delivery to guild %s failed after %s attempt(s)",
+                         label, job.guild_id, attempt, exc_info=e)
+            return {"ok": False, "attempts": attempt, "latency": time.monotonic() - started, "error": repr(e)}
+
+async def dispatch(jobs, label, concurrency=ANNOUNCE_CONCURRENCY):
+    """Delivers ``jobs`` and returns {guild_id: {"ok", "attempts", "latency"[, "error"]}}.
+
+    Latency is seconds from this call to delivery, so it includes queueing.
+    """
+    started = time.monotonic()
+    routes = {}
+    for job in jobs:
+        routes.setdefault(job.route, []).append(job)
+
+    report = {}
+    slots = asyncio.Semaphore(concurrency)
+
+    async def run_route(route_jobs):
+        async with slots:
+            for job in route_jobs:
+                report[job.guild_id] = await _deliver(job, label, started)
+
+    await asyncio.gather(*(run_route(route_jobs) for route_jobs in routes.values()))
+
+    delivered = sorted(r["latency"] for r in report.values() if r["ok"])
+    failed = [guild_id for guild_id, r in report.items() if not r["ok"]]
+    _totals["delivered"] += len(delivered)
+    _totals["failed"] += len(failed)
+
+    for guild_id, r in report.items():
+        logger.debug("%s: guild %s %s in %.2fs (%s attempt(s))", label, guild_id,
+                     "delivered" if r["ok"] else "failed", r["latency"], r["attempts"])
+    if delivered:
+        logger.info("%s: %s/%s delivered, p50 %.2fs, max %.2fs", label, len(delivered), len(report),
+                    delivered[len(delivered) // 2], delivered[-1])
+    if failed:
+        logger.warning("%s: failed for guilds %s", label, failed)
+
+    _last_dispatch.clear()
+    _last_dispatch.update({
+        "label": label,
+        "jobs": len(report),
+        "delivered": len(delivered),
+        "failed": len(failed),
+        "max_latency": delivered[-1] if delivered else None,
+        "duration": time.monotonic() - started,
+    })
+    return report
+
+def stats():
+    return {**_totals, "last_dispatch": dict(_last_dispatch)}
@@ -0,0 +1,158 @@
+# async_database.py
+"""Awaitable mirror of database.py for code running on the event loop.
+
+Every helper runs its database.py counterpart on a dedicated thread pool sized
+to the connection pool, so a slow query never blocks the gateway or other
+guilds' interactions. Reads and writes share database.pool.
+"""
+import asyncio
+import functools
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import database
+from lock_state import lock_state, MISSING
+from guild_config import guild_configs
+from leaderboard_cache import leaderboard_cache
+from metrics import db_call_duration
+
+_executor = ThreadPoolExecutor(
+    max_workers=database.pool.max_size,
+    thread_name_prefix="db"
+)
+
+async def run_blocking(func, *args, **kwargs):
+    """Run any blocking database-bound callable (e.g. scoring) on the DB executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+def _wrap(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        with db_call_duration.time(helper=func.__name__):
+            return await run_blocking(func, *args, **kwargs)
+    return wrapper
+
+def _wrap_query(func):
+    """_wrap for the raw safe_* helpers, attributing the query to the coroutine awaiting it."""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        frame = sys._getframe(1)
+        tag = f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+        with db_call_duration.time(helper=func.__name__):
+            return await run_blocking(database.tagged_call, tag, func, *args, **kwargs)
+    return wrapper
+
+get_pool_stats = database.get_pool_stats
+get_query_stats = database.get_query_stats
+
+init_db = _wrap(database.init_db)
+safe_execute = _wrap_query(database.safe_execute)
+safe_fetch_all = _wrap_query(database.safe_fetch_all)
+safe_fetch_one = _wrap_query(database.safe_fetch_one)
+
+# ---------- guilds ----------
+upsert_guild = _wrap(database.upsert_guild)
+set_bold_pred_optout = _wrap(database.set_bold_pred_optout)
+save_persistent_message = _wrap(database.save_persistent_message)
+delete_persistent_message = _wrap(database.delete_persistent_message)
+set_prediction_channel = _wrap(database.set_prediction_channel)
+load_guild_configs = _wrap(database.load_guild_configs)
+
+# Cached guild config is read on the event loop, misses load the guild on the executor
+async def get_prediction_channel(guild_id):
+    channel_id = guild_configs.prediction_channel(guild_id)
+    if channel_id is not MISSING:
+        return channel_id
+    return await run_blocking(database.get_prediction_channel, guild_id)
+
+async def is_bold_pred_opted_out(guild_id):
+    opted_out = guild_configs.bold_opted_out(guild_id)
+    if opted_out is not MISSING:
+        return opted_out
+    return await run_blocking(database.is_bold_pred_opted_out, guild_id)
+
+async def get_persistent_message(guild_id, key):
+    message = guild_configs.persistent_message(guild_id, key)
+    if message is not MISSING:
+        return message
+    return await run_blocking(database.get_persistent_message, guild_id, key)
+
+# ---------- race predictions ----------
+get_race_number = _wrap(database.get_race_number)
+save_race_predictions = _wrap(database.save_race_predictions)
+fetch_existing_predictions = _wrap(database.fetch_existing_predictions)
+save_sprint_predictions = _wrap(database.save_sprint_predictions)
+get_is_sprint = _wrap(database.get_is_sprint)
+fetch_sprint_preds = _wrap(database.fetch_sprint_preds)
+
+# ---------- lock state ----------
+set_season_state = _wrap(database.set_season_state)
+save_season_prediction = _wrap(database.save_season_prediction)
+guild_default_lock = _wrap(database.guild_default_lock)
+ensure_lock_rows = _wrap(database.ensure_lock_rows)
+bootstrap_guilds = _wrap(database.bootstrap_guilds)
+set_manual_lock = _wrap(database.set_manual_lock)
+reset_locks_on_cache_refresh = _wrap(database.reset_locks_on_cache_refresh)
+load_lock_states = _wrap(database.load_lock_states)
+prediction_state_log = _wrap(database.prediction_state_log)
+
+# Hot path of every prediction dropdown: answer from the lock state cache
+# without an executor hop, only misses go to the database
+async def get_manual_lock(guild_id, pred_type):
+    cached = lock_state.get_manual(guild_id, pred_type)
+    if cached is not MISSING:
+        return cached
+    return await run_blocking(database.get_manual_lock, guild_id, pred_type)
+
+async def is_season_open(guild_id):
+    cached = lock_state.is_season_open(guild_id)
+    if cached is not MISSING:
+        return cached
+    return await run_blocking(database.is_season_open, guild_id)
+
+# ---------- results & scoring ----------
+save_race_results = _wrap(database.save_race_results)
+save_sprint_results = _wrap(database.save_sprint_results)
+save_final_champions = _wrap(database.save_final_champions)
+save_championship_leaders = _wrap(database.save_championship_leaders)
+has_led_championship = _wrap(database.has_led_championship)
+is_race_scored = _wrap(database.is_race_scored)
+mark_race_scored = _wrap(database.mark_race_scored)
+get_all_scored_races = _wrap(database.get_all_scored_races)
+is_season_scored = _wrap(database.is_season_scored)
+mark_season_scored = _wrap(database.mark_season_scored)
+add_points = _wrap(database.add_points)
+
+# ---------- leaderboard ----------
+update_leaderboard = _wrap(database.update_leaderboard)
+verify_leaderboard = _wrap(database.verify_leaderboard)
+clear_leaderboard = _wrap(database.clear_leaderboard)
+get_top_n = _wrap(database.get_top_n)
+get_full_leaderboard = _wrap(database.get_full_leaderboard)
+get_user_rank = _wrap(database.get_user_rank)
+get_leaderboard_page = _wrap(database.get_leaderboard_page)
+get_leaderboard_size = _wrap(database.get_leaderboard_size)
+leaderboard_key = database.leaderboard_key  # pure, no query
+
+async def get_leaderboard_snapshot(guild_id):
+    snapshot = leaderboard_cache.get(guild_id)
+    if snapshot is not None:
+        return snapshot
+    return await run_blocking(database.get_leaderboard_snapshot, guild_id)
+
+# ---------- crazy predictions ----------
+save_crazy_prediction = _wrap(database.save_crazy_prediction)
+get_crazy_predictions = _wrap(database.get_crazy_predictions)
+count_crazy_predictions = _wrap(database.count_crazy_predictions)
+save_scored_crazy_prediction = _wrap(database.save_scored_crazy_prediction)
+get_all_crazy_predictions_for_user = _wrap(database.get_all_crazy_predictions_for_user)
+get_all_crazy_predictions = _wrap(database.get_all_crazy_predictions)
+remove_scored_crazy_prediction = _wrap(database.remove_scored_crazy_prediction)
+
+# ---------- bold predictions ----------
+save_bold_prediction = _wrap(database.save_bold_prediction)
+fetch_bold_predictions = _wrap(database.fetch_bold_predictions)
+save_correct_bold_prediction = _wrap(database.save_correct_bold_prediction)
+remove_correct_bold_prediction = _wrap(database.remove_correct_bold_prediction)
+get_correct_bold_predictions = _wrap(database.get_correct_bold_predictions)
+get_correct_bold_predictions_of_server = _wrap(database.get_correct_bold_predictions_of_server)
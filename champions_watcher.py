@@ -1,97 +1,103 @@
 # final_champions_watcher.py
-import asyncio
-import fastf1
-from config import CACHE_DIR
+import time
+from datetime import timedelta
 import logging
-import shutil
-from FastF1_service import get_final_champions_if_ready, get_season_end_time
-from database import (save_final_champions, 
+from FastF1_service import get_final_champions_if_ready, get_season_end_time, enforce_cache_policy
+from async_database import (save_final_champions, 
                       update_leaderboard, 
                       get_prediction_channel, 
                       is_season_scored, 
-                      mark_season_scored)
+                      mark_season_scored,
+                      run_blocking)
 from scoring import score_final_champions_for_guild
-from get_now import get_now, TIME_MULTIPLE, SEASON
+from announcer import dispatch, message_job
+from metrics import watcher_state
+from get_now import get_now, SEASON
 
 logger = logging.getLogger(__name__)
 
-async def final_champions_loop(bot):
-    await bot.wait_until_ready()
+async def process_season_end(bot):
+    """Saves and scores the final champions. False if standings aren't final yet."""
     season = SEASON
 
-    season_end_time = await get_season_end_time()
+    result = await get_final_champions_if_ready()
+    if not result:
+        return False
 
-    delay = (season_end_time - get_now()).total_seconds()
-    if delay > 0:
-        await asyncio.sleep(delay / TIME_MULTIPLE)
+    wdc_winner, wdc_second, wcc_winner, wcc_second = result
 
-    try:
-        # Three guarded attempts (data lag protection)
-        for _ in range(3):
-            try:
-                result = await get_final_champions_if_ready()
-            except Exception:
-                logger.exception("Failed fetching final champions")
-                await asyncio.sleep(3600 / TIME_MULTIPLE)
+    wdc = wdc_winner[:3].upper()
+    wdc_second = wdc_second[:3].upper()
+    wcc = wcc_winner
+    wcc_second = wcc_second
+
+    await save_final_champions(season, wdc, wdc_second, wcc, wcc_second)
+
+    announcement = (
+        f"✅ **The {season} Formula 1 season has ended!**\n"
+        f"👑 The {season} F1 WDC- {wdc_winner.title()}\n"
+        f"🏎️ The {season} F1 WCC- {wcc_winner.title()}\n" 
+        "Championship predictions have been scored!"
+    )
+
+    # Score per guild (like race loop), announce once every guild is scored
+    jobs = []
+    for guild in bot.guilds:
+        try:
+            guild_id = guild.id
+
+            # Prevents double scoring 
+                                
+            if await is_season_scored(guild_id, season):
+                logger.info("Final champions already scored for guild %s", guild.name)
                 continue
 
-            if result:
-                wdc_winner, wdc_second, wcc_winner, wcc_second = result
-
-                wdc = wdc_winner[:3].upper()
-                wdc_second = wdc_second[:3].upper()
-                wcc = wcc_winner
-                wcc_second = wcc_second
-
-                save_final_champions(season, wdc, wdc_second, wcc, wcc_second)
-                
-                #Redundant cache cleanup
-                shutil.rmtree(CACHE_DIR, ignore_errors=True)
-                CACHE_DIR.mkdir(exist_ok=True)
-                fastf1.Cache.enable_cache(str(CACHE_DIR))
-
-                # Score per guild (like race loop)
-                for guild in bot.guilds:
-                    try:
-                        guild_id = guild.id
-
-                        # Prevents double scoring 
-                                            
-                        if is_season_scored(guild_id, season):
-                            logger.info("Final champions already scored for guild %s", guild.name)
-                            continue
-
-                        logger.info("Scoring final champions for guild %s...", guild.name)
-                        score_final_champions_for_guild(guild_id)
-                        update_leaderboard(guild_id)
-                        mark_season_scored(guild_id, season)
-
-                        channel_id = get_prediction_channel(guild_id)
-                        if channel_id:
-                            channel = guild.get_channel(channel_id)
-                            if channel:
-                                await channel.send(
-                                f"✅ **The {season} Formula 1 season has ended!**\n"
-                                f"👑 The {season} F1 WDC- {wdc_winner.title()}\n"
-                                f"🏎️ The {season} F1 WCC- {wcc_winner.title()}\n" 
-                                "Championship predictions have been scored!"
-                            )
-
-                        logger.info("Final champions scored for guild %s", guild.name)
-
-                    except Exception:
-                        logger.exception("Failed scoring guild %s", guild.id)
-                        continue
-
-                return
-
-            await asyncio.sleep(3600 / TIME_MULTIPLE)
-
-        logger.warning("Failed to fetch final champions after 3 attempts")
-    
-    finally:
-        #Cleaning cache and recreating it
-        shutil.rmtree(CACHE_DIR, ignore_errors=True)
-        CACHE_DIR.mkdir(exist_ok=True)
-        fastf1.Cache.enable_cache(str(CACHE_DIR))
+            logger.info("Scoring final champions for guild %s...", guild.name)
+            await run_blocking(score_final_champions_for_guild, guild_id)
+            await update_leaderboard(guild_id)
+            await mark_season_scored(guild_id, season)
+
+            channel_id = await get_prediction_channel(guild_id)
+            if channel_id:
+                channel = guild.get_channel(channel_id)
+                if channel:
+                    jobs.append(message_job(guild_id, channel, announcement))
 
+            logger.info("Final champions scored for guild %s", guild.name)
+
+        except Exception:
+            logger.exception("Failed scoring guild %s", guild.id)
+            continue
+
+    watcher_state.set(time.time(), state="last_champions_run")
+    await dispatch(jobs, f"{season} champions")
+    return True
+
+async def schedule_season_end(scheduler):
+    season_end_time = await get_season_end_time()
+    if season_end_time is None:
+        logger.warning("Season end time unknown, final champions won't be scored automatically")
+        return
+    scheduler.schedule("season_end", season_end_time, attempt=1)
+
+def register_champions_handlers(scheduler, bot):
+    @scheduler.on("season_end")
+    async def on_season_end(event):
+        try:
+            done = await process_season_end(bot)
+        except Exception:
+            logger.exception("Failed fetching final champions")
+            done = False
+        finally:
+            try:
+                stats = await enforce_cache_policy()
+                logger.info("FastF1 cache: %s", stats)
+            except Exception:
+                logger.exception("FastF1 cache eviction failed")
+
+        # Three guarded attempts (data lag protection)
+        attempt = event.payload["attempt"]
+        if not done and attempt < 3:
+            scheduler.schedule("season_end", get_now() + timedelta(hours=1), attempt=attempt + 1)
+        elif not done:
+            logger.warning("Failed to fetch final champions after 3 attempts")
@@ -1,11 +1,206 @@
 # config.py
 from pathlib import Path
-import fastf1
 import os
+import re
+import time
+import shutil
+import sqlite3
+import logging
+from get_now import SEASON
+
+logger = logging.getLogger(__name__)
 
 CACHE_DIR = Path("fastf1cache")
 CACHE_DIR.mkdir(exist_ok=True)
-fastf1.Cache.enable_cache(str(CACHE_DIR))
+
+def enable_fastf1_cache(fastf1):
+    """Points FastF1 at CACHE_DIR; FastF1_service calls it when fastf1 is first imported."""
+    fastf1.Cache.enable_cache(str(CACHE_DIR))
+
+# Session data (<season>/<event>/<session>/) is evicted by age first. If the
+# cache is still over budget, FastF1's HTTP response cache is emptied, then the
+# least recently written sessions go until it fits. Only the current season's
+# schedule and race entrants files are pinned: FastF1_service falls back to the
+# schedule when a fetch fails and keeps every round's entrants in the other.
+FASTF1_CACHE_MAX_MB = float(os.getenv("FASTF1_CACHE_MAX_MB", 500))
+FASTF1_CACHE_MAX_AGE_DAYS = float(os.getenv("FASTF1_CACHE_MAX_AGE_DAYS", 14))
+
+# Where the fastest lap driver comes from: "ergast" (race results fastestLapRank),
+# "laps" (load and parse the full lap table) or "auto" (Ergast, laps as fallback)
+FASTEST_LAP_SOURCE = os.getenv("FASTEST_LAP_SOURCE", "auto").lower()
+if FASTEST_LAP_SOURCE not in ("auto", "ergast", "laps"):
+    logger.warning("Unknown FASTEST_LAP_SOURCE %r, falling back to 'auto'", FASTEST_LAP_SOURCE)
+    FASTEST_LAP_SOURCE = "auto"
+
+_SEASON_DIR = re.compile(r"^\d{4}$")
+_SEASON_FILE = re.compile(r"^(schedule_\d{4}\.pkl|entrants_\d{4}\.json)$")
+
+HTTP_CACHE_FILE = CACHE_DIR / "fastf1_http_cache.sqlite"
+
+def schedule_cache_file(year):
+    return CACHE_DIR / f"schedule_{year}.pkl"
+
+def entrants_cache_file(year):
+    return CACHE_DIR / f"entrants_{year}.json"
+
+def _pinned_files():
+    return (schedule_cache_file(SEASON), entrants_cache_file(SEASON))
+
+class _CacheAccessCounter(logging.Handler):
+    """Counts FastF1's own cache hit/miss log lines; FastF1 exposes no counters."""
+
+    def __init__(self):
+        super().__init__(level=logging.INFO)
+        self.hits = 0
+        self.misses = 0
+
+    def emit(self, record):
+        message = record.getMessage()
+        if message.startswith("Using cached data for"):
+            self.hits += 1
+        elif message.startswith("Fetching"):
+            self.misses += 1
+
+_cache_counter = _CacheAccessCounter()
+logging.getLogger("fastf1").addHandler(_cache_counter)
+_evicted = {"sessions": 0, "bytes": 0, "http_purges": 0}
+
+def _dir_usage(path):
+    """(bytes, newest mtime) of every file below ``path``."""
+    size, newest = 0, 0.0
+    for f in path.rglob("*"):
+        if f.is_file():
+            st = f.stat()
+            size += st.st_size
+            newest = max(newest, st.st_mtime)
+    return size, newest
+
+def _session_dirs():
+    for season in CACHE_DIR.iterdir():
+        if not season.is_dir() or not _SEASON_DIR.match(season.name):
+            continue
+        for event in season.iterdir():
+            if event.is_dir():
+                yield from (s for s in event.iterdir() if s.is_dir())
+
+def _file_size(path):
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+def _pinned_bytes():
+    return sum(_file_size(f) for f in _pinned_files())
+
+def _loose_files():
+    """Top-level files other than the pinned ones: the HTTP cache and old seasons' files."""
+    pinned = _pinned_files()
+    return [f for f in CACHE_DIR.iterdir() if f.is_file() and f not in pinned]
+
+def _loose_bytes():
+    return sum(_file_size(f) for f in _loose_files())
+
+def _purge_http_cache():
+    """Empties FastF1's HTTP response cache in place and drops old seasons' files.
+
+    Rows are deleted instead of the file so FastF1's open connection stays
+    valid; VACUUM then hands the space back. FastF1 re-fetches on demand.
+    Returns the bytes freed.
+    """
+    before = _loose_bytes()
+    if HTTP_CACHE_FILE.exists():
+        try:
+            conn = sqlite3.connect(HTTP_CACHE_FILE, timeout=30)
+            try:
+                tables = [row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+                )]
+                for table in tables:
+                    conn.execute(f'DELETE FROM "{table}"')
+                conn.commit()
+                conn.execute("VACUUM")
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            logger.exception("Failed to purge the FastF1 HTTP cache")
+
+    for f in _loose_files():
+        if _SEASON_FILE.match(f.name):
+            f.unlink(missing_ok=True)
+    return max(0, before - _loose_bytes())
+
+def _evict_session(path, size):
+    shutil.rmtree(path, ignore_errors=True)
+    _evicted["sessions"] += 1
+    _evicted["bytes"] += size
+    logger.info("Evicted FastF1 cache %s (%.1f MB)", path.relative_to(CACHE_DIR), size / 1024 / 1024)
+
+def enforce_cache_policy():
+    """Evicts cached sessions past FASTF1_CACHE_MAX_AGE_DAYS, then the HTTP cache and
+    the oldest sessions until under FASTF1_CACHE_MAX_MB."""
+    max_bytes = FASTF1_CACHE_MAX_MB * 1024 * 1024
+    cutoff = time.time() - FASTF1_CACHE_MAX_AGE_DAYS * 86400
+
+    sessions = []
+    for path in _session_dirs():
+        size, mtime = _dir_usage(path)
+        sessions.append((mtime, size, path))
+    sessions.sort()  # oldest first
+
+    total = _pinned_bytes() + _loose_bytes() + sum(size for _, size, _ in sessions)
+    kept = []
+    for mtime, size, path in sessions:
+        if mtime < cutoff:
+            _evict_session(path, size)
+            total -= size
+        else:
+            kept.append((size, path))
+
+    # Raw responses are cheaper to lose than parsed sessions
+    if total > max_bytes:
+        freed = _purge_http_cache()
+        total -= freed
+        _evicted["http_purges"] += 1
+        _evicted["bytes"] += freed
+        logger.info("Purged the FastF1 HTTP cache (%.1f MB)", freed / 1024 / 1024)
+
+    for size, path in kept:
+        if total <= max_bytes:
+            break
+        _evict_session(path, size)
+        total -= size
+
+    # Drop event folders left empty
+    for season in CACHE_DIR.iterdir():
+        if season.is_dir() and _SEASON_DIR.match(season.name):
+            for event in season.iterdir():
+                if event.is_dir() and not any(event.iterdir()):
+                    event.rmdir()
+
+    if total > max_bytes:
+        logger.warning("FastF1 cache is %.1f MB after eviction, over the %.0f MB budget",
+                       total / 1024 / 1024, FASTF1_CACHE_MAX_MB)
+    return cache_stats()
+
+def cache_stats():
+    sessions = list(_session_dirs())
+    pinned = _pinned_bytes()
+    loose = _loose_files()
+    # The sqlite file plus its -wal/-shm/-journal companions
+    http = sum(_file_size(f) for f in loose if f.name.startswith(HTTP_CACHE_FILE.name))
+    stale = sum(_file_size(f) for f in loose if _SEASON_FILE.match(f.name))
+    return {
+        "hits": _cache_counter.hits,
+        "misses": _cache_counter.misses,
+        "bytes": pinned + sum(_file_size(f) for f in loose) + sum(_dir_usage(path)[0] for path in sessions),
+        "pinned_bytes": pinned,
+        "http_cache_bytes": http,
+        "stale_season_file_bytes": stale,
+        "sessions": len(sessions),
+        "evicted_sessions": _evicted["sessions"],
+        "evicted_bytes": _evicted["bytes"],
+        "http_cache_purges": _evicted["http_purges"],
+    }
 
 CONSTRUCTOR_ERGAST_MAP = {
     "Red Bull Racing": "red_bull",
@@ -1,10 +1,19 @@
-import threading
 import psycopg2
 import psycopg2.extras
 from dotenv import load_dotenv
 import os
+import sys
+import time
 import logging
 import socket
+import threading
+from contextlib import contextmanager
+from db_pool import ConnectionPool
+from db_migrations import run_migrations
+from lock_state import lock_state, MISSING
+from guild_config import guild_configs
+from leaderboard_cache import leaderboard_cache, LeaderboardSnapshot
+from query_stats import query_stats
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -16,325 +25,481 @@ def getaddrinfo_ipv4(*args, **kwargs):
 socket.getaddrinfo = getaddrinfo_ipv4
 
 DATABASE_URL = os.getenv('DATABASE_URL')
+
+pool = ConnectionPool(
+    DATABASE_URL,
+    min_size=int(os.getenv('DB_POOL_MIN_SIZE', 1)),
+    max_size=int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+    idle_timeout=float(os.getenv('DB_POOL_IDLE_TIMEOUT', 300)),
+    checkout_timeout=float(os.getenv('DB_POOL_CHECKOUT_TIMEOUT', 30)),
+    health_check_after=float(os.getenv('DB_POOL_HEALTH_CHECK_AFTER', 30)),
+)
 try:
-    conn = psycopg2.connect(DATABASE_URL)
+    pool.open()
     logger.info("Connected")
-    cur = conn.cursor()
 except Exception:
     logger.exception("Database connection failed")
 
 def get_connection():
-    return psycopg2.connect(DATABASE_URL)
+    """Borrow a pooled connection. Use as a context manager."""
+    return pool.connection()
 
-db_lock = threading.Lock()
+def get_pool_stats():
+    return pool.stats()
 
-def init_db():
-    try:
-        conn = get_connection()
-        cur = conn.cursor()
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS race_predictions(
-            guild_id BIGINT NOT NULL,
-            user_id BIGINT NOT NULL,
-            username TEXT NOT NULL,
-            race_number INTEGER NOT NULL,
-            race_name TEXT NOT NULL,
+# Every safe_* call, transaction() and leaderboard rebuild is recorded in
+# query_stats under the helper that issued it, with rows, pool checkout plus
+# advisory lock wait, and its duration. Calls over SLOW_QUERY_MS are logged with redacted params.
 
-            pos1 TEXT,
-            pos2 TEXT,
-            pos3 TEXT,
-            pole TEXT,
-            fastest_lap TEXT,
+_local = threading.local()
 
-            constructor_winner TEXT,
+class _QueryRecord:
+    __slots__ = ("rows", "lock_wait")
 
-            sprint_winner TEXT,
-            sprint_pole TEXT,
+    def __init__(self):
+        self.rows = None
+        self.lock_wait = 0.0
 
-            PRIMARY KEY (guild_id, user_id, race_number)
-            );
-        """)
+def _caller(depth=2):
+    """Name of the function that called the safe_* helper running this.
 
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS prediction_state (
-                guild_id BIGINT NOT NULL PRIMARY KEY,
-                season_open BIGINT NOT NULL DEFAULT 0
-            );
-        """)
+    ``depth`` is the frame of that function counted from here; transaction()
+    passes 3 to skip the contextmanager's __enter__.
+    """
+    frame = sys._getframe(depth)
+    if frame.f_code.co_filename == __file__ and frame.f_code is not tagged_call.__code__:
+        return frame.f_code.co_name
+    # Called straight from async_database: it passed the coroutine that awaited the query
+    tag = getattr(_local, "tag", None)
+    return tag or f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+
+def tagged_call(tag, func, *args, **kwargs):
+    """Runs ``func`` with queries attributed to ``tag``; used by async_database."""
+    _local.tag = tag
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _local.tag = None
+
+@contextmanager
+def _instrument(helper, kind, query=None, params=None):
+    record = _QueryRecord()
+    outer = getattr(_local, "record", None)
+    _local.record = record
+    start = time.perf_counter()
+    error = False
+    try:
+        yield record
+    except Exception:
+        error = True
+        raise
+    finally:
+        _local.record = outer
+        query_stats.record(helper, kind, time.perf_counter() - start, record.rows,
+                           record.lock_wait, error, query, params)
+
+@contextmanager
+def _checkout(record):
+    """get_connection() that adds the pool wait to ``record``."""
+    start = time.perf_counter()
+    with get_connection() as conn:
+        record.lock_wait += time.perf_counter() - start
+        yield conn
+
+def get_query_stats():
+    return query_stats.stats()
+
+# Namespace for pg_advisory_xact_lock(int, int) so per-guild locks can't collide with other users
+LEADERBOARD_LOCK_NAMESPACE = 1
+
+# "table": leaderboard rows are refreshed by every scoring write (default)
+# "materialized": readers use leaderboard_mv, refreshed concurrently after scoring events
+# commit, at most once per LEADERBOARD_VIEW_REFRESH_DELAY seconds
+LEADERBOARD_MODE = os.getenv('LEADERBOARD_MODE', 'table').lower()
+if LEADERBOARD_MODE not in ("table", "materialized"):
+    logger.warning("Unknown LEADERBOARD_MODE %r, falling back to 'table'", LEADERBOARD_MODE)
+    LEADERBOARD_MODE = "table"
+LEADERBOARD_SOURCE = "leaderboard_mv" if LEADERBOARD_MODE == "materialized" else "leaderboard"
+LEADERBOARD_VIEW_REFRESH_DELAY = float(os.getenv('LEADERBOARD_VIEW_REFRESH_DELAY', 2))
+
+LEADERBOARD_COLUMNS = (
+    "guild_id, user_id, username, total_points, fully_correct_podiums, "
+    "correct_podiums, correct_poles, correct_fastest_laps, correct_constructors"
+)
+
+# Ranking order, all descending so a page boundary is one row-value comparison
+# served by idx_leaderboard_rank; user_id makes every position unique. Every
+# column is NOT NULL (migration 0005), a NULL would drop its row from that comparison
+LEADERBOARD_KEY = (
+    "total_points", "fully_correct_podiums", "correct_podiums",
+    "correct_poles", "correct_fastest_laps", "correct_constructors", "user_id"
+)
+LEADERBOARD_ORDER = ", ".join(f"{column} DESC" for column in LEADERBOARD_KEY)
+
+def _leaderboard_key_row(alias=None):
+    prefix = f"{alias}." if alias else ""
+    return "(" + ", ".join(prefix + column for column in LEADERBOARD_KEY) + ")"
+
+# Guilds with more rows than this page through the database instead of a cached snapshot
+LEADERBOARD_SNAPSHOT_MAX_ROWS = int(os.getenv('LEADERBOARD_SNAPSHOT_MAX_ROWS', '2000'))
 
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS season_predictions (
+def init_db():
+    try:
+        with get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS race_predictions(
                 guild_id BIGINT NOT NULL,
                 user_id BIGINT NOT NULL,
                 username TEXT NOT NULL,
-                wdc TEXT,
-                wcc TEXT,
+                race_number INTEGER NOT NULL,
+                race_name TEXT NOT NULL,
+
+                pos1 TEXT,
+                pos2 TEXT,
+                pos3 TEXT,
+                pole TEXT,
+                fastest_lap TEXT,
+
+                constructor_winner TEXT,
+
+                sprint_winner TEXT,
+                sprint_pole TEXT,
+
+                PRIMARY KEY (guild_id, user_id, race_number)
+                );
+            """)
+
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS prediction_state (
+                    guild_id BIGINT NOT NULL PRIMARY KEY,
+                    season_open BIGINT NOT NULL DEFAULT 0
+                );
+            """)
+
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS season_predictions (
+                    guild_id BIGINT NOT NULL,
+                    user_id BIGINT NOT NULL,
+                    username TEXT NOT NULL,
+                    wdc TEXT,
+                    wcc TEXT,
                     
-                PRIMARY KEY (guild_id, user_id)
-            );
-        """)
+                    PRIMARY KEY (guild_id, user_id)
+                );
+            """)
 
-        cur.execute("""CREATE TABLE IF NOT EXISTS prediction_locks (
-        guild_id BIGINT NOT NULL,
-        type TEXT,
-        manual_override TEXT,
+            cur.execute("""CREATE TABLE IF NOT EXISTS prediction_locks (
+            guild_id BIGINT NOT NULL,
+            type TEXT,
+            manual_override TEXT,
                     
-        PRIMARY KEY (guild_id, type)
-        );
-    """)
-        
-        cur.execute("""CREATE TABLE IF NOT EXISTS race_results(
-                    race_number INTEGER PRIMARY KEY,
-                    race_name TEXT,
-                    pos1 TEXT,
-                    pos2 TEXT,
-                    pos3 TEXT,
-                    pole TEXT,
-                    quali_second TEXT,
-                    fastest_lap TEXT,
-                    constructor TEXT,
-                    sprint_winner TEXT,
-                    sprint_pole TEXT,
-                    is_sprint BOOLEAN DEFAULT FALSE)""")
-
-        cur.execute("""CREATE TABLE IF NOT EXISTS race_scores (
-        guild_id BIGINT NOT NULL,
-        user_id BIGINT NOT NULL,
-        username TEXT NOT NULL,
-        race_number INTEGER NOT NULL,
-        race_name TEXT,
-        points INTEGER,
-        PRIMARY KEY (guild_id, user_id, race_number)
-    );
-    """)
+            PRIMARY KEY (guild_id, type)
+            );
+        """)
         
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS scored_races (
+            cur.execute("""CREATE TABLE IF NOT EXISTS race_results(
+                        race_number INTEGER PRIMARY KEY,
+                        race_name TEXT,
+                        pos1 TEXT,
+                        pos2 TEXT,
+                        pos3 TEXT,
+                        pole TEXT,
+                        quali_second TEXT,
+                        fastest_lap TEXT,
+                        constructor TEXT,
+                        sprint_winner TEXT,
+                        sprint_pole TEXT,
+                        is_sprint BOOLEAN DEFAULT FALSE)""")
+
+            cur.execute("""CREATE TABLE IF NOT EXISTS race_scores (
             guild_id BIGINT NOT NULL,
+            user_id BIGINT NOT NULL,
+            username TEXT NOT NULL,
             race_number INTEGER NOT NULL,
-            PRIMARY KEY (guild_id, race_number)
+            race_name TEXT,
+            points INTEGER,
+            PRIMARY KEY (guild_id, user_id, race_number)
         );
-    """)
-        
-        cur.execute("""
-                CREATE TABLE IF NOT EXISTS championship_leaders (
-                season INTEGER NOT NULL,
-                type TEXT NOT NULL, 
-                leader TEXT NOT NULL,
-                PRIMARY KEY (season, type, leader)
-            );
         """)
-
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS final_champions (
-            season INTEGER PRIMARY KEY NOT NULL,
-            wdc TEXT,
-            wdc_second TEXT,
-            wcc TEXT,
-            wcc_second TEXT
-        );
-    """)
         
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS final_scores (
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS scored_races (
                 guild_id BIGINT NOT NULL,
-                user_id BIGINT,
-                username TEXT,
-                points INTEGER,
-                    
-                PRIMARY KEY (guild_id, user_id)
+                race_number INTEGER NOT NULL,
+                PRIMARY KEY (guild_id, race_number)
             );
         """)
+        
+            cur.execute("""
+                    CREATE TABLE IF NOT EXISTS championship_leaders (
+                    season INTEGER NOT NULL,
+                    type TEXT NOT NULL, 
+                    leader TEXT NOT NULL,
+                    PRIMARY KEY (season, type, leader)
+                );
+            """)
 
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS scored_seasons (
-                guild_id BIGINT NOT NULL,
-                season INTEGER NOT NULL,
-                PRIMARY KEY (guild_id, season)
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS final_champions (
+                season INTEGER PRIMARY KEY NOT NULL,
+                wdc TEXT,
+                wdc_second TEXT,
+                wcc TEXT,
+                wcc_second TEXT
             );
         """)
         
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS force_points_log (
-            id SERIAL PRIMARY KEY,
-            guild_id BIGINT NOT NULL,
-            userid BIGINT NOT NULL,
-            username TEXT NOT NULL,
-            points_given INTEGER NOT NULL,
-            reason TEXT,
-            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-        """)
-
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS total_force_points (
-            guild_id BIGINT NOT NULL,
-            user_id BIGINT,
-            username TEXT NOT NULL,
-            points INTEGER DEFAULT 0,
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS final_scores (
+                    guild_id BIGINT NOT NULL,
+                    user_id BIGINT,
+                    username TEXT,
+                    points INTEGER,
                     
-            PRIMARY KEY (guild_id, user_id)
-            );
-        """)
-
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS leaderboard (
-            guild_id BIGINT NOT NULL,
-            user_id BIGINT,
-            username TEXT,
-            total_points INTEGER,
-            fully_correct_podiums INTEGER DEFAULT 0,
-            correct_podiums INTEGER DEFAULT 0,
-            correct_poles INTEGER DEFAULT 0,
-            correct_fastest_laps INTEGER DEFAULT 0,
-            correct_constructors INTEGER DEFAULT 0,
-            PRIMARY KEY (guild_id, user_id)
-            );
-        """)
-
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS crazy_predictions (
-                id SERIAL PRIMARY KEY,
-                guild_id BIGINT NOT NULL,
-                user_id BIGINT NOT NULL,
-                username TEXT NOT NULL,
-                season INT NOT NULL,
-                prediction TEXT NOT NULL,
-                timestamp TIMESTAMP NOT NULL
-            )
-        """)
+                    PRIMARY KEY (guild_id, user_id)
+                );
+            """)
 
-        cur.execute("""CREATE INDEX IF NOT EXISTS idx_crazy_predictions_guild_timestamp
-                    ON crazy_predictions 
-                    (guild_id, timestamp DESC);
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS scored_seasons (
+                    guild_id BIGINT NOT NULL,
+                    season INTEGER NOT NULL,
+                    PRIMARY KEY (guild_id, season)
+                );
             """)
         
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS scored_crazy_predictions (
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS force_points_log (
                 id SERIAL PRIMARY KEY,
                 guild_id BIGINT NOT NULL,
-                crazy_pred_id INTEGER NOT NULL,
-                user_id BIGINT NOT NULL,
+                userid BIGINT NOT NULL,
                 username TEXT NOT NULL,
-                difficulty TEXT NOT NULL,
-                points INTEGER NOT NULL,
-                UNIQUE (guild_id, crazy_pred_id)
-            );
-        """)
+                points_given INTEGER NOT NULL,
+                reason TEXT,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+            """)
 
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS bold_predictions (
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS total_force_points (
                 guild_id BIGINT NOT NULL,
-                user_id BIGINT NOT NULL,
-                race_number INTEGER NOT NULL,
+                user_id BIGINT,
                 username TEXT NOT NULL,
-                race_name TEXT NOT NULL,
-                prediction TEXT NOT NULL,
-                timestamp TIMESTAMP NOT NULL,
-                PRIMARY KEY (guild_id, user_id, race_number)
-            )
-        """)
+                points INTEGER DEFAULT 0,
+                    
+                PRIMARY KEY (guild_id, user_id)
+                );
+            """)
 
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS correct_bold_predictions (
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS leaderboard (
+                guild_id BIGINT NOT NULL,
+                user_id BIGINT,
+                username TEXT,
+                total_points INTEGER NOT NULL DEFAULT 0,
+                fully_correct_podiums INTEGER NOT NULL DEFAULT 0,
+                correct_podiums INTEGER NOT NULL DEFAULT 0,
+                correct_poles INTEGER NOT NULL DEFAULT 0,
+                correct_fastest_laps INTEGER NOT NULL DEFAULT 0,
+                correct_constructors INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (guild_id, user_id)
+                );
+            """)
+
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS crazy_predictions (
+                    id SERIAL PRIMARY KEY,
+                    guild_id BIGINT NOT NULL,
+                    user_id BIGINT NOT NULL,
+                    username TEXT NOT NULL,
+                    season INT NOT NULL,
+                    prediction TEXT NOT NULL,
+                    timestamp TIMESTAMP NOT NULL
+                )
+            """)
+
+            cur.execute("""CREATE INDEX IF NOT EXISTS idx_crazy_predictions_guild_timestamp
+                        ON crazy_predictions 
+                        (guild_id, timestamp DESC);
+                """)
+        
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS scored_crazy_predictions (
+                    id SERIAL PRIMARY KEY,
+                    guild_id BIGINT NOT NULL,
+                    crazy_pred_id INTEGER NOT NULL,
+                    user_id BIGINT NOT NULL,
+                    username TEXT NOT NULL,
+                    difficulty TEXT NOT NULL,
+                    points INTEGER NOT NULL,
+                    UNIQUE (guild_id, crazy_pred_id)
+                );
+            """)
+
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS bold_predictions (
+                    guild_id BIGINT NOT NULL,
+                    user_id BIGINT NOT NULL,
+                    race_number INTEGER NOT NULL,
+                    username TEXT NOT NULL,
+                    race_name TEXT NOT NULL,
+                    prediction TEXT NOT NULL,
+                    timestamp TIMESTAMP NOT NULL,
+                    PRIMARY KEY (guild_id, user_id, race_number)
+                )
+            """)
+
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS correct_bold_predictions (
+                    guild_id BIGINT NOT NULL,
+                    user_id BIGINT NOT NULL,
+                    username TEXT NOT NULL,
+                    race_name TEXT NOT NULL,
+                    difficulty TEXT,
+                    points INTEGER DEFAULT 0,
+                    PRIMARY KEY (guild_id, user_id, race_name)
+                );
+            """)
+
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS prediction_lock_log (
+                id SERIAL PRIMARY KEY,
                 guild_id BIGINT NOT NULL,
                 user_id BIGINT NOT NULL,
                 username TEXT NOT NULL,
-                race_name TEXT NOT NULL,
-                difficulty TEXT,
-                points INTEGER DEFAULT 0,
-                PRIMARY KEY (guild_id, user_id, race_name)
-            );
+                command TEXT NOT NULL,
+                prediction TEXT NOT NULL,
+                state TEXT NOT NULL,
+                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
         """)
-
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS prediction_lock_log (
-            id SERIAL PRIMARY KEY,
-            guild_id BIGINT NOT NULL,
-            user_id BIGINT NOT NULL,
-            username TEXT NOT NULL,
-            command TEXT NOT NULL,
-            prediction TEXT NOT NULL,
-            state TEXT NOT NULL,
-            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
             
-        cur.execute("""CREATE TABLE IF NOT EXISTS persistent_messages (
-        guild_id BIGINT NOT NULL,
-        key TEXT,
-        channel_id BIGINT NOT NULL,
-        message_id BIGINT NOT NULL,
+            cur.execute("""CREATE TABLE IF NOT EXISTS persistent_messages (
+            guild_id BIGINT NOT NULL,
+            key TEXT,
+            channel_id BIGINT NOT NULL,
+            message_id BIGINT NOT NULL,
                     
-        PRIMARY KEY (guild_id, key)
-        )""")
-
-        cur.execute("""CREATE TABLE IF NOT EXISTS guild_config (
-        guild_id BIGINT PRIMARY KEY,
-        prediction_channel_id BIGINT NOT NULL
-    );
-    """)
+            PRIMARY KEY (guild_id, key)
+            )""")
+
+            cur.execute("""CREATE TABLE IF NOT EXISTS guild_config (
+            guild_id BIGINT PRIMARY KEY,
+            prediction_channel_id BIGINT NOT NULL
+        );
+        """)
+        
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS guilds (
+                        guild_id BIGINT PRIMARY KEY,
+                        guild_name TEXT NOT NULL
+                    );
+                """)
         
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS guilds (
-                    guild_id BIGINT PRIMARY KEY,
-                    guild_name TEXT NOT NULL
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS bold_pred_optout (
+                    guild_id BIGINT PRIMARY KEY
                 );
             """)
-        
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS bold_pred_optout (
-                guild_id BIGINT PRIMARY KEY
-            );
-        """)
 
-        conn.commit()
-        cur.close()
-        conn.close()
+            conn.commit()
+            cur.close()
+
+            # Indexes and later schema changes ship as versioned files in migrations/
+            applied = run_migrations(conn)
+            if applied:
+                logger.info("Ran %s migration(s): %s", len(applied), ", ".join(
+                    f"{version:04d}_{name} ({duration_ms:.0f} ms)" for version, name, duration_ms in applied
+                ))
+
+            # leaderboard_mv ships empty in migrations/, fill it before the first read
+            if LEADERBOARD_MODE == "materialized":
+                cur = conn.cursor()
+                cur.execute("SELECT ispopulated FROM pg_matviews WHERE matviewname = 'leaderboard_mv'")
+                row = cur.fetchone()
+                if row is not None and not row[0]:
+                    # CONCURRENTLY refuses a view that was never populated
+                    cur.execute("REFRESH MATERIALIZED VIEW leaderboard_mv")
+                    logger.info("Populated leaderboard_mv")
+                conn.commit()
+                cur.close()
 
     except Exception:
         logger.exception("Failed to initialize DB")
 
 def safe_execute(query, params=()):
-    """For writes: prevents concurrent write issues."""
+    """For writes: each call is its own transaction, Postgres handles concurrency.
+
+    Returns True once committed, False if the write failed (already logged).
+    """
     try:
-        with db_lock:
-            conn = get_connection()
+        with _instrument(_caller(), "execute", query, params) as record, _checkout(record) as conn:
             cur = conn.cursor()
             cur.execute(query, params)
+            record.rows = cur.rowcount
             conn.commit()
             cur.close()
-            conn.close()
+        return True
     except Exception:
         logger.exception("Failed to write to DB for params %s", params)
+        return False
 
 def safe_fetch_all(query, params=()):
     """For reads: no lock needed."""
     try:
-        with db_lock:
-            conn = get_connection()
+        with _instrument(_caller(), "fetch_all", query, params) as record, _checkout(record) as conn:
             cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
             cur.execute(query, params)
             result = cur.fetchall()
+            record.rows = len(result)
             cur.close()
-            conn.close()
             return result
     except Exception:
         logger.exception("Failed to fetch all from DB for params %s", params)
 
 def safe_fetch_one(query, params=()):
     try:
-        with db_lock:
-            conn = get_connection()
+        with _instrument(_caller(), "fetch_one", query, params) as record, _checkout(record) as conn:
             cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
             cur.execute(query, params)
             result = cur.fetchone()
+            record.rows = 0 if result is None else 1
             cur.close()
-            conn.close()
             return result
     except Exception:
         logger.exception("Failed to fetch one from DB for params %s", params)
 
+@contextmanager
+def transaction():
+    """Yields a DictCursor; everything run on it commits together or not at all.
+
+    Callables registered with after_commit(cur, ...) run once the commit succeeded.
+    The whole transaction, advisory lock waits included, is recorded in the
+    query stats under the function that opened it.
+    """
+    with _instrument(_caller(3), "transaction") as record, _checkout(record) as conn:
+        cur = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
+        cur.after_commit = []
+        try:
+            yield cur
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+    for callback in cur.after_commit:
+        callback()
+
+def after_commit(cur, callback):
+    """Defers ``callback`` until the transaction of ``cur`` commits (runs it now outside transaction())."""
+    callbacks = getattr(cur, "after_commit", None)
+    if callbacks is None:
+        callback()
+    else:
+        callbacks.append(callback)
+
 def upsert_guild(guild_id: int, guild_name: str):
         safe_execute("""
             INSERT INTO guilds (guild_id, guild_name)
@@ -343,24 +508,64 @@ def upsert_guild(guild_id: int, guild_name: str):
             DO UPDATE SET guild_name = excluded.guild_name;
         """, (guild_id, guild_name))
 
+_GUILD_CONFIG_QUERY = """
+    SELECT g.guild_id,
+           gc.prediction_channel_id,
+           bo.guild_id IS NOT NULL AS bold_opted_out,
+           COALESCE(
+               json_object_agg(pm.key, json_build_object('channel_id', pm.channel_id, 'message_id', pm.message_id))
+                   FILTER (WHERE pm.key IS NOT NULL),
+               '{{}}'::json
+           ) AS persistent_messages
+    FROM ({guilds}) g
+    LEFT JOIN guild_config gc ON gc.guild_id = g.guild_id
+    LEFT JOIN bold_pred_optout bo ON bo.guild_id = g.guild_id
+    LEFT JOIN persistent_messages pm ON pm.guild_id = g.guild_id
+    GROUP BY g.guild_id, gc.prediction_channel_id, bo.guild_id
+"""
+
+def load_guild_configs():
+    """Hydrates the guild config cache for every guild in one query."""
+    rows = safe_fetch_all(_GUILD_CONFIG_QUERY.format(guilds="""
+        SELECT guild_id FROM guilds
+        UNION SELECT guild_id FROM guild_config
+        UNION SELECT guild_id FROM bold_pred_optout
+        UNION SELECT guild_id FROM persistent_messages
+    """))
+    if rows is None:
+        logger.warning("Guild config not hydrated, lookups fall back to the database")
+        return
+    guild_configs.hydrate(rows)
+    logger.info("Guild config cached: %s", guild_configs.stats())
+
+def _load_guild_config(guild_id):
+    """Caches one guild's config on a miss. False if it couldn't be loaded."""
+    guild_configs.record_miss()
+    row = safe_fetch_one(_GUILD_CONFIG_QUERY.format(guilds="SELECT %s::bigint AS guild_id"), (guild_id,))
+    if row is None:
+        return False
+    guild_configs.put(guild_id, row)
+    return True
+
 def is_bold_pred_opted_out(guild_id):
-    row = safe_fetch_one(
-        "SELECT 1 FROM bold_pred_optout WHERE guild_id = %s",
-        (guild_id,)
-    )
-    return row is not None
+    opted_out = guild_configs.bold_opted_out(guild_id)
+    if opted_out is MISSING and _load_guild_config(guild_id):
+        opted_out = guild_configs.bold_opted_out(guild_id)
+    return False if opted_out is MISSING else opted_out
 
 def set_bold_pred_optout(guild_id, opted_out: bool):
     if opted_out:
-        safe_execute(
+        saved = safe_execute(
             "INSERT INTO bold_pred_optout (guild_id) VALUES (%s) ON CONFLICT DO NOTHING",
             (guild_id,)
         )
     else:
-        safe_execute(
+        saved = safe_execute(
             "DELETE FROM bold_pred_optout WHERE guild_id = %s",
             (guild_id,)
         )
+    if saved:
+        guild_configs.set_bold_opted_out(guild_id, opted_out)
 
 def get_race_number(race_name):
     return safe_fetch_one(
@@ -436,18 +641,25 @@ def fetch_sprint_preds(guild_id, user_id, race_number):
 
 # ---------- lock state ----------
 def set_season_state(guild_id, open_: bool):
-    safe_execute("""
+    if safe_execute("""
         INSERT INTO prediction_state (guild_id, season_open)
         VALUES (%s, %s)
         ON CONFLICT (guild_id)
         DO UPDATE SET season_open = EXCLUDED.season_open
-    """, (guild_id, int(open_)))
+    """, (guild_id, int(open_))):
+        lock_state.set_season_open(guild_id, open_)
 
 def is_season_open(guild_id) -> bool:
+    cached = lock_state.is_season_open(guild_id)
+    if cached is not MISSING:
+        return cached
+    lock_state.record_miss()
     row = safe_fetch_one(
         "SELECT season_open FROM prediction_state WHERE guild_id = %s",
         (guild_id,)
     )
+    if row:
+        lock_state.set_season_open(guild_id, row["season_open"], overwrite=False)
     return bool(row["season_open"]) if row else False
 
 # ---------- predictions ----------
@@ -462,39 +674,127 @@ def save_season_prediction(guild_id, user_id: int, username:str,*, wdc: str, wcc
     """, (guild_id, user_id,username, wdc, wcc))
 
 def guild_default_lock(guild_id: int):
-    safe_execute("""
+    if safe_execute("""
         INSERT INTO prediction_state (guild_id, season_open)
         VALUES (%s, 0)
         ON CONFLICT (guild_id) DO NOTHING;
-    """, (guild_id,))
+    """, (guild_id,)):
+        lock_state.set_season_open(guild_id, False, overwrite=False)
 
 def ensure_lock_rows(guild_id: int):
-    safe_execute("""
+    if safe_execute("""
         INSERT INTO prediction_locks (guild_id, type, manual_override)
         VALUES (%s, 'race', NULL),
                (%s, 'sprint', NULL)
         ON CONFLICT (guild_id, type) DO NOTHING;
-    """, (guild_id, guild_id))
+    """, (guild_id, guild_id)):
+        lock_state.ensure_manual(guild_id, ("race", "sprint"))
+
+LOCK_TYPES = ("race", "sprint")
+
+def bootstrap_guilds(guilds):
+    """Brings guilds, prediction_state and prediction_locks up to date for [(guild_id, name)].
+
+    One query diffs the guilds against the database, then only new or renamed
+    guilds and missing state/lock rows are written, with multi-row inserts in a
+    single transaction. Returns the number of rows written per table.
+    """
+    names = {int(guild_id): name for guild_id, name in guilds}
+    written = {"guilds": 0, "prediction_state": 0, "prediction_locks": 0}
+    if not names:
+        return written
+
+    try:
+        with transaction() as cur:
+            cur.execute("""
+                SELECT ids.guild_id,
+                       g.guild_name,
+                       EXISTS (SELECT 1 FROM prediction_state ps WHERE ps.guild_id = ids.guild_id) AS has_state,
+                       ARRAY(SELECT pl.type FROM prediction_locks pl WHERE pl.guild_id = ids.guild_id) AS lock_types
+                FROM unnest(%s::bigint[]) AS ids(guild_id)
+                LEFT JOIN guilds g ON g.guild_id = ids.guild_id
+            """, (list(names),))
+
+            guild_rows, state_rows, lock_rows = [], [], []
+            for row in cur.fetchall():
+                guild_id = row["guild_id"]
+                if row["guild_name"] != names[guild_id]:
+                    guild_rows.append((guild_id, names[guild_id]))
+                if not row["has_state"]:
+                    state_rows.append((guild_id,))
+                lock_rows.extend(
+                    (guild_id, lock_type) for lock_type in LOCK_TYPES
+                    if lock_type not in row["lock_types"]
+                )
+
+            if guild_rows:
+                psycopg2.extras.execute_values(cur, """
+                    INSERT INTO guilds (guild_id, guild_name) VALUES %s
+                    ON CONFLICT (guild_id) DO UPDATE SET guild_name = excluded.guild_name
+                """, guild_rows)
+            if state_rows:
+                psycopg2.extras.execute_values(cur, """
+                    INSERT INTO prediction_state (guild_id, season_open) VALUES %s
+                    ON CONFLICT (guild_id) DO NOTHING
+                """, state_rows, template="(%s, 0)")
+            if lock_rows:
+                psycopg2.extras.execute_values(cur, """
+                    INSERT INTO prediction_locks (guild_id, type, manual_override) VALUES %s
+                    ON CONFLICT (guild_id, type) DO NOTHING
+                """, lock_rows, template="(%s, %s, NULL)")
+
+            def update_lock_state():
+                for (guild_id,) in state_rows:
+                    lock_state.set_season_open(guild_id, False, overwrite=False)
+                for guild_id in {guild_id for guild_id, _ in lock_rows}:
+                    lock_state.ensure_manual(guild_id, LOCK_TYPES)
+            after_commit(cur, update_lock_state)
+
+    except Exception:
+        logger.exception("Failed to bootstrap %s guilds", len(names))
+        return None
+
+    written.update(guilds=len(guild_rows), prediction_state=len(state_rows), prediction_locks=len(lock_rows))
+    logger.info("Bootstrapped %s guilds, wrote %s", len(names), written)
+    return written
 
 def set_manual_lock(guild_id, pred_type: str, state: str | None):
-    safe_execute(
+    if safe_execute(
         "UPDATE prediction_locks SET manual_override = %s WHERE guild_id = %s AND type = %s",
         (state, guild_id, pred_type)
-    )
+    ):
+        lock_state.set_manual(guild_id, pred_type, state)
 
 def get_manual_lock(guild_id, pred_type: str) -> str | None:
+    cached = lock_state.get_manual(guild_id, pred_type)
+    if cached is not MISSING:
+        return cached
+    lock_state.record_miss()
     row = safe_fetch_one(
         "SELECT manual_override FROM prediction_locks WHERE guild_id = %s AND type = %s",
         (guild_id, pred_type)
     )
+    if row:
+        lock_state.set_manual(guild_id, pred_type, row["manual_override"])
     return row["manual_override"] if row else None
 
 def reset_locks_on_cache_refresh(guild_id):
-    safe_execute("""
+    if safe_execute("""
         UPDATE prediction_locks
         SET manual_override = NULL
         WHERE guild_id = %s AND type IN ('race', 'sprint')
-    """, (guild_id,))
+    """, (guild_id,)):
+        lock_state.reset_manual(guild_id, ("race", "sprint"))
+
+def load_lock_states():
+    """Hydrates the in-memory lock state from prediction_locks and prediction_state."""
+    lock_rows = safe_fetch_all("SELECT guild_id, type, manual_override FROM prediction_locks")
+    state_rows = safe_fetch_all("SELECT guild_id, season_open FROM prediction_state")
+    if lock_rows is None or state_rows is None:
+        logger.warning("Lock state not hydrated, lookups fall back to the database")
+        return
+    lock_state.hydrate(lock_rows, state_rows)
+    logger.info("Lock state cached: %s", lock_state.stats())
 
 def save_race_results(data):
     # Check if race already exists
@@ -588,12 +888,6 @@ def mark_race_scored(guild_id, race_number):
         ON CONFLICT DO NOTHING
     """, (guild_id, race_number))
 
-def clear_race_scores(guild_id):
-    safe_execute(
-        "DELETE FROM race_scores WHERE guild_id = %s",
-        (guild_id,)
-    )
-
 def get_all_scored_races(guild_id):
     rows = safe_fetch_all(
         "SELECT race_number FROM scored_races WHERE guild_id = %s ORDER BY race_number ASC",
@@ -601,12 +895,6 @@ def get_all_scored_races(guild_id):
     )
     return [row['race_number'] for row in rows] if rows else []
 
-def clear_scored_races(guild_id):
-    safe_execute(
-        "DELETE FROM scored_races WHERE guild_id = %s",
-        (guild_id,)
-    )
-
 def is_season_scored(guild_id, season):
     row = safe_fetch_one(
         "SELECT 1 FROM scored_seasons WHERE guild_id = %s AND season = %s",
@@ -622,164 +910,345 @@ def mark_season_scored(guild_id, season):
     """, (guild_id, season))
 
 def add_points(guild_id, user_id: str, username: str, points: int, reason: str):
-    safe_execute(
-        "INSERT INTO force_points_log (guild_id, userid, username, points_given, reason) VALUES (%s, %s, %s, %s, %s)",
-        (guild_id, user_id, username, points, reason)
+    try:
+        with transaction() as cur:
+            cur.execute(
+                "INSERT INTO force_points_log (guild_id, userid, username, points_given, reason) VALUES (%s, %s, %s, %s, %s)",
+                (guild_id, user_id, username, points, reason)
+            )
+
+            # Update or insert total points
+            cur.execute("""
+                INSERT INTO total_force_points (guild_id, user_id, username, points)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT(guild_id, user_id) DO UPDATE SET
+                    points = total_force_points.points + excluded.points,
+                    username = excluded.username
+            """, (guild_id, user_id, username, points))
+
+            refresh_leaderboard_users(cur, guild_id, [user_id])
+    except Exception:
+        logger.exception("Failed to add %s points to user %s in guild %s", points, user_id, guild_id)
+
+def lock_guild_leaderboard(cur, guild_id):
+    """Serializes leaderboard rebuilds of one guild until the current transaction ends."""
+    start = time.perf_counter()
+    cur.execute(
+        "SELECT pg_advisory_xact_lock(%s, hashtext(%s::text))",
+        (LEADERBOARD_LOCK_NAMESPACE, guild_id)
     )
+    record = getattr(_local, "record", None)
+    if record is not None:
+        record.lock_wait += time.perf_counter() - start
 
-    # Update or insert total points
-    safe_execute("""
-        INSERT INTO total_force_points (guild_id, user_id, username, points)
-        VALUES (%s, %s, %s, %s)
-        ON CONFLICT(guild_id, user_id) DO UPDATE SET
-            points = total_force_points.points + excluded.points,
-            username = excluded.username
-    """, (guild_id, user_id, username, points))
+def _leaderboard_select(only_users=False):
+    """Aggregated leaderboard rows for %(guild_id)s.
+
+    With ``only_users`` every source is narrowed to %(user_ids)s, so refreshing
+    a few users only reads their own scores and predictions. leaderboard_mv
+    runs the same query for all guilds; change its migration along with this.
+    """
+    guild_filter = "guild_id = %(guild_id)s"
+    rp_guild_filter = "rp.guild_id = %(guild_id)s"
+    user_filter = "AND user_id = ANY(%(user_ids)s::bigint[])" if only_users else ""
+    rp_filter = "AND rp.user_id = ANY(%(user_ids)s::bigint[])" if only_users else ""
+    return f"""
+        WITH combined_points AS (
+            SELECT guild_id, user_id, username, points
+            FROM race_scores
+            WHERE {guild_filter} {user_filter}
+
+            UNION ALL
+
+            SELECT guild_id, user_id, username, points
+            FROM final_scores
+            WHERE {guild_filter} {user_filter}
+
+            UNION ALL
+
+            SELECT guild_id, user_id, username, points
+            FROM total_force_points
+            WHERE {guild_filter} {user_filter}
+
+            UNION ALL
+
+            SELECT guild_id, user_id, username, points
+            FROM correct_bold_predictions
+            WHERE {guild_filter} {user_filter}
+                
+            UNION ALL
+
+            SELECT guild_id, user_id, username, points
+            FROM scored_crazy_predictions
+            WHERE {guild_filter} {user_filter}
+        ),
+        latest_username AS (
+            SELECT DISTINCT ON (guild_id, user_id) guild_id, user_id, username
+            FROM race_predictions
+            WHERE {guild_filter} {user_filter}
+            -- All DESC so a backward scan of the primary key serves it
+            ORDER BY guild_id DESC, user_id DESC, race_number DESC
+        ),
+        total AS (
+            SELECT cp.guild_id, cp.user_id, 
+                COALESCE(lu.username, MAX(cp.username)) as username, 
+                COALESCE(SUM(cp.points), 0) as total_points
+            FROM combined_points cp
+            LEFT JOIN latest_username lu ON lu.user_id = cp.user_id AND lu.guild_id = cp.guild_id
+            GROUP BY cp.guild_id, cp.user_id, lu.username
+        ),
+        tiebreakers AS (
+            SELECT 
+                rp.guild_id,
+                rp.user_id,
+                COUNT(CASE WHEN rp.pos1 = rr.pos1 AND rp.pos2 = rr.pos2 AND rp.pos3 = rr.pos3 THEN 1 END) AS fully_correct_podiums,
+                COUNT(CASE WHEN rp.pos1 = rr.pos1 THEN 1 END) +
+                COUNT(CASE WHEN rp.pos2 = rr.pos2 THEN 1 END) +
+                COUNT(CASE WHEN rp.pos3 = rr.pos3 THEN 1 END) AS correct_podiums,
+                COUNT(CASE WHEN rp.pole = rr.pole THEN 1 END) AS correct_poles,
+                COUNT(CASE WHEN rp.fastest_lap = rr.fastest_lap THEN 1 END) AS correct_fastest_laps,
+                COUNT(CASE WHEN rp.constructor_winner = rr.constructor THEN 1 END) AS correct_constructors
+            FROM race_predictions rp
+            LEFT JOIN race_results rr ON rr.race_number = rp.race_number
+            WHERE {rp_guild_filter} {rp_filter}
+            GROUP BY rp.guild_id, rp.user_id
+        )
+        SELECT 
+            t.guild_id,
+            t.user_id,
+            t.username,
+            t.total_points,
+            COALESCE(tb.fully_correct_podiums, 0) AS fully_correct_podiums,
+            COALESCE(tb.correct_podiums, 0) AS correct_podiums,
+            COALESCE(tb.correct_poles, 0) AS correct_poles,
+            COALESCE(tb.correct_fastest_laps, 0) AS correct_fastest_laps,
+            COALESCE(tb.correct_constructors, 0) AS correct_constructors
+        FROM total t
+        LEFT JOIN tiebreakers tb ON tb.user_id = t.user_id AND tb.guild_id = t.guild_id
+    """
+
+def refresh_leaderboard_view(cur):
+    """Recomputes leaderboard_mv beside the live copy; readers keep the old rows until it swaps."""
+    cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY leaderboard_mv")
+    after_commit(cur, leaderboard_cache.invalidate)
+
+_view_refresh_lock = threading.Lock()
+_view_refresh_running = threading.Lock()
+_view_refresh_timer = None
+
+def request_leaderboard_view_refresh():
+    """Schedules a background refresh of leaderboard_mv.
+
+    Requests arriving before it starts share it, so a burst of scoring writes
+    pays for one refresh, LEADERBOARD_VIEW_REFRESH_DELAY after the first.
+    """
+    global _view_refresh_timer
+    with _view_refresh_lock:
+        if _view_refresh_timer is not None:
+            return
+        _view_refresh_timer = threading.Timer(LEADERBOARD_VIEW_REFRESH_DELAY, _run_view_refresh)
+        _view_refresh_timer.daemon = True
+        _view_refresh_timer.start()
+
+def _run_view_refresh():
+    global _view_refresh_timer
+    with _view_refresh_lock:
+        # Writes committed from here on schedule the next refresh
+        _view_refresh_timer = None
+    try:
+        with _view_refresh_running, transaction() as cur:
+            refresh_leaderboard_view(cur)
+    except Exception:
+        logger.exception("Error refreshing leaderboard view")
 
 def update_leaderboard(guild_id):
-    with db_lock:
-        conn = get_connection()
+    """Full rebuild of a guild's leaderboard. Repair path, scoring writes refresh incrementally."""
+    if LEADERBOARD_MODE == "materialized":
         try:
-            cur = conn.cursor()
+            with _view_refresh_running, transaction() as cur:
+                refresh_leaderboard_view(cur)
+        except Exception:
+            logger.exception("Error refreshing leaderboard view for guild %s", guild_id)
+        return
 
-            cur.execute("DELETE FROM leaderboard WHERE guild_id = %s;", (guild_id,))
+    try:
+        with _instrument("update_leaderboard", "rebuild", params=(guild_id,)) as record, _checkout(record) as conn:
+            try:
+                cur = conn.cursor()
 
-            cur.execute("""
-                WITH combined_points AS (
-                    SELECT guild_id, user_id, username, points
-                    FROM race_scores
-                    WHERE guild_id = %s
-
-                    UNION ALL
-
-                    SELECT guild_id, user_id, username, points
-                    FROM final_scores
-                    WHERE guild_id = %s
-
-                    UNION ALL
-
-                    SELECT guild_id, user_id, username, points
-                    FROM total_force_points
-                    WHERE guild_id = %s
-
-                    UNION ALL
-
-                    SELECT guild_id, user_id, username, points
-                    FROM correct_bold_predictions
-                    WHERE guild_id = %s
-                        
-                    UNION ALL
-
-                    SELECT guild_id, user_id, username, points
-                    FROM scored_crazy_predictions
-                    WHERE guild_id = %s
-                ),
-                latest_username AS (
-                    SELECT DISTINCT ON (guild_id, user_id) guild_id, user_id, username
-                    FROM race_predictions
-                    WHERE guild_id = %s
-                    ORDER BY guild_id, user_id, race_number DESC
-                ),
-                total AS (
-                    SELECT cp.guild_id, cp.user_id, 
-                        COALESCE(lu.username, MAX(cp.username)) as username, 
-                        SUM(cp.points) as total_points
-                    FROM combined_points cp
-                    LEFT JOIN latest_username lu ON lu.user_id = cp.user_id AND lu.guild_id = cp.guild_id
-                    GROUP BY cp.guild_id, cp.user_id, lu.username
-                ),
-                tiebreakers AS (
-                    SELECT 
-                        rp.guild_id,
-                        rp.user_id,
-                        COUNT(CASE WHEN rp.pos1 = rr.pos1 AND rp.pos2 = rr.pos2 AND rp.pos3 = rr.pos3 THEN 1 END) AS fully_correct_podiums,
-                        COUNT(CASE WHEN rp.pos1 = rr.pos1 THEN 1 END) +
-                        COUNT(CASE WHEN rp.pos2 = rr.pos2 THEN 1 END) +
-                        COUNT(CASE WHEN rp.pos3 = rr.pos3 THEN 1 END) AS correct_podiums,
-                        COUNT(CASE WHEN rp.pole = rr.pole THEN 1 END) AS correct_poles,
-                        COUNT(CASE WHEN rp.fastest_lap = rr.fastest_lap THEN 1 END) AS correct_fastest_laps,
-                        COUNT(CASE WHEN rp.constructor_winner = rr.constructor THEN 1 END) AS correct_constructors
-                    FROM race_predictions rp
-                    LEFT JOIN race_results rr ON rr.race_number = rp.race_number
-                    WHERE rp.guild_id = %s
-                    GROUP BY rp.guild_id, rp.user_id
+                # Other guilds rebuild in parallel, readers keep seeing the last committed rows
+                lock_guild_leaderboard(cur, guild_id)
+                cur.execute("DELETE FROM leaderboard WHERE guild_id = %s;", (guild_id,))
+
+                cur.execute(
+                    f"INSERT INTO leaderboard ({LEADERBOARD_COLUMNS}) {_leaderboard_select()}",
+                    {"guild_id": guild_id}
                 )
-                INSERT INTO leaderboard (guild_id, user_id, username, total_points, fully_correct_podiums, correct_podiums, correct_poles, correct_fastest_laps, correct_constructors)
-                SELECT 
-                    t.guild_id,
-                    t.user_id,
-                    t.username,
-                    t.total_points,
-                    COALESCE(tb.fully_correct_podiums, 0),
-                    COALESCE(tb.correct_podiums, 0),
-                    COALESCE(tb.correct_poles, 0),
-                    COALESCE(tb.correct_fastest_laps, 0),
-                    COALESCE(tb.correct_constructors, 0)
-                FROM total t
-                LEFT JOIN tiebreakers tb ON tb.user_id = t.user_id AND tb.guild_id = t.guild_id
-                ORDER BY 
-                    t.total_points DESC,
-                    fully_correct_podiums DESC,
-                    correct_podiums DESC,
-                    correct_poles DESC,
-                    correct_fastest_laps DESC,
-                    correct_constructors DESC;
-            """, (guild_id, guild_id, guild_id, guild_id, guild_id, guild_id, guild_id))
+                record.rows = cur.rowcount
 
-            conn.commit()
-            cur.close()
+                conn.commit()
+                cur.close()
+                leaderboard_cache.invalidate(guild_id)
 
-        except Exception as e:
-            conn.rollback()
-            logger.exception("Error updating leaderboard for guild %s", guild_id)
-        finally:
-            conn.close()
+            except Exception:
+                conn.rollback()
+                raise
+    except Exception:
+        logger.exception("Error updating leaderboard for guild %s", guild_id)
+
+def refresh_leaderboards(cur, users_by_guild):
+    """Re-aggregates only the given {guild_id: user_ids} inside the caller's transaction.
+
+    Idempotent, so it is safe to call after any write touching these users'
+    scores or predictions; users left without points drop off the board.
+    In materialized mode the view is refreshed in the background once the
+    transaction commits, debounced across writers.
+    """
+    users_by_guild = {
+        int(guild_id): list({int(u) for u in user_ids})
+        for guild_id, user_ids in users_by_guild.items()
+    }
+    if not any(users_by_guild.values()):
+        return
+
+    if LEADERBOARD_MODE == "materialized":
+        after_commit(cur, request_leaderboard_view_refresh)
+        return
+
+    # Locks are taken in guild_id order so two multi-guild writers can't deadlock
+    for guild_id, user_ids in sorted(users_by_guild.items()):
+        if not user_ids:
+            continue
+        lock_guild_leaderboard(cur, guild_id)
+        params = {"guild_id": guild_id, "user_ids": user_ids}
+        cur.execute(
+            "DELETE FROM leaderboard WHERE guild_id = %(guild_id)s AND user_id = ANY(%(user_ids)s::bigint[])",
+            params
+        )
+        cur.execute(
+            f"INSERT INTO leaderboard ({LEADERBOARD_COLUMNS}) "
+            + _leaderboard_select(only_users=True),
+            params
+        )
+        after_commit(cur, lambda guild_id=guild_id: leaderboard_cache.invalidate(guild_id))
+
+def refresh_leaderboard_users(cur, guild_id, user_ids):
+    refresh_leaderboards(cur, {guild_id: user_ids})
+
+def verify_leaderboard(guild_id):
+    """Returns the user_ids whose stored leaderboard row differs from a full re-aggregation."""
+    rows = safe_fetch_all(f"""
+        WITH expected AS ({_leaderboard_select()}),
+        stored AS (
+            SELECT {LEADERBOARD_COLUMNS} FROM {LEADERBOARD_SOURCE} WHERE guild_id = %(guild_id)s
+        )
+        SELECT user_id FROM (SELECT * FROM expected EXCEPT SELECT * FROM stored) missing
+        UNION
+        SELECT user_id FROM (SELECT * FROM stored EXCEPT SELECT * FROM expected) extra
+    """, {"guild_id": guild_id})
+    return [row["user_id"] for row in rows or []]
 
 def clear_leaderboard(guild_id):
+    """Drops the guild's stored rows; in materialized mode also requests a leaderboard_mv refresh."""
     safe_execute(
         "DELETE FROM leaderboard WHERE guild_id = %s",
         (guild_id,)
     )
+    leaderboard_cache.invalidate(guild_id)
+    if LEADERBOARD_MODE == "materialized":
+        # The view is derived from the score tables, a DELETE on leaderboard never reaches it
+        request_leaderboard_view_refresh()
 
 def get_top_n(guild_id, n):
-    return safe_fetch_all("""
+    return safe_fetch_all(f"""
         SELECT username, total_points
-        FROM leaderboard
+        FROM {LEADERBOARD_SOURCE}
         WHERE guild_id = %s
-        ORDER BY 
-            total_points DESC,
-            fully_correct_podiums DESC,
-            correct_podiums DESC,
-            correct_poles DESC,
-            correct_fastest_laps DESC,
-            correct_constructors DESC
+        ORDER BY {LEADERBOARD_ORDER}
         LIMIT %s
     """, (guild_id, n))
 
-def get_full_leaderboard(guild_id):
-    return safe_fetch_all(
-        "SELECT username, total_points FROM leaderboard WHERE guild_id = %s ORDER BY total_points DESC",
+def get_full_leaderboard(guild_id, limit=None):
+    return safe_fetch_all(f"""
+        SELECT user_id, username, total_points
+        FROM {LEADERBOARD_SOURCE}
+        WHERE guild_id = %s
+        ORDER BY {LEADERBOARD_ORDER}
+        LIMIT %s
+    """, (guild_id, limit))
+
+def get_leaderboard_snapshot(guild_id):
+    """Cached ranked leaderboard of a guild, built from the database on a miss.
+
+    Returns None for guilds above LEADERBOARD_SNAPSHOT_MAX_ROWS, which page
+    with get_leaderboard_page instead.
+    """
+    snapshot = leaderboard_cache.get(guild_id)
+    if snapshot is not None:
+        return snapshot
+
+    leaderboard_cache.record_miss()
+    generation = leaderboard_cache.generation(guild_id)
+    rows = get_full_leaderboard(guild_id, LEADERBOARD_SNAPSHOT_MAX_ROWS + 1)
+    if rows is None:
+        return LeaderboardSnapshot([])
+    if len(rows) > LEADERBOARD_SNAPSHOT_MAX_ROWS:
+        return None
+    snapshot = LeaderboardSnapshot(rows)
+    leaderboard_cache.store(guild_id, generation, snapshot)
+    return snapshot
+
+def leaderboard_key(row):
+    """Keyset cursor of a leaderboard row, pass it as ``after`` to get the next page."""
+    return tuple(row[column] for column in LEADERBOARD_KEY)
+
+def get_leaderboard_page(guild_id, limit, after=None):
+    """Up to ``limit`` ranked rows following the cursor ``after`` (None for the first page).
+
+    Rows carry the key columns, so leaderboard_key(rows[-1]) is the next cursor.
+    """
+    if after is None:
+        return safe_fetch_all(f"""
+            SELECT username, {', '.join(LEADERBOARD_KEY)}
+            FROM {LEADERBOARD_SOURCE}
+            WHERE guild_id = %s
+            ORDER BY {LEADERBOARD_ORDER}
+            LIMIT %s
+        """, (guild_id, limit))
+
+    return safe_fetch_all(f"""
+        SELECT username, {', '.join(LEADERBOARD_KEY)}
+        FROM {LEADERBOARD_SOURCE}
+        WHERE guild_id = %s
+          AND {_leaderboard_key_row()} < %s
+        ORDER BY {LEADERBOARD_ORDER}
+        LIMIT %s
+    """, (guild_id, tuple(after), limit))
+
+def get_leaderboard_size(guild_id):
+    row = safe_fetch_one(
+        f"SELECT COUNT(*) FROM {LEADERBOARD_SOURCE} WHERE guild_id = %s",
         (guild_id,)
     )
+    return row[0] if row else 0
 
-def get_user_rank(guild_id, username):
-    return safe_fetch_one("""
-        SELECT rank, total_points FROM (
-            SELECT username, total_points,
-                   RANK() OVER (
-                       ORDER BY 
-                        total_points DESC,
-                        fully_correct_podiums DESC,
-                        correct_podiums DESC,
-                        correct_poles DESC,
-                        correct_fastest_laps DESC,
-                        correct_constructors DESC
-                   ) AS rank
-            FROM leaderboard
-            WHERE guild_id = %s
-        ) sub
-        WHERE username = %s
-    """, (guild_id, username))
+def get_user_rank(guild_id, user_id):
+    """{"rank", "username", "total_points"} of ``user_id``, None if they have no points.
+
+    The rank is the user's position in leaderboard order, counted over the
+    rank index instead of ranking the whole guild.
+    """
+    return safe_fetch_one(f"""
+        SELECT
+            (SELECT COUNT(*) FROM {LEADERBOARD_SOURCE} ahead
+             WHERE ahead.guild_id = me.guild_id
+               AND {_leaderboard_key_row("ahead")} > {_leaderboard_key_row("me")}
+            ) + 1 AS rank,
+            me.username,
+            me.total_points
+        FROM {LEADERBOARD_SOURCE} me
+        WHERE me.guild_id = %s AND me.user_id = %s
+    """, (guild_id, user_id))
 
 def save_crazy_prediction(guild_id, user_id, username, season, prediction, timestamp):
     safe_execute(
@@ -814,13 +1283,18 @@ def count_crazy_predictions(guild_id, user_id, season):
     return result[0]["count"]
 
 def save_scored_crazy_prediction(guild_id, crazy_pred_id, user_id, username, difficulty, points):
-    safe_execute("""
-        INSERT INTO scored_crazy_predictions (guild_id, crazy_pred_id, user_id, username, difficulty, points)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        ON CONFLICT (guild_id, crazy_pred_id) DO UPDATE SET
-            difficulty = excluded.difficulty,
-            points = excluded.points
-    """, (guild_id, crazy_pred_id, user_id, username, difficulty, points))
+    try:
+        with transaction() as cur:
+            cur.execute("""
+                INSERT INTO scored_crazy_predictions (guild_id, crazy_pred_id, user_id, username, difficulty, points)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (guild_id, crazy_pred_id) DO UPDATE SET
+                    difficulty = excluded.difficulty,
+                    points = excluded.points
+            """, (guild_id, crazy_pred_id, user_id, username, difficulty, points))
+            refresh_leaderboard_users(cur, guild_id, [user_id])
+    except Exception:
+        logger.exception("Failed to score crazy prediction %s in guild %s", crazy_pred_id, guild_id)
 
 def get_all_crazy_predictions_for_user(guild_id, user_id, season):
     return safe_fetch_all("""
@@ -845,10 +1319,16 @@ def get_all_crazy_predictions(guild_id, season):
     """, (guild_id, guild_id, season))
 
 def remove_scored_crazy_prediction(guild_id, crazy_pred_id):
-    safe_execute("""
-        DELETE FROM scored_crazy_predictions
-        WHERE guild_id = %s AND crazy_pred_id = %s
-    """, (guild_id, crazy_pred_id))
+    try:
+        with transaction() as cur:
+            cur.execute("""
+                DELETE FROM scored_crazy_predictions
+                WHERE guild_id = %s AND crazy_pred_id = %s
+                RETURNING user_id
+            """, (guild_id, crazy_pred_id))
+            refresh_leaderboard_users(cur, guild_id, [row["user_id"] for row in cur.fetchall()])
+    except Exception:
+        logger.exception("Failed to unscore crazy prediction %s in guild %s", crazy_pred_id, guild_id)
 
 def save_bold_prediction(guild_id, user_id, race_number, username, race_name, prediction, timestamp):
     safe_execute(
@@ -887,23 +1367,33 @@ def fetch_bold_predictions(guild_id, race_number=None, race_name=None):
         return []
     
 def save_correct_bold_prediction(guild_id, user_id, username, race_name, difficulty, points):
-    safe_execute(
-        """
-        INSERT INTO correct_bold_predictions (guild_id, user_id, username, race_name, difficulty, points)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        ON CONFLICT (guild_id, user_id, race_name) DO UPDATE SET
-            username = excluded.username,
-            difficulty = excluded.difficulty,
-            points = excluded.points
-        """,
-        (guild_id, user_id, username, race_name, difficulty, points)
-    )
+    try:
+        with transaction() as cur:
+            cur.execute(
+                """
+                INSERT INTO correct_bold_predictions (guild_id, user_id, username, race_name, difficulty, points)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (guild_id, user_id, race_name) DO UPDATE SET
+                    username = excluded.username,
+                    difficulty = excluded.difficulty,
+                    points = excluded.points
+                """,
+                (guild_id, user_id, username, race_name, difficulty, points)
+            )
+            refresh_leaderboard_users(cur, guild_id, [user_id])
+    except Exception:
+        logger.exception("Failed to score bold prediction of user %s in guild %s", user_id, guild_id)
 
 def remove_correct_bold_prediction(guild_id, user_id, race_name):
-    safe_execute(
-        "DELETE FROM correct_bold_predictions WHERE guild_id = %s AND user_id = %s AND race_name = %s",
-        (guild_id, user_id, race_name)
-    )
+    try:
+        with transaction() as cur:
+            cur.execute(
+                "DELETE FROM correct_bold_predictions WHERE guild_id = %s AND user_id = %s AND race_name = %s",
+                (guild_id, user_id, race_name)
+            )
+            refresh_leaderboard_users(cur, guild_id, [user_id])
+    except Exception:
+        logger.exception("Failed to unscore bold prediction of user %s in guild %s", user_id, guild_id)
 
 def get_correct_bold_predictions(guild_id, user_id):
     return safe_fetch_all("""
@@ -937,13 +1427,14 @@ def prediction_state_log(guild_id, user_id, username, command, prediction, state
     """, (guild_id, user_id, username, command, prediction, state))
         
 def get_persistent_message(guild_id, key):
-    return safe_fetch_one(
-        "SELECT channel_id, message_id FROM persistent_messages WHERE guild_id = %s AND key = %s",
-        (guild_id, key)
-    )
+    """Returns {"channel_id", "message_id"} or None"""
+    message = guild_configs.persistent_message(guild_id, key)
+    if message is MISSING and _load_guild_config(guild_id):
+        message = guild_configs.persistent_message(guild_id, key)
+    return None if message is MISSING else message
 
 def save_persistent_message(guild_id, key, channel_id, message_id):
-    safe_execute(
+    if safe_execute(
         """
         INSERT INTO persistent_messages (guild_id, key, channel_id, message_id)
         VALUES (%s, %s, %s, %s)
@@ -952,7 +1443,15 @@ def save_persistent_message(guild_id, key, channel_id, message_id):
                       message_id = excluded.message_id
         """,
         (guild_id, key, channel_id, message_id)
-    )
+    ):
+        guild_configs.set_persistent_message(guild_id, key, channel_id, message_id)
+
+def delete_persistent_message(guild_id, key):
+    if safe_execute(
+        "DELETE FROM persistent_messages WHERE guild_id = %s AND key = %s",
+        (guild_id, key)
+    ):
+        guild_configs.remove_persistent_message(guild_id, key)
 
 def set_prediction_channel(guild_id: int, channel_id: int):
     query = """
@@ -961,17 +1460,13 @@ def set_prediction_channel(guild_id: int, channel_id: int):
         ON CONFLICT (guild_id)
         DO UPDATE SET prediction_channel_id = EXCLUDED.prediction_channel_id;
     """
-    safe_execute(query, (guild_id, channel_id))
+    if safe_execute(query, (guild_id, channel_id)):
+        guild_configs.set_prediction_channel(guild_id, channel_id)
 
 
 def get_prediction_channel(guild_id: int):
     """Returns an int channel ID or None"""
-    row = safe_fetch_one(
-        "SELECT prediction_channel_id FROM guild_config WHERE guild_id = %s",
-        (guild_id,)
-    )
-    if row is None:
-        return None
-
-    # safe-fetch returns a dict
-    return row.get("prediction_channel_id")
+    channel_id = guild_configs.prediction_channel(guild_id)
+    if channel_id is MISSING and _load_guild_config(guild_id):
+        channel_id = guild_configs.prediction_channel(guild_id)
+    return None if channel_id is MISSING else channel_id
@@ -0,0 +1,114 @@
+# db_migrations.py
+"""Versioned schema migrations.
+
+Migrations are plain SQL files in migrations/ named NNNN_description.sql.
+Each pending file runs in its own transaction together with its
+schema_version row, so a failed migration leaves nothing half applied.
+"""
+import os
+import re
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+# Namespace for pg_advisory_lock(int, int), database.LEADERBOARD_LOCK_NAMESPACE is 1
+MIGRATION_LOCK_NAMESPACE = 2
+
+_MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+class MigrationError(Exception):
+    """Raised when the migration files or the recorded schema_version are inconsistent."""
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """Returns [(version, name, path)] sorted by version."""
+    migrations = []
+    seen = {}
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".sql"):
+            continue
+        match = _MIGRATION_FILE.match(filename)
+        if not match:
+            raise MigrationError(f"Badly named migration {filename!r}, expected NNNN_description.sql")
+
+        version = int(match.group(1))
+        if version in seen:
+            raise MigrationError(f"Migrations {seen[version]!r} and {filename!r} share version {version}")
+        seen[version] = filename
+        migrations.append((version, match.group(2), os.path.join(directory, filename)))
+    return migrations
+
+def run_migrations(conn, directory=MIGRATIONS_DIR):
+    """Applies pending migrations on ``conn``.
+
+    Returns [(version, name, duration_ms)] for the migrations applied by this call.
+    """
+    migrations = discover_migrations(directory)
+    known = {version for version, _, _ in migrations}
+    applied_now = []
+
+    cur = conn.cursor()
+    try:
+        # Session lock: survives the per-migration commits, so a second instance
+        # starting at the same time waits and then finds nothing left to do
+        cur.execute("SELECT pg_advisory_lock(%s, 0)", (MIGRATION_LOCK_NAMESPACE,))
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                duration_ms INTEGER
+            )
+        """)
+        conn.commit()
+
+        cur.execute("SELECT version FROM schema_version")
+        applied = {row[0] for row in cur.fetchall()}
+
+        unknown = applied - known
+        if unknown:
+            raise MigrationError(
+                f"Database has migrations {sorted(unknown)} that this build does not know, "
+                "refusing to run against a newer schema"
+            )
+
+        pending = [m for m in migrations if m[0] not in applied]
+        if applied and pending and pending[0][0] < max(applied):
+            logger.warning("Applying migration %04d out of order, schema is already at %04d",
+                           pending[0][0], max(applied))
+
+        for version, name, path in pending:
+            with open(path, encoding="utf-8") as f:
+                sql = f.read()
+
+            start = time.monotonic()
+            try:
+                cur.execute(sql)
+                duration_ms = (time.monotonic() - start) * 1000
+                cur.execute(
+                    "INSERT INTO schema_version (version, name, duration_ms) VALUES (%s, %s, %s)",
+                    (version, name, round(duration_ms))
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                logger.exception("Migration %04d_%s failed, rolled back", version, name)
+                raise
+
+            logger.info("Applied migration %04d_%s in %.1f ms", version, name, duration_ms)
+            applied_now.append((version, name, duration_ms))
+
+        if not pending:
+            logger.info("Schema up to date at version %04d", max(applied, default=0))
+        return applied_now
+
+    finally:
+        try:
+            conn.rollback()
+            cur.execute("SELECT pg_advisory_unlock(%s, 0)", (MIGRATION_LOCK_NAMESPACE,))
+            conn.commit()
+        except Exception:
+            logger.exception("Failed to release the migration lock")
+        cur.close()
@@ -0,0 +1,220 @@
+# db_pool.py
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+import psycopg2
+import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+class ConnectionPool:
+    """Bounded, thread-safe psycopg2 connection pool.
+
+    Connections idle for longer than ``health_check_after`` seconds are pinged
+    before being handed out, and connections idle for longer than
+    ``idle_timeout`` seconds are closed as long as the pool stays above
+    ``min_size``.
+    """
+
+    def __init__(self, dsn, min_size=1, max_size=10, idle_timeout=300,
+                 checkout_timeout=30, health_check_after=30):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool bounds min={min_size} max={max_size}")
+
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.health_check_after = health_check_after
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (conn, last_used), oldest on the left
+        self._size = 0        # open + being opened connections
+        self._in_use = 0
+        self._closed = False
+
+        # metrics
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+        self._discarded = 0
+        self._evicted = 0
+
+    def _connect(self):
+        return psycopg2.connect(self.dsn)
+
+    def open(self):
+        """Pre-open ``min_size`` connections."""
+        opened = []
+        with self._cond:
+            missing = self.min_size - self._size
+            self._size += max(missing, 0)
+        try:
+            for _ in range(max(missing, 0)):
+                opened.append(self._connect())
+        finally:
+            with self._cond:
+                self._size -= max(missing, 0) - len(opened)
+                now = time.monotonic()
+                for conn in opened:
+                    self._idle.append((conn, now))
+                self._cond.notify_all()
+
+    def _evict_idle_locked(self):
+        """Pop connections past the idle timeout. Caller holds the lock and closes them."""
+        expired = []
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size:
+            conn, last_used = self._idle[0]
+            if now - last_used < self.idle_timeout:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            self._evicted += 1
+            expired.append(conn)
+        return expired
+
+    def _is_healthy(self, conn, last_used):
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.health_check_after:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conns):
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def getconn(self):
+        start = time.monotonic()
+        deadline = start + self.checkout_timeout
+        expired = []
+        conn = None
+        last_used = None
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise PoolTimeout("Connection pool is closed")
+                expired.extend(self._evict_idle_locked())
+                if self._idle:
+                    # LIFO keeps the warmest connections busy and lets the rest age out
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    self._close_quietly(expired)
+                    raise PoolTimeout(
+                        f"No database connection available after {self.checkout_timeout}s "
+                        f"({self._in_use}/{self.max_size} in use)"
+                    )
+                self._cond.wait(remaining)
+
+        self._close_quietly(expired)
+
+        try:
+            if conn is not None and not self._is_healthy(conn, last_used):
+                logger.warning("Discarding unhealthy pooled connection")
+                self._close_quietly([conn])
+                with self._cond:
+                    self._discarded += 1
+                conn = None
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+        waited = time.monotonic() - start
+        with self._cond:
+            self._in_use += 1
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return conn
+
+    def putconn(self, conn, discard=False):
+        if not discard:
+            try:
+                if conn.closed:
+                    discard = True
+                elif conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._size -= 1
+                if discard:
+                    self._discarded += 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+            self._cond.notify()
+
+        if conn is not None:
+            self._close_quietly([conn])
+
+    @contextmanager
+    def connection(self):
+        conn = self.getconn()
+        discard = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            # Broken connections must not go back into the pool
+            discard = True
+            raise
+        finally:
+            self.putconn(conn, discard=discard)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            conns = [conn for conn, _ in self._idle]
+            self._size -= len(conns)
+            self._idle.clear()
+            self._cond.notify_all()
+        self._close_quietly(conns)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "checkouts": self._checkouts,
+                "avg_wait_ms": (self._wait_total / self._checkouts * 1000) if self._checkouts else 0.0,
+                "max_wait_ms": self._wait_max * 1000,
+                "timeouts": self._timeouts,
+                "discarded": self._discarded,
+                "evicted": self._evicted,
+            }
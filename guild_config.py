@@ -0,0 +1,96 @@
+# guild_config.py
+"""In-memory per-guild config: prediction channel, bold opt-out, persistent messages.
+
+Hydrated in one query at startup, guilds missing from it are loaded on first
+use. database.py updates an entry after each successful write, so reads never
+need the database once a guild is cached.
+"""
+import threading
+from lock_state import MISSING
+
+class GuildConfigCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._configs = {}  # guild_id -> {"prediction_channel_id", "bold_opted_out", "persistent_messages"}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _entry(row):
+        return {
+            "prediction_channel_id": row["prediction_channel_id"],
+            "bold_opted_out": bool(row["bold_opted_out"]),
+            "persistent_messages": dict(row["persistent_messages"] or {}),
+        }
+
+    def hydrate(self, rows):
+        configs = {row["guild_id"]: self._entry(row) for row in rows}
+        with self._lock:
+            self._configs = configs
+
+    def put(self, guild_id, row):
+        with self._lock:
+            self._configs[guild_id] = self._entry(row)
+
+    def _lookup(self, guild_id):
+        # Called with self._lock held; misses are recorded where database.py queries
+        config = self._configs.get(guild_id)
+        if config is not None:
+            self.hits += 1
+        return config
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def _get(self, guild_id, field):
+        with self._lock:
+            config = self._lookup(guild_id)
+            return MISSING if config is None else config[field]
+
+    def prediction_channel(self, guild_id):
+        """Cached channel id (or None), MISSING if the guild isn't cached."""
+        return self._get(guild_id, "prediction_channel_id")
+
+    def bold_opted_out(self, guild_id):
+        return self._get(guild_id, "bold_opted_out")
+
+    def persistent_message(self, guild_id, key):
+        """Cached {"channel_id", "message_id"} (or None), MISSING if the guild isn't cached."""
+        with self._lock:
+            config = self._lookup(guild_id)
+            if config is None:
+                return MISSING
+            message = config["persistent_messages"].get(key)
+            return dict(message) if message else None
+
+    # Writes only touch guilds already cached; others load in full on their next read
+    def _update(self, guild_id, field, value):
+        with self._lock:
+            config = self._configs.get(guild_id)
+            if config is not None:
+                config[field] = value
+
+    def set_prediction_channel(self, guild_id, channel_id):
+        self._update(guild_id, "prediction_channel_id", channel_id)
+
+    def set_bold_opted_out(self, guild_id, opted_out):
+        self._update(guild_id, "bold_opted_out", bool(opted_out))
+
+    def set_persistent_message(self, guild_id, key, channel_id, message_id):
+        with self._lock:
+            config = self._configs.get(guild_id)
+            if config is not None:
+                config["persistent_messages"][key] = {"channel_id": channel_id, "message_id": message_id}
+
+    def remove_persistent_message(self, guild_id, key):
+        with self._lock:
+            config = self._configs.get(guild_id)
+            if config is not None:
+                config["persistent_messages"].pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {"guilds": len(self._configs), "hits": self.hits, "misses": self.misses}
+
+guild_configs = GuildConfigCache()
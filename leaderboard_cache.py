@@ -0,0 +1,85 @@
+# leaderboard_cache.py
+"""Per-guild snapshots of the ranked leaderboard.
+
+A snapshot is built once from the database and then serves every page flip
+and position lookup until database.py invalidates the guild after a
+leaderboard write commits.
+"""
+import threading
+
+class LeaderboardSnapshot:
+    """Ranked rows of one guild plus a user_id -> position index."""
+
+    def __init__(self, rows):
+        self.rows = [dict(row) for row in rows]
+        self._positions = {row["user_id"]: i for i, row in enumerate(self.rows)}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def page(self, page, per_page):
+        start = page * per_page
+        return self.rows[start:start + per_page]
+
+    def position(self, user_id):
+        """1-based position of ``user_id``, None if they have no points."""
+        index = self._positions.get(user_id)
+        return None if index is None else index + 1
+
+    def row_for(self, user_id):
+        index = self._positions.get(user_id)
+        return None if index is None else self.rows[index]
+
+class LeaderboardCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots = {}    # guild_id -> LeaderboardSnapshot
+        self._generations = {}  # guild_id -> invalidation counter
+        self._all_generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, guild_id):
+        with self._lock:
+            snapshot = self._snapshots.get(guild_id)
+            if snapshot is not None:
+                self.hits += 1
+            return snapshot
+
+    def record_miss(self):
+        """Called by database.py when it builds a snapshot from the database."""
+        with self._lock:
+            self.misses += 1
+
+    def generation(self, guild_id):
+        """Token to pass to store(); a snapshot read before an invalidation is then dropped."""
+        with self._lock:
+            return (self._all_generation, self._generations.get(guild_id, 0))
+
+    def store(self, guild_id, generation, snapshot):
+        with self._lock:
+            if generation != (self._all_generation, self._generations.get(guild_id, 0)):
+                return False
+            self._snapshots[guild_id] = snapshot
+            return True
+
+    def invalidate(self, guild_id=None):
+        """Drops the snapshot of ``guild_id``, or of every guild when None."""
+        with self._lock:
+            if guild_id is None:
+                self._all_generation += 1
+                self._snapshots.clear()
+            else:
+                self._generations[guild_id] = self._generations.get(guild_id, 0) + 1
+                self._snapshots.pop(guild_id, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "guilds": len(self._snapshots),
+                "rows": sum(len(s) for s in self._snapshots.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+leaderboard_cache = LeaderboardCache()
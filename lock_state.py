@@ -0,0 +1,82 @@
+# lock_state.py
+"""In-memory mirror of prediction_locks and prediction_state.
+
+database.py writes through to it after every successful write and hydrates it
+at startup, so predictions_open can answer from memory on every dropdown
+change. Guilds that were never loaded are misses and fall back to the DB.
+"""
+import threading
+
+MISSING = object()
+
+class LockStateCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._manual = {}       # guild_id -> {"race": override, "sprint": override}
+        self._season_open = {}  # guild_id -> bool
+        self.hits = 0
+        self.misses = 0
+
+    def hydrate(self, lock_rows, state_rows):
+        """Replaces the cache with prediction_locks and prediction_state rows."""
+        manual = {}
+        for row in lock_rows:
+            manual.setdefault(row["guild_id"], {})[row["type"]] = row["manual_override"]
+        season_open = {row["guild_id"]: bool(row["season_open"]) for row in state_rows}
+        with self._lock:
+            self._manual = manual
+            self._season_open = season_open
+
+    def get_manual(self, guild_id, pred_type):
+        """Cached manual override (None means AUTO), or MISSING if not cached."""
+        with self._lock:
+            return self._count(self._manual.get(guild_id, {}).get(pred_type, MISSING))
+
+    # Misses are recorded by database.py when it falls back to a query, so an
+    # async fast-path miss re-checked on the executor isn't counted twice
+    def _count(self, value):
+        # Called with self._lock held
+        if value is not MISSING:
+            self.hits += 1
+        return value
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def set_manual(self, guild_id, pred_type, state):
+        with self._lock:
+            self._manual.setdefault(guild_id, {})[pred_type] = state
+
+    def ensure_manual(self, guild_id, pred_types):
+        """Adds AUTO rows the way ensure_lock_rows does, keeping existing overrides."""
+        with self._lock:
+            guild = self._manual.setdefault(guild_id, {})
+            for pred_type in pred_types:
+                guild.setdefault(pred_type, None)
+
+    def reset_manual(self, guild_id, pred_types):
+        with self._lock:
+            guild = self._manual.get(guild_id)
+            if guild is None:
+                return
+            for pred_type in pred_types:
+                if pred_type in guild:
+                    guild[pred_type] = None
+
+    def is_season_open(self, guild_id):
+        """Cached season state, or MISSING if not cached."""
+        with self._lock:
+            return self._count(self._season_open.get(guild_id, MISSING))
+
+    def set_season_open(self, guild_id, open_, overwrite=True):
+        with self._lock:
+            if overwrite or guild_id not in self._season_open:
+                self._season_open[guild_id] = bool(open_)
+
+    def stats(self):
+        with self._lock:
+            return {"guilds": len(self._manual), "season_states": len(self._season_open),
+                    "hits": self.hits, "misses": self.misses}
+
+lock_state = LockStateCache()
@@ -1,3 +1,6 @@
+from utils import import_timing
+import_timing.enable_from_env()
+
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
@@ -6,11 +9,16 @@ from dotenv import load_dotenv
 import logging
 from datetime import datetime, timedelta
 import asyncio
+import functools
+import math
 from config import CRAZY_PRED_POINTS, BOLD_PRED_POINTS
 from pathlib import Path
 from collections import defaultdict
-from FastF1_service import refresh_race_cache, season_calender
-from database import (init_db,
+from FastF1_service import refresh_race_cache, season_calender, invalidate_schedule, preload as preload_fastf1
+from async_database import (init_db,
+                      get_pool_stats,
+                      get_query_stats,
+                      run_blocking,
                       safe_fetch_one,
                       save_race_predictions,
                       get_race_number,
@@ -23,14 +31,20 @@ from database import (init_db,
                       save_season_prediction,
                       set_manual_lock,
                       get_manual_lock,
+                      load_lock_states,
+                      load_guild_configs,
                       reset_locks_on_cache_refresh,
                       add_points,
-                      get_full_leaderboard,
+                      get_leaderboard_snapshot,
                       get_top_n,
                       get_user_rank,
+                      get_leaderboard_page,
+                      get_leaderboard_size,
+                      leaderboard_key,
                       save_crazy_prediction,
                       save_bold_prediction,
                       update_leaderboard,
+                      verify_leaderboard,
                       prediction_state_log,
                       is_bold_pred_opted_out,
                       set_bold_pred_optout,
@@ -38,15 +52,13 @@ from database import (init_db,
                       count_crazy_predictions,
                       set_prediction_channel,
                       get_prediction_channel,
-                      guild_default_lock,
-                      ensure_lock_rows,
+                      bootstrap_guilds,
                       upsert_guild,
                       get_persistent_message,
                       save_persistent_message,
+                      delete_persistent_message,
                       mark_race_scored,
                       get_all_scored_races,
-                      clear_scored_races,
-                      clear_race_scores,
                       mark_season_scored,
                       save_correct_bold_prediction,
                       remove_correct_bold_prediction,
@@ -57,10 +69,20 @@ from database import (init_db,
                       remove_scored_crazy_prediction,
                       get_all_crazy_predictions_for_user)
 
-from results_watcher import poll_results_loop
-from champions_watcher import final_champions_loop
-from get_now import get_now, TIME_MULTIPLE, SEASON
-from scoring import score_race_for_guild, score_final_champions_for_guild
+from results_watcher import register_results_handlers, schedule_next_race_end
+from champions_watcher import register_champions_handlers, schedule_season_end
+from scheduler import Scheduler
+from option_catalog import catalog, refresh_catalog
+from announcer import AnnouncementJob, dispatch
+from startup import StartupPipeline, sync_command_tree
+import metrics
+import announcer
+from config import cache_stats
+from lock_state import lock_state
+from guild_config import guild_configs
+from leaderboard_cache import leaderboard_cache
+from get_now import get_now, SEASON
+from scoring import score_race_for_guild, score_final_champions_for_guild, rescore_races_for_guild
 import logging
 import sys
 from utils.git_utils import get_changelog, get_changes
@@ -91,6 +113,7 @@ except Exception as e:
     print("Logging couldn't initialize, error:", e)
 
 logger = logging.getLogger(__name__)
+import_timing.mark("imports done")
 
 # Load environment variables
 load_dotenv()
@@ -119,6 +142,10 @@ bot = commands.Bot(command_prefix='/', intents=intents)
 RACE_CACHE: dict = {}
 SEASON_CALENDER = []
 
+# Bold predictions are published this long before quali and re-published until it locks
+BOLD_PUBLISH_WINDOW = timedelta(days=4)
+BOLD_REPUBLISH_EVERY = timedelta(hours=1)
+
 leaderboard_update_time = None
 
 if RACE_CACHE.get("lock_time") is not None:
@@ -128,65 +155,68 @@ leaderboard_task = None
 
 # Helpers
 
-async def race_cache_watcher():
-    await bot.wait_until_ready()
-
-    while not bot.is_closed():
-        next_refresh = RACE_CACHE.get("next_refresh")
-
-        if next_refresh is None:
-            # Nothing scheduled yet → check again later
-            await asyncio.sleep(3600/TIME_MULTIPLE)
-            continue
+scheduler = Scheduler()
+register_results_handlers(scheduler, bot)
+register_champions_handlers(scheduler, bot)
 
-        now = get_now()
-        delay = (next_refresh - now).total_seconds()
-
-        if delay <= 0:
-            # Missed it or startup case
-            try:
-                new_cache = await refresh_race_cache(now)
-                if new_cache:
-                    RACE_CACHE.clear()
-                    RACE_CACHE.update(new_cache)
+def plan_weekend(now=None):
+    """Schedules the lock, bold publish and cache refresh deadlines of the weekend in RACE_CACHE."""
+    now = now or get_now()
 
-                for guild in bot.guilds:
-                    try:
-                        reset_locks_on_cache_refresh(guild.id)
-                    except Exception:
-                        logger.exception("Failed to reset locks for guild %s", guild.id)
+    next_refresh = RACE_CACHE.get("next_refresh")
+    if next_refresh is None or next_refresh <= now:
+        # Nothing scheduled yet or no race left → check again later
+        next_refresh = now + timedelta(hours=1)
+    scheduler.schedule("race_cache_refresh", next_refresh)
 
-            except Exception:
-                logger.exception("Error in race_cache_watcher main loop.")
-
-            await asyncio.sleep(60/TIME_MULTIPLE)
-            continue
-
-        try:
-            await asyncio.sleep(delay/TIME_MULTIPLE)
-        except asyncio.CancelledError:
-            return  # task cancelled on shutdown or restart
-
-        # Time reached
-        try:
-            new_cache = await refresh_race_cache(now)
-            if new_cache:
-                RACE_CACHE.clear()
-                RACE_CACHE.update(new_cache)
+    # Sprint locking needs no event: predictions_open checks the time on every
+    # interaction and no persistent message shows sprint predictions
+    lock_time = RACE_CACHE.get("lock_time")
+    if lock_time and lock_time > now:
+        scheduler.schedule("quali_lock", lock_time)
+        scheduler.schedule("bold_publish", max(lock_time - BOLD_PUBLISH_WINDOW, now))
+    else:
+        scheduler.cancel("quali_lock")
+        scheduler.cancel("bold_publish")
+
+@scheduler.on("race_cache_refresh")
+async def on_race_cache_refresh(event):
+    now = get_now()
+    try:
+        # The next weekend's timetable may have moved since it was cached
+        invalidate_schedule(SEASON)
+        new_cache = await refresh_race_cache(now)
+        if new_cache:
+            RACE_CACHE.clear()
+            RACE_CACHE.update(new_cache)
 
             for guild in bot.guilds:
                 try:
-                    reset_locks_on_cache_refresh(guild.id)
+                    await reset_locks_on_cache_refresh(guild.id)
                 except Exception:
                     logger.exception("Failed to reset locks for guild %s", guild.id)
-            
-        except Exception:
-            logger.exception("Error in race_cache_watcher main loop.")
+
+    except Exception:
+        logger.exception("Error refreshing race cache.")
+
+    # The finished weekend may have brought replacement drivers; a no-op unless a race ended
+    try:
+        await refresh_catalog(SEASON)
+    except Exception:
+        logger.exception("Error refreshing option catalog.")
+
+    plan_weekend(now)
+
+@scheduler.on("quali_lock")
+async def on_quali_lock(event):
+    logger.info("Race predictions locked for the %s", RACE_CACHE.get("race_name"))
+    # Final edit of the pinned bold predictions, which stops inviting submissions
+    await publish_bold_predictions(locked=True)
 
 # Function to check if predictions are open
-def predictions_open(guild_id, now: datetime, RACE_CACHE) -> bool:
+async def predictions_open(guild_id, now: datetime, RACE_CACHE) -> bool:
     lock_time = RACE_CACHE.get("lock_time")
-    manual = get_manual_lock(guild_id, "race")
+    manual = await get_manual_lock(guild_id, "race")
 
     if manual == "LOCKED":
         return False
@@ -205,9 +235,9 @@ def predictions_open(guild_id, now: datetime, RACE_CACHE) -> bool:
 # race_number -> { user_id -> [predictions] }
 user_predictions = {}
 
-def sprint_predictions_open(guild_id, now: datetime, RACE_CACHE) -> bool:
+async def sprint_predictions_open(guild_id, now: datetime, RACE_CACHE) -> bool:
     sprint_lock_time = RACE_CACHE.get("sprint_lock_time")
-    sprint_manual = get_manual_lock(guild_id, "sprint")
+    sprint_manual = await get_manual_lock(guild_id, "sprint")
 
     if sprint_manual == "LOCKED":
         return False
@@ -223,37 +253,73 @@ def sprint_predictions_open(guild_id, now: datetime, RACE_CACHE) -> bool:
     
     return sprint_lock_time is not None and now < sprint_lock_time
 
-@bot.event
-async def on_ready():
-    global SEASON_CALENDER
-    init_db()
-    await bot.tree.sync()
+startup = StartupPipeline()
+
+@startup.step("init_db")
+async def startup_init_db():
+    await init_db()
+
+@startup.step("sync_commands")
+async def startup_sync_commands():
+    return await sync_command_tree(bot.tree, bot.application_id)
+
+# Heavy FastF1/pandas imports, on a worker thread so the gateway keeps running
+@startup.step("preload_fastf1")
+async def startup_preload_fastf1():
+    await asyncio.to_thread(preload_fastf1)
+
+@startup.step("race_cache", after=("preload_fastf1",))
+async def startup_race_cache():
     initial = await refresh_race_cache(get_now())
     if initial:
         RACE_CACHE.update(initial)
-    logger.info("Bot is ready.")
-    SEASON_CALENDER = await season_calender(SEASON)
-
-    if getattr(bot, "cache_task_started", False):
-        return # Prevent multiple tasks
-    
-    if not hasattr(bot, "race_cache_task"):
-        bot.race_cache_task = asyncio.create_task(race_cache_watcher())
-    
-    if not hasattr(bot, "poll_results_task"):
-        bot.poll_results_task = asyncio.create_task(poll_results_loop(bot))
-
-    if not hasattr(bot, "final_champions_task"):
-        bot.final_champions_task = asyncio.create_task(final_champions_loop(bot))
 
-    if not bold_predictions_publisher.is_running():
-        bold_predictions_publisher.start()
-        logger.info("Bold loop started")
+@startup.step("season_calendar", after=("preload_fastf1",))
+async def startup_season_calendar():
+    global SEASON_CALENDER
+    calendar = await season_calender(SEASON)
+    if calendar is None:
+        # Raising leaves the step pending, so the next on_ready retries it
+        raise RuntimeError(f"Could not load the {SEASON} calendar")
+    SEASON_CALENDER = calendar
+
+@startup.step("option_catalog", after=("preload_fastf1",))
+async def startup_option_catalog():
+    await refresh_catalog(SEASON)
+
+@startup.step("scheduler", after=("init_db", "race_cache"))
+async def startup_scheduler():
+    plan_weekend()
+    await schedule_next_race_end(scheduler)
+    await schedule_season_end(scheduler)
+    bot.scheduler_task = asyncio.create_task(scheduler.run())
+    logger.info("Scheduler started")
+
+# Every connect: guilds may have been joined or renamed while disconnected
+@startup.step("guilds", after=("init_db",), once=False)
+async def startup_guilds():
+    written = await bootstrap_guilds([(guild.id, guild.name) for guild in bot.guilds])
+    if written is None:
+        raise RuntimeError("Guild bootstrap failed")
+
+@startup.step("metrics")
+async def startup_metrics():
+    bot.loop_lag_task = asyncio.create_task(metrics.monitor_loop_lag())
+    if metrics.start_metrics_server() is None:
+        return "disabled (no METRICS_PORT)"
+    bot.metrics_snapshot_task = asyncio.create_task(snapshot_bot_metrics())
+
+# predictions_open, channel and opt-out lookups read from memory from here on
+@startup.step("memory_caches", after=("guilds",))
+async def startup_memory_caches():
+    await asyncio.gather(load_lock_states(), load_guild_configs())
 
-    for guild in bot.guilds:
-        upsert_guild(guild.id, guild.name)
-        guild_default_lock(guild.id)
-        ensure_lock_rows(guild.id)
+@bot.event
+async def on_ready():
+    await startup.run()
+    logger.info("Bot is ready.")
+    if startup.runs == 1:
+        import_timing.mark("ready")
 
     if not heartbeat.is_running():
         heartbeat.start()
@@ -261,9 +327,68 @@ async def on_ready():
     # Send an immediate heartbeat when the bot comes online
     await asyncio.to_thread(send_heartbeat)
 
+def _command_latency(interaction, status):
+    command = interaction.command.qualified_name if interaction.command else "unknown"
+    latency = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+    metrics.command_latency.observe(latency, command=command, status=status)
+
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    _command_latency(interaction, "ok")
+
+METRICS_SNAPSHOT_INTERVAL = float(os.getenv("METRICS_SNAPSHOT_INTERVAL", 15))
+
+# Samples of state the event loop owns (scheduler, guild list, announcer totals)
+# or too slow to compute per scrape (the FastF1 cache walk). snapshot_bot_metrics
+# replaces the list on the loop; the metrics thread only reads the reference.
+_bot_metrics_snapshot = []
+
+async def snapshot_bot_metrics(interval=METRICS_SNAPSHOT_INTERVAL):
+    """Refreshes _bot_metrics_snapshot every ``interval`` seconds; runs until cancelled."""
+    global _bot_metrics_snapshot
+    while True:
+        try:
+            samples = []
+            fastf1_cache = await asyncio.to_thread(cache_stats)
+            for key, value in fastf1_cache.items():
+                samples.append((f"bot_fastf1_cache_{key}", value, {}))
+
+            announce_stats = announcer.stats()
+            for key in ("delivered", "failed", "retries"):
+                samples.append((f"bot_announcements_{key}", announce_stats[key], {}))
+
+            for event in scheduler.pending():
+                samples.append(("bot_scheduler_next_event_timestamp", event.when.timestamp(), {"kind": event.kind}))
+            samples.append(("bot_guilds", len(bot.guilds), {}))
+            # bot.latency is NaN until the first heartbeat ack
+            samples.append(("bot_gateway_latency_seconds", bot.latency if math.isfinite(bot.latency) else None, {}))
+            _bot_metrics_snapshot = samples
+        except Exception:
+            logger.exception("Failed to snapshot bot metrics")
+        await asyncio.sleep(interval)
+
+@metrics.register_collector
+def collect_bot_metrics():
+    """Runs on the metrics thread: lock-protected stats live, the rest from the last snapshot."""
+    samples = []
+    for name, stats in (("db_pool", get_pool_stats()),
+                        ("lock_state", lock_state.stats()),
+                        ("guild_config", guild_configs.stats()),
+                        ("leaderboard_cache", leaderboard_cache.stats())):
+        for key, value in stats.items():
+            samples.append((f"bot_{name}_{key}", value, {}))
+
+    for helper, stats in get_query_stats().items():
+        for key, value in stats.items():
+            samples.append((f"bot_db_query_{key}", value, {"helper": helper}))
+
+    samples.extend(_bot_metrics_snapshot)
+    return samples
+
 @bot.tree.error
 async def on_app_command_error(interaction: discord.Interaction, error: discord.app_commands.AppCommandError):
     try:
+        _command_latency(interaction, "error")
         logger.exception("Command error: %s", error)
 
         if interaction.response.is_done():
@@ -284,21 +409,13 @@ async def on_guild_join(guild: discord.Guild):
     guild_id = guild.id
     logger.info("Joined new guild: %s, %s", guild.name, guild_id)
 
-    guild_name = guild.name
-
-    # Adds Guild to Guild Table
-    upsert_guild(guild.id, guild_name)
-
-    # Set up default season state
-    guild_default_lock(guild_id)
-
-    # Add default prediction locks for this guild
-    ensure_lock_rows(guild_id)
+    # Guild row, default season state and prediction locks in one transaction
+    await bootstrap_guilds([(guild_id, guild.name)])
 
 @bot.event
 async def on_guild_update(before, after):
     if before.name != after.name:
-        upsert_guild(after.id, after.name)
+        await upsert_guild(after.id, after.name)
 
 prediction_locked = {}
 
@@ -313,16 +430,6 @@ PRED_INDEX = {
 }
 
 
-DRIVERS = [
-    "VER","HAD","RUS","ANT","LEC","HAM","NOR","PIA",
-    "SAI","ALB","LAW","LIN","OCO","BEA","ALO","STR",
-    "PER","BOT","BOR","HUL","COL","GAS",]
-
-CONSTRUCTORS = [
-    "Mercedes", "Red Bull Racing", "Ferrari", "McLaren",
-    "Haas F1 Team", "Racing Bulls", "Williams",
-    "Audi", "Cadillac", "Aston Martin", "Alpine"]
-
 @bot.tree.command(name="version", description="Show bot version information")
 async def version(interaction: discord.Interaction):
     patch, _ = get_changelog()
@@ -381,13 +488,9 @@ class PodiumPredictionView(discord.ui.View):
 
         for i in range(3):
             curr = self.preds[i]
-            options = [
-                discord.SelectOption(label=d, value=d, default=(d == curr))
-                for d in DRIVERS
-            ]
             select = discord.ui.Select(
                 placeholder=f"Position {i+1}" if not curr else curr,
-                options=options,
+                options=catalog.driver_options(curr),
                 row=i,
                 disabled=closed
             )
@@ -417,7 +520,7 @@ class PodiumPredictionView(discord.ui.View):
             try:
                 await interaction.response.defer(ephemeral=True)
 
-                if not predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
+                if not await predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
                     for child in self.children:
                         child.disabled = True
                     await interaction.edit_original_response(content=self.get_content(), view=self)
@@ -437,11 +540,7 @@ class PodiumPredictionView(discord.ui.View):
                 for child in self.children:
                     if isinstance(child, discord.ui.Select) and child.row < 3:
                         curr = self.preds[child.row]
-                        child.options = [
-                            discord.SelectOption(label=d, value=d, default=(d == curr))
-                            for d in DRIVERS
-                            if d not in taken or d == curr
-                        ]
+                        child.options = catalog.driver_options(curr, exclude=taken)
                         child.placeholder = f"Position {child.row + 1}" if not curr else curr
 
                 await interaction.edit_original_response(content=await self.get_content(), view=self)
@@ -451,8 +550,8 @@ class PodiumPredictionView(discord.ui.View):
         return callback
 
     async def get_content(self):
-        existing, _ = await asyncio.to_thread(
-            fetch_existing_predictions, self.guild_id, self.user_id, self.race_number
+        existing, _ = await fetch_existing_predictions(
+            self.guild_id, self.user_id, self.race_number
         )
         db_preds = [existing['pos1'], existing['pos2'], existing['pos3']] if existing else [None, None, None]
         labels = ["🥇 Position 1", "🥈 Position 2", "🥉 Position 3"]
@@ -469,10 +568,7 @@ class PodiumPredictionView(discord.ui.View):
             await interaction.response.defer(ephemeral=True)
             for child in self.children:
                 if isinstance(child, discord.ui.Select):
-                    child.options = [
-                        discord.SelectOption(label=d, value=d)
-                        for d in DRIVERS
-                    ]
+                    child.options = catalog.driver_options()
                     child.placeholder = f"Position {child.row + 1}"
             self.preds = [None, None, None]
             await interaction.edit_original_response(content=await self.get_content(), view=self)
@@ -484,15 +580,15 @@ class PodiumPredictionView(discord.ui.View):
             await interaction.response.defer(ephemeral=True)
 
             # Only save if predictions are open
-            if predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
-                save_race_predictions(
+            if await predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
+                await save_race_predictions(
                     self.guild_id, self.user_id,
                     interaction.user.name,
                     self.race_number, self.race_name,
                     pos1=self.preds[0], pos2=self.preds[1], pos3=self.preds[2]
                 )
 
-            existing, _ = await asyncio.to_thread(fetch_existing_predictions, self.guild_id, self.user_id, self.race_number)
+            existing, _ = await fetch_existing_predictions(self.guild_id, self.user_id, self.race_number)
             pole = existing['pole'] if existing else None
             fl = existing['fastest_lap'] if existing else None
             constructor = existing['constructor_winner'] if existing else None
@@ -500,7 +596,7 @@ class PodiumPredictionView(discord.ui.View):
             next_view = OtherPredictionView(
                 self.guild_id, self.user_id, self.race_number,
                 self.race_name, self.preds, pole, fl, constructor,
-                closed=not predictions_open(interaction.guild.id, get_now(), RACE_CACHE),
+                closed=not await predictions_open(interaction.guild.id, get_now(), RACE_CACHE),
                 is_sprint=self.is_sprint
             )
             await interaction.followup.send(
@@ -532,10 +628,7 @@ class OtherPredictionView(discord.ui.View):
         # Pole select
         pole_select = discord.ui.Select(
             placeholder="🏆 Pole Position",
-            options=[
-                discord.SelectOption(label=d, value=d, default=(d == pole))
-                for d in DRIVERS
-            ],
+            options=catalog.driver_options(pole),
             row=0,
             disabled=closed
         )
@@ -545,10 +638,7 @@ class OtherPredictionView(discord.ui.View):
         # Fastest lap select
         fl_select = discord.ui.Select(
             placeholder="⚡ Fastest Lap",
-            options=[
-                discord.SelectOption(label=d, value=d, default=(d == fastest_lap))
-                for d in DRIVERS
-            ],
+            options=catalog.driver_options(fastest_lap),
             row=1,
             disabled=closed
         )
@@ -558,10 +648,7 @@ class OtherPredictionView(discord.ui.View):
         # Constructor select
         cons_select = discord.ui.Select(
             placeholder="🏎️ Winning Constructor",
-            options=[
-                discord.SelectOption(label=c, value=c, default=(c == constructor))
-                for c in CONSTRUCTORS
-            ],
+            options=catalog.constructor_options(constructor),
             row=2,
             disabled=closed
         )
@@ -591,7 +678,7 @@ class OtherPredictionView(discord.ui.View):
             try:
                 await interaction.response.defer(ephemeral=True)
 
-                if not predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
+                if not await predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
                     for child in self.children:
                         child.disabled = True
                     await interaction.edit_original_response(
@@ -624,7 +711,7 @@ class OtherPredictionView(discord.ui.View):
             try:
                 await interaction.response.defer(ephemeral=True)
 
-                if not predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
+                if not await predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
                     for child in self.children:
                         child.disabled = True
                     await interaction.edit_original_response(
@@ -650,7 +737,7 @@ class OtherPredictionView(discord.ui.View):
     async def get_content(self):
         lines = [f"🏁 **{self.race_name} — Other Predictions**\n"]
         
-        existing, _ = await asyncio.to_thread(fetch_existing_predictions, self.guild_id, self.user_id, self.race_number)
+        existing, _ = await fetch_existing_predictions(self.guild_id, self.user_id, self.race_number)
         db_pole = existing['pole'] if existing else None
         db_fl = existing['fastest_lap'] if existing else None
         db_cons = existing['constructor_winner'] if existing else None
@@ -679,8 +766,8 @@ class OtherPredictionView(discord.ui.View):
         try:
             await interaction.response.defer(ephemeral=True)
 
-            if predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
-                save_race_predictions(
+            if await predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
+                await save_race_predictions(
                     self.guild_id, self.user_id, interaction.user.name,
                     self.race_number, self.race_name,
                     pole=self.pole, fastest_lap=self.fastest_lap,
@@ -688,12 +775,12 @@ class OtherPredictionView(discord.ui.View):
                 )
 
             if self.is_sprint:
-                sprint_existing = await asyncio.to_thread(
-                    fetch_sprint_preds, self.guild_id, self.user_id, self.race_number
+                sprint_existing = await fetch_sprint_preds(
+                    self.guild_id, self.user_id, self.race_number
                 )
                 sprint_winner = sprint_existing['sprint_winner'] if sprint_existing else None
                 sprint_pole = sprint_existing['sprint_pole'] if sprint_existing else None
-                sprint_closed = not sprint_predictions_open(interaction.guild.id, get_now(), RACE_CACHE)
+                sprint_closed = not await sprint_predictions_open(interaction.guild.id, get_now(), RACE_CACHE)
 
                 next_view = SprintPredictionStepView(
                     self.guild_id, self.user_id, self.race_number, self.race_name,
@@ -707,8 +794,8 @@ class OtherPredictionView(discord.ui.View):
                     ephemeral=True
                 )
             else:
-                _, existing_bold = await asyncio.to_thread(
-                    fetch_existing_predictions, self.guild_id, self.user_id, self.race_number
+                _, existing_bold = await fetch_existing_predictions(
+                    self.guild_id, self.user_id, self.race_number
                 )
                 bold = existing_bold['prediction'] if existing_bold else None
                 next_view = BoldPredictionView(
@@ -743,10 +830,7 @@ class SprintPredictionStepView(discord.ui.View):
 
         winner_select = discord.ui.Select(
             placeholder="Sprint Winner" if not sprint_winner else sprint_winner,
-            options=[
-                discord.SelectOption(label=d, value=d, default=(d == sprint_winner))
-                for d in DRIVERS
-            ],
+            options=catalog.driver_options(sprint_winner),
             row=0,
             disabled=sprint_closed
         )
@@ -755,10 +839,7 @@ class SprintPredictionStepView(discord.ui.View):
 
         pole_select = discord.ui.Select(
             placeholder="Sprint Pole" if not sprint_pole else sprint_pole,
-            options=[
-                discord.SelectOption(label=d, value=d, default=(d == sprint_pole))
-                for d in DRIVERS
-            ],
+            options=catalog.driver_options(sprint_pole),
             row=1,
             disabled=sprint_closed
         )
@@ -784,8 +865,8 @@ class SprintPredictionStepView(discord.ui.View):
         self.add_item(next_btn)
 
     async def get_content(self):
-        existing = await asyncio.to_thread(
-            fetch_sprint_preds, self.guild_id, self.user_id, self.race_number
+        existing = await fetch_sprint_preds(
+            self.guild_id, self.user_id, self.race_number
         )
         db_winner = existing['sprint_winner'] if existing else None
         db_pole = existing['sprint_pole'] if existing else None
@@ -802,7 +883,7 @@ class SprintPredictionStepView(discord.ui.View):
             try:
                 await interaction.response.defer(ephemeral=True)
 
-                if not sprint_predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
+                if not await sprint_predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
                     for child in self.children:
                         if isinstance(child, discord.ui.Select):
                             child.disabled = True
@@ -852,15 +933,15 @@ class SprintPredictionStepView(discord.ui.View):
             await interaction.response.defer(ephemeral=True)
 
             if not self.sprint_closed:
-                save_sprint_predictions(
+                await save_sprint_predictions(
                     self.guild_id, self.user_id,
                     interaction.user.name,
                     self.race_number, self.race_name,
                     self.sprint_winner, self.sprint_pole
                 )
 
-            _, existing_bold = await asyncio.to_thread(
-                fetch_existing_predictions, self.guild_id, self.user_id, self.race_number
+            _, existing_bold = await fetch_existing_predictions(
+                self.guild_id, self.user_id, self.race_number
             )
             bold = existing_bold['prediction'] if existing_bold else None
 
@@ -899,7 +980,7 @@ class BoldPredModal(discord.ui.Modal, title="Bold Prediction"):
         try:
             await interaction.response.defer(ephemeral=True)
 
-            save_bold_prediction(
+            await save_bold_prediction(
                 self.guild_id,
                 user_id=self.user_id,
                 race_number=self.race_number,
@@ -923,7 +1004,7 @@ class BoldPredModal(discord.ui.Modal, title="Bold Prediction"):
             )
 
             # Public announcement
-            channel_id = get_prediction_channel(self.guild_id)
+            channel_id = await get_prediction_channel(self.guild_id)
             if channel_id:
                 try:
                     guild = interaction.guild
@@ -972,7 +1053,7 @@ class BoldPredictionView(discord.ui.View):
         lines = [f"🧨 **{self.race_name} — Bold Prediction**\n"]
         
         # Always show DB value
-        _, existing_bold = await asyncio.to_thread(fetch_existing_predictions, self.guild_id, self.user_id, self.race_number)
+        _, existing_bold = await fetch_existing_predictions(self.guild_id, self.user_id, self.race_number)
         db_bold = existing_bold['prediction'] if existing_bold else None
         
         lines.append(f"**Saved Prediction:** {db_bold or '_Not saved yet_'}")
@@ -985,7 +1066,7 @@ class BoldPredictionView(discord.ui.View):
 
     async def enter_callback(self, interaction: discord.Interaction):
         try:
-            if not predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
+            if not await predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
                 await interaction.response.defer(ephemeral=True)
                 new_view = BoldPredictionView(
                     self.guild_id, self.user_id, self.race_number,
@@ -1027,9 +1108,9 @@ async def predict(interaction: discord.Interaction):
         guild_id = interaction.guild.id
         user_id = interaction.user.id
         is_sprint = RACE_CACHE.get("is_sprint", False)
-        closed = not predictions_open(guild_id, get_now(), RACE_CACHE)
+        closed = not await predictions_open(guild_id, get_now(), RACE_CACHE)
 
-        existing, _ = await asyncio.to_thread(fetch_existing_predictions, guild_id, user_id, race_number)
+        existing, _ = await fetch_existing_predictions(guild_id, user_id, race_number)
         preds = [existing['pos1'], existing['pos2'], existing['pos3']] if existing else [None, None, None]
 
         view = PodiumPredictionView(guild_id, user_id, race_number, race_name, preds, closed=closed, is_sprint=is_sprint)
@@ -1060,7 +1141,7 @@ async def view_predictions(interaction: discord.Interaction, user: discord.Membe
             if race == race_name:
                 req_race = race_num
             else:
-                race_row = await asyncio.to_thread(get_race_number, race)
+                race_row = await get_race_number(race)
                 if not race_row:
                     await interaction.followup.send(
                         f"❌ No data found for **{race}** yet — predictions may not be stored.",
@@ -1073,23 +1154,23 @@ async def view_predictions(interaction: discord.Interaction, user: discord.Membe
             req_race = race_num
             display_race = race_name
 
-        sprint_row = await asyncio.to_thread(get_is_sprint, req_race)
+        sprint_row = await get_is_sprint(req_race)
         is_sprint = sprint_row['is_sprint'] if sprint_row else RACE_CACHE.get("is_sprint", False)
 
         if target != interaction.user and req_race == race_num:
-            if predictions_open(guild_id, get_now(), RACE_CACHE):
+            if await predictions_open(guild_id, get_now(), RACE_CACHE):
                 await interaction.followup.send(
                     "❌ You can only view another user's predictions when predictions are locked!",
                     ephemeral=True
                 )
                 return
             
-        existing, bold_existing = await asyncio.to_thread(
-            fetch_existing_predictions, guild_id, target.id, req_race
+        existing, bold_existing = await fetch_existing_predictions(
+            guild_id, target.id, req_race
         )
 
-        sprint_existing = await asyncio.to_thread(
-            fetch_sprint_preds, guild_id, target.id, req_race
+        sprint_existing = await fetch_sprint_preds(
+            guild_id, target.id, req_race
         ) if is_sprint else None
 
         if not existing and not bold_existing and not sprint_existing:
@@ -1140,7 +1221,7 @@ class SprintWinnerSelect(discord.ui.Select):
     def __init__(self, current=None):
         super().__init__(
             placeholder="Sprint Winner" if not current else current,
-            options=[discord.SelectOption(label=d, value=d, default=(d == current)) for d in DRIVERS],
+            options=catalog.driver_options(current),
             row=0
         )
 
@@ -1161,7 +1242,7 @@ class SprintPoleSelect(discord.ui.Select):
     def __init__(self, current=None):
         super().__init__(
             placeholder="Sprint Pole" if not current else current,
-            options=[discord.SelectOption(label=d, value=d, default=(d == current)) for d in DRIVERS],
+            options=catalog.driver_options(current),
             row=1
         )
 
@@ -1186,7 +1267,7 @@ class SprintSubmitButton(discord.ui.Button):
         try:
             await interaction.response.defer(ephemeral=True)
 
-            if not sprint_predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
+            if not await sprint_predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
                 await interaction.followup.send("⛔ Sprint predictions are closed.", ephemeral=True)
                 return
 
@@ -1194,7 +1275,7 @@ class SprintSubmitButton(discord.ui.Button):
                 await interaction.followup.send("❌ Please select both predictions first.", ephemeral=True)
                 return
 
-            save_sprint_predictions(
+            await save_sprint_predictions(
                 interaction.guild.id,
                 interaction.user.id,
                 interaction.user.name,
@@ -1237,9 +1318,9 @@ async def sprint_predict(interaction: discord.Interaction):
         race_number = int(RACE_CACHE.get("race_number"))
         guild_id = interaction.guild.id
         user_id = interaction.user.id
-        closed = not sprint_predictions_open(guild_id, get_now(), RACE_CACHE)
+        closed = not await sprint_predictions_open(guild_id, get_now(), RACE_CACHE)
 
-        existing = fetch_sprint_preds(guild_id, user_id, race_number)
+        existing = await fetch_sprint_preds(guild_id, user_id, race_number)
 
         sprint_winner = existing['sprint_winner'] if existing else None
         sprint_pole = existing['sprint_pole'] if existing else None
@@ -1280,7 +1361,7 @@ async def force_points(
         await interaction.followup.send(f"Awarded {user.mention} {points} points", 
                                         ephemeral=True)
         
-        add_points(interaction.guild.id, user.id, str(user), points, reason)
+        await add_points(interaction.guild.id, user.id, str(user), points, reason)
         
         if points < 0:
             script = f"**{-(points)} points deducted from {user.mention}**"
@@ -1333,10 +1414,10 @@ async def pred_lock(
     try:
         await interaction.response.defer(ephemeral=True)
         if state.value == "AUTO":
-            set_manual_lock(interaction.guild.id, pred_type.value,  None)
+            await set_manual_lock(interaction.guild.id, pred_type.value,  None)
             msg = f"⚙️ **{pred_type.name} predictions set to AUTO mode.**"
         else:
-            set_manual_lock(interaction.guild.id, pred_type.value, state.value)
+            await set_manual_lock(interaction.guild.id, pred_type.value, state.value)
             emoji = "🔒" if state.value == "LOCKED" else "🔓"
             msg = f"{emoji} **{pred_type.name} predictions manually {state.name.upper()}.**"
 
@@ -1344,7 +1425,7 @@ async def pred_lock(
         await interaction.channel.send(msg)
         await interaction.followup.send("Done.", ephemeral=True)
 
-        prediction_state_log(
+        await prediction_state_log(
             interaction.guild.id,
             str(interaction.user.id),
             str(interaction.user),
@@ -1372,7 +1453,7 @@ class WDCSelect(discord.ui.Select):
         self.view2 = view2
         super().__init__(
             placeholder="Select WDC Champion",
-            options=[discord.SelectOption(label=d) for d in DRIVERS],
+            options=catalog.driver_options(),
             min_values=1,
             max_values=1
         )
@@ -1386,7 +1467,7 @@ class WCCSelect(discord.ui.Select):
         self.view2 = view2
         super().__init__(
             placeholder="Select WCC Champion",
-            options=[discord.SelectOption(label=c) for c in CONSTRUCTORS],
+            options=catalog.constructor_options(),
             min_values=1,
             max_values=1
         )
@@ -1405,7 +1486,7 @@ class SeasonSubmitButton(discord.ui.Button):
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
         try:
-            if not is_season_open(interaction.guild.id):
+            if not await is_season_open(interaction.guild.id):
                 await interaction.followup.send(
                     "Season predictions are locked.",
                     ephemeral=True
@@ -1419,7 +1500,7 @@ class SeasonSubmitButton(discord.ui.Button):
                 )
                 return
 
-            save_season_prediction(
+            await save_season_prediction(
                 interaction.guild.id,
                 interaction.user.id,
                 interaction.user.name,
@@ -1454,11 +1535,11 @@ async def season(interaction: discord.Interaction):
 async def season_lock(interaction: discord.Interaction):
     try:
         await interaction.response.defer(ephemeral=True)
-        set_season_state(interaction.guild.id, False)
+        await set_season_state(interaction.guild.id, False)
         await interaction.channel.send("🔒 **Season predictions are now LOCKED.**")
         await interaction.followup.send("Done.", ephemeral=True)
 
-        prediction_state_log(
+        await prediction_state_log(
             interaction.guild.id,
             str(interaction.user.id),
             str(interaction.user),
@@ -1475,11 +1556,11 @@ async def season_lock(interaction: discord.Interaction):
 async def season_unlock(interaction: discord.Interaction):
     try:
         await interaction.response.defer(ephemeral=True)
-        set_season_state(interaction.guild.id, True)
+        await set_season_state(interaction.guild.id, True)
         await interaction.channel.send("🔓 **Season predictions are now OPEN.**")
         await interaction.followup.send("Done.", ephemeral=True)
 
-        prediction_state_log(
+        await prediction_state_log(
             interaction.guild.id,
             str(interaction.user.id),
             str(interaction.user),
@@ -1492,58 +1573,123 @@ async def season_unlock(interaction: discord.Interaction):
         logger.exception("Season lock error")
 
 class LeaderboardView(discord.ui.View):
-    def __init__(self, guild_id, user_name, current_page=0, items_per_page=10):
+    """Leaderboard pages of one guild.
+
+    Guilds small enough for a cached snapshot page through it without
+    re-querying. Larger guilds fetch one keyset page at a time: ``cursors``
+    holds the key each visited page starts after, and the caller's own rank
+    is looked up once when the view is opened.
+    """
+
+    def __init__(self, guild_id, user_id, user_name, snapshot=None, total=0, rows=None,
+                 cursors=None, own_rank=None, current_page=0, items_per_page=10):
         super().__init__(timeout=300)
         self.guild_id = guild_id
+        self.user_id = user_id
         self.user_name = user_name
         self.current_page = current_page
         self.items_per_page = items_per_page
 
-        all_users = get_full_leaderboard(guild_id)
-        self.rows = all_users
-        self.total_pages = max(1, (len(all_users) + items_per_page - 1) // items_per_page)
+        # Page flips reuse this snapshot instead of re-querying the leaderboard
+        self.snapshot = snapshot
+        if snapshot is not None:
+            total = len(snapshot)
+            rows = snapshot.page(current_page, items_per_page)
+        self.rows = rows or []
+        self.cursors = cursors or [None]
+        self.own_rank = own_rank
+        self.total = total = total or 0
+        self.total_pages = max(1, (total + items_per_page - 1) // items_per_page)
+        # A short keyset page is the last one, even if rows were removed since ``total`` was counted
+        self.has_next = current_page < self.total_pages - 1 and (
+            snapshot is not None or len(self.rows) == items_per_page
+        )
 
         prev = discord.ui.Button(emoji="◀️", style=discord.ButtonStyle.grey, disabled=current_page == 0, row=0)
         prev.callback = self.prev_callback
         self.add_item(prev)
 
-        next_ = discord.ui.Button(emoji="▶️", style=discord.ButtonStyle.grey, disabled=current_page == self.total_pages - 1, row=0)
+        next_ = discord.ui.Button(emoji="▶️", style=discord.ButtonStyle.grey, disabled=not self.has_next, row=0)
         next_.callback = self.next_callback
         self.add_item(next_)
 
+    @classmethod
+    async def create(cls, guild_id, user_id, user_name, items_per_page=10):
+        snapshot = await get_leaderboard_snapshot(guild_id)
+        if snapshot is not None:
+            return cls(guild_id, user_id, user_name, snapshot=snapshot, items_per_page=items_per_page)
+
+        total, rows, own_rank = await asyncio.gather(
+            get_leaderboard_size(guild_id),
+            get_leaderboard_page(guild_id, items_per_page),
+            get_user_rank(guild_id, user_id),
+        )
+        return cls(guild_id, user_id, user_name, total=total, rows=rows,
+                   own_rank=own_rank, items_per_page=items_per_page)
+
+    def _own_position(self):
+        """(position, total_points) of the caller, None if they have no points."""
+        if self.snapshot is not None:
+            position = self.snapshot.position(self.user_id)
+            if position is None:
+                return None
+            return position, self.snapshot.row_for(self.user_id)['total_points']
+        if self.own_rank is None:
+            return None
+        return self.own_rank['rank'], self.own_rank['total_points']
+
     def get_content(self):
         start = self.current_page * self.items_per_page
-        chunk = self.rows[start:start + self.items_per_page]
 
         lines = [f"**🏆 Leaderboard — Page {self.current_page + 1}/{self.total_pages}**\n"]
-        for i, row in enumerate(chunk):
+        if not self.rows:
+            lines.append("❌ No leaderboard data yet!")
+        for i, row in enumerate(self.rows):
             pos = start + i + 1
-            marker = " ◄" if row['username'] == self.user_name else ""
+            marker = " ◄" if row['user_id'] == self.user_id else ""
             lines.append(f"{pos}. {row['username']} — {row['total_points']} pts{marker}")
 
         # Always show user's position at the bottom
-        user_pos = next((i + 1 for i, r in enumerate(self.rows) if r['username'] == self.user_name), None)
-        user_row = next((r for r in self.rows if r['username'] == self.user_name), None)
-        if user_row:
-            on_page = any(r['username'] == self.user_name for r in chunk)
+        own = self._own_position()
+        if own is not None:
+            user_pos, user_points = own
+            on_page = any(row['user_id'] == self.user_id for row in self.rows)
             if not on_page:
-                lines.append(f"\n**Your position: {user_pos}. {self.user_name} — {user_row['total_points']} pts**")
+                lines.append(f"\n**Your position: {user_pos}. {self.user_name} — {user_points} pts**")
         else:
             lines.append("\n_You have no points yet._")
 
         return "\n".join(lines)
 
+    async def _show_page(self, interaction, page):
+        if page < 0 or (page > self.current_page and not self.has_next):
+            # Stale button: there is no page before the first or after the last
+            await interaction.response.defer()
+            return
+
+        cursors = self.cursors
+        if self.snapshot is not None:
+            new_view = LeaderboardView(self.guild_id, self.user_id, self.user_name, snapshot=self.snapshot,
+                                       current_page=page, items_per_page=self.items_per_page)
+        else:
+            if page == len(cursors):
+                # has_next guarantees a full current page to continue after
+                cursors = cursors + [leaderboard_key(self.rows[-1])]
+            rows = await get_leaderboard_page(self.guild_id, self.items_per_page, cursors[page]) or []
+            new_view = LeaderboardView(self.guild_id, self.user_id, self.user_name, total=self.total,
+                                       rows=rows, cursors=cursors, own_rank=self.own_rank,
+                                       current_page=page, items_per_page=self.items_per_page)
+        await interaction.response.edit_message(content=new_view.get_content(), view=new_view)
+
     async def prev_callback(self, interaction: discord.Interaction):
         try:
-            new_view = LeaderboardView(self.guild_id, self.user_name, self.current_page - 1, self.items_per_page)
-            await interaction.response.edit_message(content=new_view.get_content(), view=new_view)
+            await self._show_page(interaction, self.current_page - 1)
         except Exception:
             logger.exception("LeaderboardView prev_callback error")
 
     async def next_callback(self, interaction: discord.Interaction):
         try:
-            new_view = LeaderboardView(self.guild_id, self.user_name, self.current_page + 1, self.items_per_page)
-            await interaction.response.edit_message(content=new_view.get_content(), view=new_view)
+            await self._show_page(interaction, self.current_page + 1)
         except Exception:
             logger.exception("LeaderboardView next_callback error")
 
@@ -1551,7 +1697,7 @@ class LeaderboardView(discord.ui.View):
 async def leaderboard(interaction: discord.Interaction):
     try:
         await interaction.response.defer(ephemeral=True)
-        view = LeaderboardView(interaction.guild.id, interaction.user.name)
+        view = await LeaderboardView.create(interaction.guild.id, interaction.user.id, interaction.user.name)
         await interaction.followup.send(content=view.get_content(), view=view, ephemeral=True)
     except Exception:
         logger.exception("Leaderboard error")
@@ -1563,7 +1709,7 @@ async def show_leaderboard(interaction: discord.Interaction, message: str = None
     try:
         await interaction.response.defer(ephemeral=False)
             
-        top10 = get_top_n(interaction.guild.id, 10)
+        top10 = await get_top_n(interaction.guild.id, 10)
 
         if not top10:
             await interaction.followup.send("❌ No leaderboard data yet!")
@@ -1680,7 +1826,7 @@ async def crazy_predict(interaction: discord.Interaction, prediction: str):
 
         user = interaction.user
 
-        current_count = count_crazy_predictions(interaction.guild.id, user.id, season)
+        current_count = await count_crazy_predictions(interaction.guild.id, user.id, season)
 
         if current_count >= MAX_PREDICTIONS:
             await interaction.followup.send(
@@ -1688,7 +1834,7 @@ async def crazy_predict(interaction: discord.Interaction, prediction: str):
             )
             return
 
-        save_crazy_prediction(
+        await save_crazy_prediction(
             interaction.guild.id,
             user_id=user.id,
             username=str(user),
@@ -1836,7 +1982,7 @@ class CrazyPredsPaginationView(discord.ui.View):
 
             points = CRAZY_PRED_POINTS[self.selected_difficulty]
 
-            save_scored_crazy_prediction(
+            await save_scored_crazy_prediction(
                 self.guild_id,
                 self.selected_pred_id,
                 pred_row['user_id'],
@@ -1845,9 +1991,7 @@ class CrazyPredsPaginationView(discord.ui.View):
                 points
             )
 
-            update_leaderboard(self.guild_id)
-
-            rows = get_all_crazy_predictions(self.guild_id, self.season)
+            rows = await get_all_crazy_predictions(self.guild_id, self.season)
             pages, page_data = build_crazy_pred_pages(rows)
 
             new_view = CrazyPredsPaginationView(
@@ -1856,7 +2000,7 @@ class CrazyPredsPaginationView(discord.ui.View):
             )
             await interaction.response.edit_message(embed=new_view.get_embed(), view=new_view)
 
-            channel_id = get_prediction_channel(self.guild_id)
+            channel_id = await get_prediction_channel(self.guild_id)
             if channel_id:
                 channel = interaction.guild.get_channel(channel_id) or await bot.fetch_channel(channel_id)
                 if channel:
@@ -1880,10 +2024,9 @@ class CrazyPredsPaginationView(discord.ui.View):
                 await interaction.response.send_message("❌ No prediction selected.", ephemeral=True)
                 return
 
-            remove_scored_crazy_prediction(self.guild_id, self.selected_pred_id)
-            update_leaderboard(self.guild_id)
+            await remove_scored_crazy_prediction(self.guild_id, self.selected_pred_id)
 
-            rows = get_all_crazy_predictions(self.guild_id, self.season)
+            rows = await get_all_crazy_predictions(self.guild_id, self.season)
             pages, page_data = build_crazy_pred_pages(rows)
 
             new_view = CrazyPredsPaginationView(
@@ -1945,7 +2088,7 @@ async def view_all_crazy_predictions(interaction: discord.Interaction, season: i
         if season is None:
             season = SEASON
 
-        rows = get_all_crazy_predictions(interaction.guild.id, season)
+        rows = await get_all_crazy_predictions(interaction.guild.id, season)
 
         if not rows:
             await interaction.followup.send(f"❌ No crazy predictions found for **{season}**.", ephemeral=True)
@@ -2114,16 +2257,14 @@ class MassCrazyScoreView(discord.ui.View):
                 pred_row = next((r for r in self.rows if r['id'] == pred_id), None)
                 if not pred_row:
                     continue
-                save_scored_crazy_prediction(
+                await save_scored_crazy_prediction(
                     self.guild_id, pred_id,
                     pred_row['user_id'], pred_row['username'],
                     self.selected_difficulty, points
                 )
                 scored_users.append(f"**{pred_row['username']}**: {pred_row['prediction']}")
 
-            update_leaderboard(self.guild_id)
-
-            channel_id = get_prediction_channel(self.guild_id)
+            channel_id = await get_prediction_channel(self.guild_id)
             if channel_id:
                 try:
                     channel = interaction.guild.get_channel(channel_id) or await bot.fetch_channel(channel_id)
@@ -2156,11 +2297,9 @@ class MassCrazyScoreView(discord.ui.View):
                 return
 
             for pred_id in self.selected_pred_ids:
-                remove_scored_crazy_prediction(self.guild_id, pred_id)
-
-            update_leaderboard(self.guild_id)
+                await remove_scored_crazy_prediction(self.guild_id, pred_id)
 
-            rows = get_all_crazy_predictions(self.guild_id, self.season)
+            rows = await get_all_crazy_predictions(self.guild_id, self.season)
             new_view = MassCrazyScoreView(self.guild_id, rows, self.season, self.current_page, [], None)
             await interaction.edit_original_response(content=new_view.get_content(), view=new_view)
             await interaction.followup.send(
@@ -2182,7 +2321,7 @@ async def mass_score_crazy_predictions(interaction: discord.Interaction, season:
         if season is None:
             season = SEASON
 
-        rows = get_all_crazy_predictions(interaction.guild.id, season)
+        rows = await get_all_crazy_predictions(interaction.guild.id, season)
         if not rows:
             await interaction.followup.send(f"❌ No crazy predictions found for **{season}**.", ephemeral=True)
             return
@@ -2318,21 +2457,20 @@ class UserCrazyPredsView(discord.ui.View):
                 return
 
             points = CRAZY_PRED_POINTS[self.selected_difficulty]
-            save_scored_crazy_prediction(
+            await save_scored_crazy_prediction(
                 self.guild_id, self.selected_pred_id,
                 pred_row['user_id'], pred_row['username'],
                 self.selected_difficulty, points
             )
-            update_leaderboard(self.guild_id)
 
-            rows = get_all_crazy_predictions_for_user(self.guild_id, self.target_user.id, self.season)
+            rows = await get_all_crazy_predictions_for_user(self.guild_id, self.target_user.id, self.season)
             new_view = UserCrazyPredsView(
                 self.guild_id, rows, self.target_user, self.season,
                 self.is_mod, None, None
             )
             await interaction.edit_original_response(embed=new_view.get_embed(), view=new_view)
 
-            channel_id = get_prediction_channel(self.guild_id)
+            channel_id = await get_prediction_channel(self.guild_id)
             if channel_id:
                 try:
                     channel = interaction.guild.get_channel(channel_id) or await bot.fetch_channel(channel_id)
@@ -2359,10 +2497,9 @@ class UserCrazyPredsView(discord.ui.View):
                 await interaction.followup.send("❌ You don't have permission.", ephemeral=True)
                 return
 
-            remove_scored_crazy_prediction(self.guild_id, self.selected_pred_id)
-            update_leaderboard(self.guild_id)
+            await remove_scored_crazy_prediction(self.guild_id, self.selected_pred_id)
 
-            rows = get_all_crazy_predictions_for_user(self.guild_id, self.target_user.id, self.season)
+            rows = await get_all_crazy_predictions_for_user(self.guild_id, self.target_user.id, self.season)
             new_view = UserCrazyPredsView(
                 self.guild_id, rows, self.target_user, self.season,
                 self.is_mod, None, None
@@ -2384,7 +2521,7 @@ async def score_crazy_predictions(interaction: discord.Interaction, user: discor
         if season is None:
             season = SEASON
 
-        rows = get_all_crazy_predictions_for_user(interaction.guild.id, user.id, season)
+        rows = await get_all_crazy_predictions_for_user(interaction.guild.id, user.id, season)
         if not rows:
             await interaction.followup.send(
                 f"❌ **{user.display_name}** has no crazy predictions for **{season}**.",
@@ -2447,7 +2584,7 @@ async def crazy_predictions(interaction: discord.Interaction, user: discord.Memb
         if season is None:
             season = SEASON
 
-        rows = get_all_crazy_predictions_for_user(interaction.guild.id, user.id, season)
+        rows = await get_all_crazy_predictions_for_user(interaction.guild.id, user.id, season)
 
         if not rows:
             await interaction.followup.send(
@@ -2475,7 +2612,7 @@ async def bold_predict(interaction: discord.Interaction, prediction: str):
     try:
         await interaction.response.defer(ephemeral=True)  # defer immediately
 
-        if not predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
+        if not await predictions_open(interaction.guild.id, get_now(), RACE_CACHE):
             await interaction.followup.send(
                 "❌ Bold predictions are locked for this race.",
                 ephemeral=True
@@ -2485,7 +2622,7 @@ async def bold_predict(interaction: discord.Interaction, prediction: str):
         user = interaction.user
         timestamp = get_now().isoformat()
 
-        save_bold_prediction(
+        await save_bold_prediction(
             interaction.guild.id,
             user_id=user.id,
             race_number=int(RACE_CACHE.get("race_number")),
@@ -2500,7 +2637,7 @@ async def bold_predict(interaction: discord.Interaction, prediction: str):
                     ephemeral=True
                 )
         
-        channel_id = get_prediction_channel(interaction.guild.id)
+        channel_id = await get_prediction_channel(interaction.guild.id)
         if channel_id:
             try:
                 guild = interaction.guild
@@ -2532,8 +2669,14 @@ async def update_leaderboard_cmd(interaction: discord.Interaction):
     await interaction.response.defer(thinking=True)
 
     try:
-        update_leaderboard(interaction.guild.id)
-        await interaction.followup.send("✅ Leaderboard updated.")
+        # Scoring keeps the leaderboard up to date incrementally, this only repairs drift
+        drifted = await verify_leaderboard(interaction.guild.id)
+        await update_leaderboard(interaction.guild.id)
+        if drifted:
+            logger.warning("Leaderboard of guild %s had %s drifted rows, rebuilt", interaction.guild.id, len(drifted))
+            await interaction.followup.send(f"✅ Leaderboard rebuilt ({len(drifted)} user(s) were out of date).")
+        else:
+            await interaction.followup.send("✅ Leaderboard updated.")
     except Exception:
         logger.exception("update_leaderboard error")
 
@@ -2543,8 +2686,8 @@ async def toggle_bold_predictions(interaction: discord.Interaction):
     try:
         await interaction.response.defer(ephemeral=True)
         guild_id = interaction.guild.id
-        currently_opted_out = is_bold_pred_opted_out(guild_id)
-        set_bold_pred_optout(guild_id, not currently_opted_out)
+        currently_opted_out = await is_bold_pred_opted_out(guild_id)
+        await set_bold_pred_optout(guild_id, not currently_opted_out)
 
         if currently_opted_out:
             await interaction.followup.send("✅ Bold prediction messages are now **enabled** for this server.", ephemeral=True)
@@ -2564,8 +2707,18 @@ async def toggle_bold_predictions_error(interaction: discord.Interaction, error)
             ephemeral=True
         )
 
-@tasks.loop(minutes=max(1, 60/TIME_MULTIPLE))
-async def bold_predictions_publisher():
+@scheduler.on("bold_publish")
+async def on_bold_publish(event):
+    await publish_bold_predictions()
+
+    # Keep the pinned list current until predictions lock; quali_lock publishes the last version
+    lock_time = RACE_CACHE.get("lock_time")
+    next_publish = get_now() + BOLD_REPUBLISH_EVERY
+    if lock_time and next_publish < lock_time:
+        scheduler.schedule("bold_publish", next_publish)
+
+async def publish_bold_predictions(locked=False):
+    """Publishes the bold predictions of every guild; ``locked`` for the final version at the lock."""
     try:
         race_number = RACE_CACHE.get("race_number")
         race_name = RACE_CACHE.get("race_name")
@@ -2576,107 +2729,123 @@ async def bold_predictions_publisher():
         if not race_number or not lock_time:
             return
 
-        publish_time = lock_time - timedelta(days=4)
-        if now < publish_time or now > lock_time:
+        publish_time = lock_time - BOLD_PUBLISH_WINDOW
+        if now < publish_time or (now > lock_time and not locked):
             return
 
+        jobs = []
         for guild in bot.guilds:
             try:
-                guild_id = guild.id
-
-                # Check opt out
-                if is_bold_pred_opted_out(guild_id):
+                if await is_bold_pred_opted_out(guild.id):
                     continue
+                jobs.append(AnnouncementJob(
+                    guild.id,
+                    functools.partial(publish_bold_predictions_for_guild, guild, race_number, race_name,
+                                      lock_time, locked)
+                ))
+            except Exception:
+                logger.exception("publish_bold_predictions error in guild %s", guild.id)
 
-                preds = fetch_bold_predictions(guild_id, race_number=race_number)
-                lines = [
-                    f"**Bold Predictions — {race_name}**",
-                    "",
-                    f"Lock in your predictions before Qualifying! \nSubmissions lock <t:{int(lock_time.timestamp())}:R>",
-                    "",
-                    "*This message can be turned off by moderators using /toggle_bold_predictions.*",
-                    ""
-                ]
-                if preds:
-                    for username, prediction in preds:
-                        lines.append(f"• **{username}** — {prediction}")
-                else:
-                    lines.append(f"No predictions for the {race_name} yet.")
+        await dispatch(jobs, f"Bold predictions {race_name}")
 
-                content = "\n".join(lines)
+    except Exception:
+        logger.exception("publish_bold_predictions error")
 
-                channel_id = get_prediction_channel(guild_id)
-                if not channel_id:
-                    try:
-                        first_channel = next(
-                            ch for ch in guild.text_channels
-                            if ch.permissions_for(guild.me).send_messages
-                        )
-                        existing_warning = get_persistent_message(guild_id, "no_channel_warning")
-                        if not existing_warning:
-                            msg = await first_channel.send(
-                                "⚠️ No prediction channel set! Admins, use /set_channel to configure it."
-                            )
-                            await msg.pin()
-                            save_persistent_message(guild_id, "no_channel_warning", first_channel.id, msg.id)
-                    except StopIteration:
-                        logger.warning("No accessible text channels in guild %s", guild.name)
-                    continue
+async def publish_bold_predictions_for_guild(guild, race_number, race_name, lock_time, locked=False):
+    """Posts or edits the pinned bold predictions message of one guild."""
+    guild_id = guild.id
+    preds = await fetch_bold_predictions(guild_id, race_number=race_number)
+    if locked:
+        status = f"Submissions locked <t:{int(lock_time.timestamp())}:R>. Good luck!"
+    else:
+        status = f"Lock in your predictions before Qualifying! \nSubmissions lock <t:{int(lock_time.timestamp())}:R>"
+    lines = [
+        f"**Bold Predictions — {race_name}**",
+        "",
+        status,
+        "",
+        "*This message can be turned off by moderators using /toggle_bold_predictions.*",
+        ""
+    ]
+    if preds:
+        for username, prediction in preds:
+            lines.append(f"• **{username}** — {prediction}")
+    else:
+        lines.append(f"No predictions for the {race_name} yet.")
+
+    content = "\n".join(lines)
+
+    channel_id = await get_prediction_channel(guild_id)
+    if not channel_id:
+        try:
+            first_channel = next(
+                ch for ch in guild.text_channels
+                if ch.permissions_for(guild.me).send_messages
+            )
+            existing_warning = await get_persistent_message(guild_id, "no_channel_warning")
+            if not existing_warning:
+                msg = await first_channel.send(
+                    "⚠️ No prediction channel set! Admins, use /set_channel to configure it."
+                )
+                await save_persistent_message(guild_id, "no_channel_warning", first_channel.id, msg.id)
+                await msg.pin()
+        except StopIteration:
+            logger.warning("No accessible text channels in guild %s", guild.name)
+        return
                 
-                try:
-                    channel = guild.get_channel(channel_id) or await bot.fetch_channel(channel_id)
-                except discord.NotFound:
-                    logger.exception("Channel %s not found in guild %s", channel_id, guild.name)
-                    continue
+    try:
+        channel = guild.get_channel(channel_id) or await bot.fetch_channel(channel_id)
+    except discord.NotFound:
+        logger.exception("Channel %s not found in guild %s", channel_id, guild.name)
+        return
 
-                perms = channel.permissions_for(guild.me)
-                logger.debug("Bot permissions in %s: manage_messages=%s, read_messages=%s, send_messages=%s", 
-                    channel.name, perms.manage_messages, perms.read_messages, perms.send_messages)
-
-                current_key = f"bold_predictions_{race_number}"
-                existing = get_persistent_message(guild_id, current_key)
-
-                if existing:
-                    # Edit existing message for this race
-                    try:
-                        msg = await channel.fetch_message(existing["message_id"])
-                        await msg.edit(content=content)
-                        logger.info("Edited bold pred message in %s", guild.name)
-                    except discord.NotFound:
-                       msg = await channel.send(content)
-                    try:
-                        await msg.pin()
-                    except discord.Forbidden:
-                        logger.warning("No permission to pin in %s", guild.name)
-                    save_persistent_message(guild_id, current_key, channel.id, msg.id)
-                else:
-                    # Delete previous race's message
-                    if race_number > 1:
-                        prev_key = f"bold_predictions_{race_number - 1}"
-                        prev = get_persistent_message(guild_id, prev_key)
-                        if prev:
-                            try:
-                                prev_msg = await channel.fetch_message(prev["message_id"])
-                                await prev_msg.unpin()
-                                await prev_msg.delete()
-                                logger.info("Deleted previous bold pred message in %s", guild.name)
-                            except discord.NotFound:
-                                pass
-                            except discord.Forbidden:
-                                logger.warning("No permission to delete previous bold pred message in %s", guild.name)
-
-                    msg = await channel.send(content)
-                    try:
-                        await msg.pin()
-                    except discord.Forbidden:
-                        logger.warning("No permission to pin in %s", guild.name)
-                    save_persistent_message(guild_id, current_key, channel.id, msg.id)
-                    logger.info("Sent new bold pred message in %s", guild.name)
-            except Exception:
-                logger.exception("bold_predictions_publisher error in guild %s", guild_id)
+    perms = channel.permissions_for(guild.me)
+    logger.debug("Bot permissions in %s: manage_messages=%s, read_messages=%s, send_messages=%s", 
+        channel.name, perms.manage_messages, perms.read_messages, perms.send_messages)
 
-    except Exception:
-        logger.exception("bold_predictions_publisher error")
+    current_key = f"bold_predictions_{race_number}"
+    existing = await get_persistent_message(guild_id, current_key)
+
+    if existing:
+        # Edit existing message for this race
+        try:
+            msg = await channel.fetch_message(existing["message_id"])
+            await msg.edit(content=content)
+            logger.info("Edited bold pred message in %s", guild.name)
+        except discord.NotFound:
+            msg = await channel.send(content)
+            await save_persistent_message(guild_id, current_key, channel.id, msg.id)
+        try:
+            await msg.pin()
+        except discord.Forbidden:
+            logger.warning("No permission to pin in %s", guild.name)
+    else:
+        # Saved before pinning: announcer.dispatch retries this whole function on a
+        # 5xx, and the retry must find and edit this message instead of posting again
+        msg = await channel.send(content)
+        await save_persistent_message(guild_id, current_key, channel.id, msg.id)
+        try:
+            await msg.pin()
+        except discord.Forbidden:
+            logger.warning("No permission to pin in %s", guild.name)
+        logger.info("Sent new bold pred message in %s", guild.name)
+
+    # The previous race's message goes only once this one is saved, so a retry
+    # after any failure finds the same state; its record is dropped once it is gone
+    if race_number > 1:
+        prev_key = f"bold_predictions_{race_number - 1}"
+        prev = await get_persistent_message(guild_id, prev_key)
+        if prev:
+            try:
+                prev_channel = guild.get_channel(prev["channel_id"]) or channel
+                prev_msg = await prev_channel.fetch_message(prev["message_id"])
+                await prev_msg.delete()
+                logger.info("Deleted previous bold pred message in %s", guild.name)
+            except discord.NotFound:
+                pass
+            except discord.Forbidden:
+                logger.warning("No permission to delete previous bold pred message in %s", guild.name)
+            await delete_persistent_message(guild_id, prev_key)
 
 def format_bold_predictions(race_name, rows):
     try:
@@ -2700,7 +2869,7 @@ async def view_race_bold_preds(interaction: discord.Interaction, race: str):
     
     try:
         # use the unified function with race_name
-        rows = fetch_bold_predictions(interaction.guild.id, race_name=race)
+        rows = await fetch_bold_predictions(interaction.guild.id, race_name=race)
 
         if not rows:
             await interaction.followup.send(f"❌ No bold predictions found for **{race}**", ephemeral=True)
@@ -2819,12 +2988,10 @@ class CorrectBoldPredScore(discord.ui.Button):
             points = BOLD_PRED_POINTS[difficulty]
 
             for user in self.view2.selected_users:
-                save_correct_bold_prediction(guild_id, user.id, str(user), race_name, difficulty, points)
-
-            update_leaderboard(guild_id)
+                await save_correct_bold_prediction(guild_id, user.id, str(user), race_name, difficulty, points)
 
             user_mentions = ", ".join(u.mention for u in self.view2.selected_users)
-            channel_id = get_prediction_channel(guild_id)
+            channel_id = await get_prediction_channel(guild_id)
             if channel_id:
                 try:
                     channel = interaction.guild.get_channel(channel_id) or await bot.fetch_channel(channel_id)
@@ -2860,9 +3027,7 @@ class CorrectBoldPredRemoveSubmit(discord.ui.Button):
             race_name = self.view2.selected_race
 
             for user in self.view2.selected_users:
-                remove_correct_bold_prediction(guild_id, user.id, race_name)
-
-            update_leaderboard(guild_id)
+                await remove_correct_bold_prediction(guild_id, user.id, race_name)
 
             await interaction.followup.send(
                 f"✅ Removed bold pred scores for {len(self.view2.selected_users)} user(s) for **{race_name}**!",
@@ -2900,7 +3065,7 @@ async def view_correct_bold_predictions(interaction: discord.Interaction, user:
     try:
         await interaction.response.defer(ephemeral=True)
 
-        rows = get_correct_bold_predictions(interaction.guild.id, user.id)
+        rows = await get_correct_bold_predictions(interaction.guild.id, user.id)
         count = len(rows)
 
         if not rows:
@@ -2978,8 +3143,8 @@ async def view_race_bold_predictions(interaction: discord.Interaction, race: str
     try:
         await interaction.response.defer(ephemeral=True)
 
-        rows = await asyncio.to_thread(
-            get_correct_bold_predictions_of_server, interaction.guild.id, race
+        rows = await get_correct_bold_predictions_of_server(
+            interaction.guild.id, race
         )
 
         if not rows:
@@ -3015,10 +3180,10 @@ async def set_channel(interaction: discord.Interaction, channel: discord.TextCha
             await interaction.followup.send("You can only set a channel from this server.")
             return
 
-        old_channel_id = get_prediction_channel(interaction.guild.id)
+        old_channel_id = await get_prediction_channel(interaction.guild.id)
         old_channel = interaction.guild.get_channel(old_channel_id) if old_channel_id else None
 
-        set_prediction_channel(interaction.guild.id, channel.id)
+        await set_prediction_channel(interaction.guild.id, channel.id)
 
         if old_channel:
             await interaction.followup.send(
@@ -3055,7 +3220,7 @@ async def force_score_race(interaction: discord.Interaction, race: str):
     await interaction.response.defer(ephemeral=True)
     try:
         # Get race number from race name
-        result = safe_fetch_one(
+        result = await safe_fetch_one(
             "SELECT race_number FROM race_results WHERE race_name = %s",
             (race,)
         )
@@ -3066,9 +3231,8 @@ async def force_score_race(interaction: discord.Interaction, race: str):
         race_num = result['race_number']
         guild_id = interaction.guild.id
 
-        score_race_for_guild(race_num, guild_id)
-        update_leaderboard(guild_id)
-        mark_race_scored(guild_id, race_num)
+        await run_blocking(score_race_for_guild, race_num, guild_id)
+        await mark_race_scored(guild_id, race_num)
 
         await interaction.followup.send(f"✅ **The {race}** has been scored!", ephemeral=True)
 
@@ -3102,14 +3266,14 @@ async def force_score_season(interaction: discord.Interaction):
     try:
         guild_id = interaction.guild.id
 
-        result = safe_fetch_one("SELECT wdc, wcc FROM final_champions WHERE season = %s", (SEASON,))
+        result = await safe_fetch_one("SELECT wdc, wcc FROM final_champions WHERE season = %s", (SEASON,))
         if not result:
             await interaction.followup.send("❌ No final champions data found. Champions may not be saved yet.", ephemeral=True)
             return
 
-        score_final_champions_for_guild(guild_id)
-        update_leaderboard(guild_id)
-        mark_season_scored(guild_id, SEASON)
+        await run_blocking(score_final_champions_for_guild, guild_id)
+        await update_leaderboard(guild_id)
+        await mark_season_scored(guild_id, SEASON)
 
         await interaction.followup.send(f"✅ **The {SEASON}** season predictions have been scored!", ephemeral=True)
 
@@ -3132,7 +3296,7 @@ async def rescore_all(interaction: discord.Interaction):
 
         guild_id = interaction.guild.id
 
-        scored_races = await asyncio.to_thread(get_all_scored_races, guild_id)
+        scored_races = await get_all_scored_races(guild_id)
 
         if not scored_races:
             await interaction.followup.send("❌ No scored races found for this server.", ephemeral=True)
@@ -3143,17 +3307,14 @@ async def rescore_all(interaction: discord.Interaction):
             ephemeral=True
         )
 
-        # Clear existing scores
-        await asyncio.to_thread(clear_race_scores, guild_id)
-        await asyncio.to_thread(clear_scored_races, guild_id)
-
-        # Rescore each race
-        for race_number in scored_races:
-            await asyncio.to_thread(score_race_for_guild, race_number, guild_id)
-            await asyncio.to_thread(mark_race_scored, guild_id, race_number)
+        # Clear and rescore every race in one transaction
+        rescored = await run_blocking(rescore_races_for_guild, guild_id, scored_races)
+        if rescored is None:
+            await interaction.followup.send("❌ Rescoring failed, existing scores were kept.", ephemeral=True)
+            return
 
         # Rebuild leaderboard including crazy preds, bold preds etc
-        await asyncio.to_thread(update_leaderboard, guild_id)
+        await update_leaderboard(guild_id)
 
         await interaction.followup.send(
             f"✅ Rescored {len(scored_races)} race(s) and updated leaderboard!",
@@ -0,0 +1,184 @@
+# metrics.py
+"""In-process metrics and an optional Prometheus endpoint.
+
+Counters, gauges and histograms are plain thread-safe objects, so any module
+can record into them without Flask. start_metrics_server() serves them at
+/metrics from a daemon thread and only runs when METRICS_PORT is set. It binds
+to METRICS_ADDR, localhost by default, so nothing is exposed unless asked for.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+METRICS_ADDR = os.getenv("METRICS_ADDR", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0))  # 0 disables the server
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_registry = []
+_collectors = []
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+        self._values = {}  # sorted label items -> value
+        _registry.append(self)
+
+    @staticmethod
+    def _key(labels):
+        return tuple(sorted(labels.items()))
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_label_text(dict(key))} {value}")
+        return lines
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    def time(self, **labels):
+        """Context manager observing the duration of its block."""
+        return _Timer(self, labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(key, {**state, "counts": list(state["counts"])}) for key, state in self._values.items()]
+        for key, state in items:
+            labels = dict(key)
+            for bound, count in zip(self.buckets, state["counts"]):
+                lines.append(f"{self.name}_bucket{_label_text({**labels, 'le': bound})} {count}")
+            lines.append(f"{self.name}_bucket{_label_text({**labels, 'le': '+Inf'})} {state['count']}")
+            lines.append(f"{self.name}_sum{_label_text(labels)} {state['sum']}")
+            lines.append(f"{self.name}_count{_label_text(labels)} {state['count']}")
+        return lines
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start, **self._labels)
+        return False
+
+def register_collector(collect):
+    """Adds ``collect()`` -> [(name, value, labels)] read as gauges on every scrape."""
+    _collectors.append(collect)
+    return collect
+
+command_latency = Histogram(
+    "bot_command_latency_seconds", "Time from an application command interaction to its completion"
+)
+db_call_duration = Histogram(
+    "bot_db_call_duration_seconds", "Awaited database helper calls, including executor queueing"
+)
+fastf1_fetch_duration = Histogram(
+    "bot_fastf1_fetch_duration_seconds", "FastF1 schedule fetches and session loads"
+)
+loop_lag = Histogram(
+    "bot_event_loop_lag_seconds", "How late the event loop woke a sleeping monitor task",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+)
+watcher_state = Gauge("bot_watcher_state", "Watcher progress, timestamps in unix seconds")
+
+def render():
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+
+    seen = set()
+    for collect in _collectors:
+        try:
+            samples = collect()
+        except Exception:
+            logger.exception("Metrics collector %s failed", getattr(collect, "__name__", collect))
+            continue
+        for name, value, labels in samples:
+            if value is None:
+                continue
+            if name not in seen:
+                lines.append(f"# TYPE {name} gauge")
+                seen.add(name)
+            lines.append(f"{name}{_label_text(labels)} {float(value)}")
+    return "\n".join(lines) + "\n"
+
+async def monitor_loop_lag(interval=1.0):
+    """Records how late each ``interval`` sleep returns; runs until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        loop_lag.observe(max(0.0, loop.time() - start - interval))
+
+def start_metrics_server(addr=METRICS_ADDR, port=METRICS_PORT):
+    """Serves /metrics on a daemon thread. Returns the server, or None when disabled."""
+    if not port:
+        return None
+
+    from flask import Flask, Response
+    from werkzeug.serving import make_server
+
+    app = Flask("metrics")
+
+    @app.route("/metrics")
+    def metrics_endpoint():
+        return Response(render(), mimetype="text/plain; version=0.0.4")
+
+    server = make_server(addr, port, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, name="metrics", daemon=True)
+    thread.start()
+    logger.info("Metrics server listening on http://%s:%s/metrics", addr, port)
+    return server
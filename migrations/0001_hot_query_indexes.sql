@@ -0,0 +1,25 @@
+-- Indexes for lookups that used to scan whole tables
+
+-- get_race_number / force_score_race: race_results by race_name
+CREATE INDEX IF NOT EXISTS idx_race_results_race_name
+    ON race_results (race_name);
+
+-- get_race_end_time: scored_races by race_number alone (PK starts with guild_id)
+CREATE INDEX IF NOT EXISTS idx_scored_races_race_number
+    ON scored_races (race_number);
+
+-- scoring: predictions of one race across guilds
+CREATE INDEX IF NOT EXISTS idx_race_predictions_race_guild
+    ON race_predictions (race_number, guild_id);
+
+-- fetch_bold_predictions by race_name
+CREATE INDEX IF NOT EXISTS idx_bold_predictions_guild_race_name
+    ON bold_predictions (guild_id, race_name);
+
+-- get_correct_bold_predictions_of_server
+CREATE INDEX IF NOT EXISTS idx_correct_bold_predictions_guild_race_name
+    ON correct_bold_predictions (guild_id, race_name);
+
+-- get_crazy_predictions / count_crazy_predictions
+CREATE INDEX IF NOT EXISTS idx_crazy_predictions_guild_user_season
+    ON crazy_predictions (guild_id, user_id, season);
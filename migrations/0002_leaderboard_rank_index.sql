@@ -0,0 +1,4 @@
+-- Keyset leaderboard pages and get_user_rank: one guild in ranking order
+CREATE INDEX IF NOT EXISTS idx_leaderboard_rank
+    ON leaderboard (guild_id, total_points DESC, fully_correct_podiums DESC, correct_podiums DESC,
+                    correct_poles DESC, correct_fastest_laps DESC, correct_constructors DESC, user_id DESC);
@@ -0,0 +1,4 @@
+-- idx_race_predictions_latest repeated the race_predictions primary key
+-- (guild_id, user_id, race_number), which already serves the leaderboard's
+-- DISTINCT ON latest-username lookup with a backward scan
+DROP INDEX IF EXISTS idx_race_predictions_latest;
@@ -0,0 +1,69 @@
+-- leaderboard_mv, the leaderboard readers use with LEADERBOARD_MODE=materialized.
+-- Created WITH NO DATA so table-mode deployments pay nothing for it; init_db
+-- fills it on the first start in materialized mode. It must stay in step with
+-- database._leaderboard_select: definition changes ship as a new migration that
+-- drops and recreates the view. Replaces the copy init_db used to create.
+DROP MATERIALIZED VIEW IF EXISTS leaderboard_mv;
+
+CREATE MATERIALIZED VIEW leaderboard_mv AS
+    WITH combined_points AS (
+        SELECT guild_id, user_id, username, points FROM race_scores
+        UNION ALL
+        SELECT guild_id, user_id, username, points FROM final_scores
+        UNION ALL
+        SELECT guild_id, user_id, username, points FROM total_force_points
+        UNION ALL
+        SELECT guild_id, user_id, username, points FROM correct_bold_predictions
+        UNION ALL
+        SELECT guild_id, user_id, username, points FROM scored_crazy_predictions
+    ),
+    latest_username AS (
+        SELECT DISTINCT ON (guild_id, user_id) guild_id, user_id, username
+        FROM race_predictions
+        ORDER BY guild_id DESC, user_id DESC, race_number DESC
+    ),
+    total AS (
+        SELECT cp.guild_id, cp.user_id,
+            COALESCE(lu.username, MAX(cp.username)) AS username,
+            SUM(cp.points) AS total_points
+        FROM combined_points cp
+        LEFT JOIN latest_username lu ON lu.user_id = cp.user_id AND lu.guild_id = cp.guild_id
+        GROUP BY cp.guild_id, cp.user_id, lu.username
+    ),
+    tiebreakers AS (
+        SELECT
+            rp.guild_id,
+            rp.user_id,
+            COUNT(CASE WHEN rp.pos1 = rr.pos1 AND rp.pos2 = rr.pos2 AND rp.pos3 = rr.pos3 THEN 1 END) AS fully_correct_podiums,
+            COUNT(CASE WHEN rp.pos1 = rr.pos1 THEN 1 END) +
+            COUNT(CASE WHEN rp.pos2 = rr.pos2 THEN 1 END) +
+            COUNT(CASE WHEN rp.pos3 = rr.pos3 THEN 1 END) AS correct_podiums,
+            COUNT(CASE WHEN rp.pole = rr.pole THEN 1 END) AS correct_poles,
+            COUNT(CASE WHEN rp.fastest_lap = rr.fastest_lap THEN 1 END) AS correct_fastest_laps,
+            COUNT(CASE WHEN rp.constructor_winner = rr.constructor THEN 1 END) AS correct_constructors
+        FROM race_predictions rp
+        LEFT JOIN race_results rr ON rr.race_number = rp.race_number
+        GROUP BY rp.guild_id, rp.user_id
+    )
+    SELECT
+        t.guild_id,
+        t.user_id,
+        t.username,
+        t.total_points,
+        COALESCE(tb.fully_correct_podiums, 0) AS fully_correct_podiums,
+        COALESCE(tb.correct_podiums, 0) AS correct_podiums,
+        COALESCE(tb.correct_poles, 0) AS correct_poles,
+        COALESCE(tb.correct_fastest_laps, 0) AS correct_fastest_laps,
+        COALESCE(tb.correct_constructors, 0) AS correct_constructors
+    FROM total t
+    LEFT JOIN tiebreakers tb ON tb.user_id = t.user_id AND tb.guild_id = t.guild_id
+WITH NO DATA;
+
+-- REFRESH ... CONCURRENTLY needs a unique index covering every row
+CREATE UNIQUE INDEX idx_leaderboard_mv_guild_user
+    ON leaderboard_mv (guild_id, user_id);
+
+-- Keyset pages and get_user_rank, same order as idx_leaderboard_rank
+CREATE INDEX idx_leaderboard_mv_rank
+    ON leaderboard_mv (guild_id, total_points DESC, fully_correct_podiums DESC, correct_podiums DESC,
+                       correct_poles DESC, correct_fastest_laps DESC, correct_constructors DESC, user_id DESC);
@@ -0,0 +1,84 @@
+-- Leaderboard ranking columns can't be NULL: the keyset pager and get_user_rank
+-- compare them as one row value, and a NULL there matches no page. race_scores
+-- points are nullable, so SUM() could store a NULL total_points.
+UPDATE leaderboard SET total_points = 0 WHERE total_points IS NULL;
+UPDATE leaderboard SET fully_correct_podiums = 0 WHERE fully_correct_podiums IS NULL;
+UPDATE leaderboard SET correct_podiums = 0 WHERE correct_podiums IS NULL;
+UPDATE leaderboard SET correct_poles = 0 WHERE correct_poles IS NULL;
+UPDATE leaderboard SET correct_fastest_laps = 0 WHERE correct_fastest_laps IS NULL;
+UPDATE leaderboard SET correct_constructors = 0 WHERE correct_constructors IS NULL;
+
+ALTER TABLE leaderboard
+    ALTER COLUMN total_points SET DEFAULT 0,
+    ALTER COLUMN total_points SET NOT NULL,
+    ALTER COLUMN fully_correct_podiums SET NOT NULL,
+    ALTER COLUMN correct_podiums SET NOT NULL,
+    ALTER COLUMN correct_poles SET NOT NULL,
+    ALTER COLUMN correct_fastest_laps SET NOT NULL,
+    ALTER COLUMN correct_constructors SET NOT NULL;
+
+-- leaderboard_mv again, with total_points coalesced like database._leaderboard_select
+DROP MATERIALIZED VIEW IF EXISTS leaderboard_mv;
+
+CREATE MATERIALIZED VIEW leaderboard_mv AS
+    WITH combined_points AS (
+        SELECT guild_id, user_id, username, points FROM race_scores
+        UNION ALL
+        SELECT guild_id, user_id, username, points FROM final_scores
+        UNION ALL
+        SELECT guild_id, user_id, username, points FROM total_force_points
+        UNION ALL
+        SELECT guild_id, user_id, username, points FROM correct_bold_predictions
+        UNION ALL
+        SELECT guild_id, user_id, username, points FROM scored_crazy_predictions
+    ),
+    latest_username AS (
+        SELECT DISTINCT ON (guild_id, user_id) guild_id, user_id, username
+        FROM race_predictions
+        ORDER BY guild_id DESC, user_id DESC, race_number DESC
+    ),
+    total AS (
+        SELECT cp.guild_id, cp.user_id,
+            COALESCE(lu.username, MAX(cp.username)) AS username,
+            COALESCE(SUM(cp.points), 0) AS total_points
+        FROM combined_points cp
+        LEFT JOIN latest_username lu ON lu.user_id = cp.user_id AND lu.guild_id = cp.guild_id
+        GROUP BY cp.guild_id, cp.user_id, lu.username
+    ),
+    tiebreakers AS (
+        SELECT
+            rp.guild_id,
+            rp.user_id,
+            COUNT(CASE WHEN rp.pos1 = rr.pos1 AND rp.pos2 = rr.pos2 AND rp.pos3 = rr.pos3 THEN 1 END) AS fully_correct_podiums,
+            COUNT(CASE WHEN rp.pos1 = rr.pos1 THEN 1 END) +
+            COUNT(CASE WHEN rp.pos2 = rr.pos2 THEN 1 END) +
+            COUNT(CASE WHEN rp.pos3 = rr.pos3 THEN 1 END) AS correct_podiums,
+            COUNT(CASE WHEN rp.pole = rr.pole THEN 1 END) AS correct_poles,
+            COUNT(CASE WHEN rp.fastest_lap = rr.fastest_lap THEN 1 END) AS correct_fastest_laps,
+            COUNT(CASE WHEN rp.constructor_winner = rr.constructor THEN 1 END) AS correct_constructors
+        FROM race_predictions rp
+        LEFT JOIN race_results rr ON rr.race_number = rp.race_number
+        GROUP BY rp.guild_id, rp.user_id
+    )
+    SELECT
+        t.guild_id,
+        t.user_id,
+        t.username,
+        t.total_points,
+        COALESCE(tb.fully_correct_podiums, 0) AS fully_correct_podiums,
+        COALESCE(tb.correct_podiums, 0) AS correct_podiums,
+        COALESCE(tb.correct_poles, 0) AS correct_poles,
+        COALESCE(tb.correct_fastest_laps, 0) AS correct_fastest_laps,
+        COALESCE(tb.correct_constructors, 0) AS correct_constructors
+    FROM total t
+    LEFT JOIN tiebreakers tb ON tb.user_id = t.user_id AND tb.guild_id = t.guild_id
+WITH NO DATA;
+
+-- REFRESH ... CONCURRENTLY needs a unique index covering every row
+CREATE UNIQUE INDEX idx_leaderboard_mv_guild_user
+    ON leaderboard_mv (guild_id, user_id);
+
+-- Keyset pages and get_user_rank, same order as idx_leaderboard_rank
+CREATE INDEX idx_leaderboard_mv_rank
+    ON leaderboard_mv (guild_id, total_points DESC, fully_correct_podiums DESC, correct_podiums DESC,
+                       correct_poles DESC, correct_fastest_laps DESC, correct_constructors DESC, user_id DESC);
@@ -0,0 +1,118 @@
+# option_catalog.py
+"""Shared driver and constructor SelectOption templates.
+
+Templates are built from everyone who raced so far (the fallback lists below
+until the first race is in), rebuilt only once another round has finished, and
+copied per view, so opening a prediction view or changing a dropdown never
+rebuilds them. The latest race's grid comes first, in fallback list order with
+newcomers after it, then drivers and teams who only raced earlier rounds.
+"""
+import copy
+import logging
+import discord
+from FastF1_service import season_entrants, finished_rounds
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_DRIVERS = [
+    "VER","HAD","RUS","ANT","LEC","HAM","NOR","PIA",
+    "SAI","ALB","LAW","LIN","OCO","BEA","ALO","STR",
+    "PER","BOT","BOR","HUL","COL","GAS",]
+
+FALLBACK_CONSTRUCTORS = [
+    "Mercedes", "Red Bull Racing", "Ferrari", "McLaren",
+    "Haas F1 Team", "Racing Bulls", "Williams",
+    "Audi", "Cadillac", "Aston Martin", "Alpine"]
+
+# Discord rejects a select with more options than this
+MAX_OPTIONS = 25
+
+def _template(value, description=None):
+    return discord.SelectOption(label=value, value=value, description=description)
+
+def _in_fallback_order(values, fallback, current=()):
+    """``values`` in ``current`` first, each part sorted by position in ``fallback``;
+    values missing from ``fallback`` keep their order after the rest of their part."""
+    position = {value: i for i, value in enumerate(fallback)}
+    current = set(current)
+    return sorted(values, key=lambda value: (value not in current, position.get(value, len(position))))
+
+class OptionCatalog:
+    def __init__(self):
+        self.season = None
+        self.rounds = None
+        self._install(
+            tuple(_template(code) for code in FALLBACK_DRIVERS),
+            tuple(_template(team) for team in FALLBACK_CONSTRUCTORS),
+        )
+
+    def _install(self, drivers, constructors):
+        for kind, options in (("drivers", drivers), ("constructors", constructors)):
+            if len(options) > MAX_OPTIONS:
+                logger.warning("Option catalog has %s %s, dropping %s from the selects",
+                               len(options), kind, ", ".join(o.value for o in options[MAX_OPTIONS:]))
+        # One assignment, so a view never mixes templates of two updates
+        self._templates = {"drivers": drivers[:MAX_OPTIONS], "constructors": constructors[:MAX_OPTIONS]}
+
+    def update(self, season, entrants):
+        """Replaces the templates with ``entrants`` as returned by season_entrants."""
+        by_code = {d["code"]: d for d in entrants["drivers"]}
+        grid = [code for code in entrants["grid"] if code in by_code]
+        drivers = [by_code[code] for code in _in_fallback_order(by_code, FALLBACK_DRIVERS, grid)]
+        grid_teams = {by_code[code]["team"] for code in grid}
+        self._install(
+            tuple(
+                _template(d["code"], " · ".join(filter(None, (d["name"], d["team"])))[:100] or None)
+                for d in drivers
+            ),
+            tuple(_template(team) for team in
+                  _in_fallback_order(entrants["constructors"], FALLBACK_CONSTRUCTORS, grid_teams)),
+        )
+        self.season = season
+        self.rounds = entrants["rounds"]
+        logger.info("Option catalog for %s: %s drivers, %s constructors",
+                    season, len(drivers), len(entrants["constructors"]))
+
+    @property
+    def drivers(self):
+        return [option.value for option in self._templates["drivers"]]
+
+    @property
+    def constructors(self):
+        return [option.value for option in self._templates["constructors"]]
+
+    def _options(self, kind, selected, exclude):
+        options = []
+        for template in self._templates[kind]:
+            if template.value in exclude and template.value != selected:
+                continue
+            option = copy.copy(template)
+            option.default = template.value == selected
+            options.append(option)
+        return options
+
+    def driver_options(self, selected=None, exclude=()):
+        """Fresh driver options with ``selected`` as default, ``exclude`` left out unless selected."""
+        return self._options("drivers", selected, exclude)
+
+    def constructor_options(self, selected=None, exclude=()):
+        return self._options("constructors", selected, exclude)
+
+catalog = OptionCatalog()
+
+async def refresh_catalog(season):
+    """Rebuilds the catalog if a race of ``season`` ended since the last build.
+
+    Keeps the current catalog if the entrants can't be loaded; rounds that
+    failed to load are retried on the next call.
+    """
+    rounds = await finished_rounds(season)
+    if not rounds or (catalog.season == season and catalog.rounds == rounds):
+        return False
+    entrants = await season_entrants(season)
+    if not entrants or not entrants["drivers"]:
+        logger.info("No entrants for %s yet, keeping the %s option catalog",
+                    season, catalog.season or "fallback")
+        return False
+    catalog.update(season, entrants)
+    return True
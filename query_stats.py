@@ -0,0 +1,104 @@
+# query_stats.py
+"""Per-helper database query statistics and the slow-query log.
+
+database.py records every safe_* call, transaction and leaderboard rebuild
+here, tagged with the helper that issued it. A rolling window of recent
+durations per helper gives the percentiles. Totals cover the whole process.
+"""
+import logging
+import os
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 500))
+QUERY_STATS_WINDOW = int(os.getenv("QUERY_STATS_WINDOW", 1000))  # durations kept per helper
+
+def redact(params):
+    """Parameter shapes without their values, e.g. (<int>, <str len=8>)."""
+    if isinstance(params, dict):
+        return {key: redact(value) for key, value in params.items()}
+    if isinstance(params, (list, tuple)):
+        if len(params) > 10:
+            return f"<{type(params).__name__} len={len(params)}>"
+        return type(params)(redact(value) for value in params)
+    if params is None:
+        return None
+    if isinstance(params, (str, bytes)):
+        return f"<{type(params).__name__} len={len(params)}>"
+    return f"<{type(params).__name__}>"
+
+def _compact(query):
+    return " ".join(str(query).split())[:300]
+
+class _HelperStats:
+    __slots__ = ("calls", "errors", "rows", "total", "lock_wait", "max", "recent")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total = 0.0
+        self.lock_wait = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=QUERY_STATS_WINDOW)
+
+class QueryStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._helpers = {}  # helper name -> _HelperStats
+
+    def record(self, helper, kind, duration, rows=None, lock_wait=0.0, error=False, query=None, params=None):
+        """Adds one call; durations are seconds. Logs it if slower than SLOW_QUERY_MS."""
+        with self._lock:
+            stats = self._helpers.get(helper)
+            if stats is None:
+                stats = self._helpers[helper] = _HelperStats()
+            stats.calls += 1
+            stats.errors += bool(error)
+            stats.rows += rows or 0
+            stats.total += duration
+            stats.lock_wait += lock_wait
+            stats.max = max(stats.max, duration)
+            stats.recent.append(duration)
+
+        if duration * 1000 >= SLOW_QUERY_MS:
+            logger.warning(
+                "Slow query in %s (%s): %.0f ms, %s rows, %.0f ms waiting for locks | %s | params=%s",
+                helper, kind, duration * 1000, rows, lock_wait * 1000,
+                _compact(query) if query is not None else "-", redact(params)
+            )
+
+    @staticmethod
+    def _percentile(ordered, fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def stats(self):
+        """{helper: {calls, errors, rows, total_ms, lock_wait_ms, max_ms, p50_ms, p95_ms, p99_ms}}."""
+        with self._lock:
+            snapshot = {
+                helper: (s.calls, s.errors, s.rows, s.total, s.lock_wait, s.max, sorted(s.recent))
+                for helper, s in self._helpers.items()
+            }
+
+        result = {}
+        for helper, (calls, errors, rows, total, lock_wait, longest, ordered) in snapshot.items():
+            result[helper] = {
+                "calls": calls,
+                "errors": errors,
+                "rows": rows,
+                "total_ms": total * 1000,
+                "lock_wait_ms": lock_wait * 1000,
+                "max_ms": longest * 1000,
+                "p50_ms": self._percentile(ordered, 0.50) * 1000 if ordered else None,
+                "p95_ms": self._percentile(ordered, 0.95) * 1000 if ordered else None,
+                "p99_ms": self._percentile(ordered, 0.99) * 1000 if ordered else None,
+            }
+        return result
+
+    def top(self, n=10, key="total_ms"):
+        """The ``n`` helpers with the highest ``key``, for deciding what to index or cache."""
+        return sorted(self.stats().items(), key=lambda item: item[1][key] or 0, reverse=True)[:n]
+
+query_stats = QueryStats()
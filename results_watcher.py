@@ -1,129 +1,124 @@
 # results_watcher.py
-import asyncio
-import fastf1
-from config import CACHE_DIR
+import time
+from datetime import timedelta
 import logging
-import traceback
-import shutil
-from FastF1_service import race_results, sprint_results, get_race_end_time, get_standings_leaders
-from database import (save_race_results,
+from FastF1_service import weekend_results, get_race_end_time, get_standings_leaders, enforce_cache_policy
+from async_database import (save_race_results,
                       save_sprint_results, 
-                      update_leaderboard, 
                       get_prediction_channel,
                       is_race_scored,
-                      mark_race_scored,
-                      save_championship_leaders)
-from scoring import score_race_for_guild
-from get_now import get_now, TIME_MULTIPLE, SEASON
+                      save_championship_leaders,
+                      run_blocking)
+from scoring import score_race_for_all_guilds
+from announcer import dispatch, message_job
+from metrics import watcher_state
+from get_now import get_now, SEASON
 
 logger = logging.getLogger(__name__)
 
-async def poll_results_loop(bot):
-    await bot.wait_until_ready()
-
-    while not bot.is_closed():
-        try:
-            race_end_time = await get_race_end_time(get_now())
-            if race_end_time is None:
-                logger.info("No upcoming races found, season may be over. Waiting 24 hours...")
-                await asyncio.sleep(24 * 60 * 60 / TIME_MULTIPLE)
-                continue
-
-            delay = (race_end_time - get_now()).total_seconds()
-
-            while delay > 0:
-                logger.info("Waiting %.2f hours until next race ends...", delay / 3600 / TIME_MULTIPLE)
-
-                if delay > 24 * 3600:
-                    sleep = 6 * 3600
-                else:
-                    sleep = 30 * 60
-
-                await asyncio.sleep(min(delay, sleep) / TIME_MULTIPLE)
-                race_end_time = await get_race_end_time(get_now())
-                if race_end_time is None:
-                    break
-                delay = (race_end_time - get_now()).total_seconds()
-
-            logger.info("Race has ended, fetching results...")
-            race_data = await race_results()
-            if not race_data:
-                await asyncio.sleep(60 * 60 / TIME_MULTIPLE)
+async def process_race_end(bot):
+    """Fetches, saves and scores the last finished weekend. False if results aren't available yet."""
+    logger.info("Race has ended, fetching results...")
+    weekend = await weekend_results()
+    if not weekend:
+        return False
+
+    race_data = weekend["race"]
+    sprint_data = weekend["sprint"]
+    race_num = race_data['race_number']
+    await save_race_results(race_data)
+
+    if sprint_data:
+        await save_sprint_results(sprint_data)
+
+    standings = await get_standings_leaders(race_num=race_num)
+    if standings:
+        wdc_leader, wcc_leader = standings
+        await save_championship_leaders(SEASON, wdc_leader, wcc_leader)
+        logger.info("Standings leaders saved: WDC=%s, WCC=%s", wdc_leader, wcc_leader)
+
+    guilds = {guild.id: guild for guild in bot.guilds}
+    summaries = await run_blocking(score_race_for_all_guilds, race_num, list(guilds))
+
+    jobs = []
+    if summaries is None:
+        logger.error("Scoring failed for race %s", race_num)
+        warning = (
+            f"⚠️ **Automatic scoring failed for the {race_data['race_name']}.**\n"
+            f"Please use `/force_score_race` to score manually."
+        )
+        for guild_id, guild in guilds.items():
+            if await is_race_scored(guild_id, race_num):
                 continue
-
-            race_num = race_data['race_number']
-            results_saved = save_race_results(race_data)
-
-            sprint_data = await sprint_results()
-            if sprint_data:
-                save_sprint_results(sprint_data)
-
-            standings = await get_standings_leaders(race_num=race_num)
-            if standings:
-                wdc_leader, wcc_leader = standings
-                save_championship_leaders(SEASON, wdc_leader, wcc_leader)
-                logger.info("Standings leaders saved: WDC=%s, WCC=%s", wdc_leader, wcc_leader)
-
-            shutil.rmtree(CACHE_DIR, ignore_errors=True)
-            CACHE_DIR.mkdir(exist_ok=True)
-            fastf1.Cache.enable_cache(str(CACHE_DIR))
-
-            for guild in bot.guilds:
-                guild_id = guild.id
-
-                if is_race_scored(guild_id, race_num):
-                    logger.info("Race %s already scored for guild %s", race_num, guild.name)
-                    continue
-
-                channel_id = get_prediction_channel(guild_id)
-                channel = None
-                if channel_id:
-                    channel = guild.get_channel(channel_id)
-
-                try:
-                    score_race_for_guild(race_num, guild_id)
-                    update_leaderboard(guild_id)
-                    mark_race_scored(guild_id, race_num)
-                    logger.info("Race %s scored and leaderboard updated for guild %s", race_num, guild.name)
-
-                    if channel:
-                        if sprint_data:
-                            await channel.send(
-                                f"**The {race_data['race_name']} has been scored!**\n"
-                                f"*Race Results:*\n"
-                                f"| 1. {race_data['pos1']} | 2. {race_data['pos2']} | 3. {race_data['pos3']}\n"
-                                f"| Pole: {race_data['pole']} | Fastest Lap: {race_data['fastest_lap']}\n"
-                                f"| Constructor: {race_data['winning_constructor']}\n\n"
-                                f"*Sprint Results:*\n"
-                                f"| Winner: {sprint_data['sprint_winner']} | Pole: {sprint_data['sprint_pole']}"
-                            )
-                        else:
-                            await channel.send(
-                                f"**The {race_data['race_name']} has been scored!**\n"
-                                f"*Race Results:*\n"
-                                f"| 1. {race_data['pos1']} | 2. {race_data['pos2']} | 3. {race_data['pos3']}\n"
-                                f"| Pole: {race_data['pole']} | Fastest Lap: {race_data['fastest_lap']}\n"
-                                f"| Constructor: {race_data['winning_constructor']}\n\n"
-                            )
-
-                except Exception:
-                    logger.exception("Scoring failed for guild %s race %s", guild_id, race_num)
-                    if channel:
-                        await channel.send(
-                            f"⚠️ **Automatic scoring failed for the {race_data['race_name']}.**\n"
-                            f"Please use `/force_score_race` to score manually."
-                        )
-
-            logger.info("Sleeping 24 hours before checking for next race...")
-            await asyncio.sleep(24 * 60 * 60 / TIME_MULTIPLE)
-
+            channel = await _prediction_channel(guild)
+            if channel:
+                jobs.append(message_job(guild_id, channel, warning))
+        summaries = {}
+
+    logger.info("Race %s scored for %s of %s guilds", race_num, len(summaries), len(guilds))
+    watcher_state.set(time.time(), state="last_scoring_run")
+    watcher_state.set(race_num, state="last_scored_race")
+    watcher_state.set(len(summaries), state="guilds_scored")
+
+    announcement = (
+        f"**The {race_data['race_name']} has been scored!**\n"
+        f"*Race Results:*\n"
+        f"| 1. {race_data['pos1']} | 2. {race_data['pos2']} | 3. {race_data['pos3']}\n"
+        f"| Pole: {race_data['pole']} | Fastest Lap: {race_data['fastest_lap']}\n"
+        f"| Constructor: {race_data['winning_constructor']}\n\n"
+    )
+    if sprint_data:
+        announcement += (
+            f"*Sprint Results:*\n"
+            f"| Winner: {sprint_data['sprint_winner']} | Pole: {sprint_data['sprint_pole']}"
+        )
+
+    for guild_id, summary in summaries.items():
+        guild = guilds[guild_id]
+        logger.info("Race %s scored (%s predictions) and leaderboard updated for guild %s",
+                    race_num, summary["predictions"], guild.name)
+        try:
+            channel = await _prediction_channel(guild)
+            if channel:
+                jobs.append(message_job(guild_id, channel, announcement))
         except Exception:
-            logger.exception("poll_results_loop crashed")
-            await asyncio.sleep(60 * 60 / TIME_MULTIPLE)
-
+            logger.exception("Post-scoring update failed for guild %s race %s", guild_id, race_num)
+
+    await dispatch(jobs, f"Race {race_num} results")
+    return True
+
+async def _prediction_channel(guild):
+    channel_id = await get_prediction_channel(guild.id)
+    return guild.get_channel(channel_id) if channel_id else None
+
+async def schedule_next_race_end(scheduler, earliest=None):
+    race_end_time = await get_race_end_time(get_now())
+    if race_end_time is None:
+        logger.info("No upcoming races found, season may be over. Checking again in 24 hours...")
+        race_end_time = get_now() + timedelta(hours=24)
+    if earliest is not None:
+        race_end_time = max(race_end_time, earliest)
+    scheduler.schedule("race_end", race_end_time)
+
+def register_results_handlers(scheduler, bot):
+    @scheduler.on("race_end")
+    async def on_race_end(event):
+        try:
+            done = await process_race_end(bot)
+        except Exception:
+            logger.exception("Processing race results failed")
+            done = False
         finally:
-            #Cleaning cache and recreating it
-            shutil.rmtree(CACHE_DIR, ignore_errors=True)
-            CACHE_DIR.mkdir(exist_ok=True)
-            fastf1.Cache.enable_cache(str(CACHE_DIR))
-
+            # Keep the cache bounded instead of wiping data the next poll asks for again
+            try:
+                stats = await enforce_cache_policy()
+                logger.info("FastF1 cache: %s", stats)
+            except Exception:
+                logger.exception("FastF1 cache eviction failed")
+
+        if not done:
+            scheduler.schedule("race_end", get_now() + timedelta(hours=1))
+            return
+
+        # Wait at least a day before the next race, like the old polling loop did
+        await schedule_next_race_end(scheduler, earliest=get_now() + timedelta(hours=24))
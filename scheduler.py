@@ -0,0 +1,114 @@
+# scheduler.py
+"""Deadline scheduler driven by get_now().
+
+Watchers register handlers per event kind and schedule the next deadline of
+that kind; the scheduler sleeps until the earliest one (scaled by
+TIME_MULTIPLE, so MOVING_TARGET simulations fire on simulated time) instead of
+every watcher polling on its own.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+from get_now import get_now, TIME_MULTIPLE
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on one real sleep, so a suspended VM or clock jump is noticed within the hour
+MAX_SLEEP = 3600
+
+class ScheduledEvent:
+    __slots__ = ("kind", "when", "payload", "cancelled")
+
+    def __init__(self, kind, when, payload):
+        self.kind = kind
+        self.when = when
+        self.payload = payload
+        self.cancelled = False
+
+    def __repr__(self):
+        return f"<ScheduledEvent {self.kind} at {self.when.isoformat()}>"
+
+class Scheduler:
+    """Priority queue of deadlines with at most one pending event per kind.
+
+    Scheduling a kind again replaces its pending event. Handlers get the
+    ScheduledEvent and run as separate tasks, so a slow handler never delays
+    another deadline.
+    """
+
+    def __init__(self, now=get_now, time_multiple=TIME_MULTIPLE):
+        self._now = now
+        self._time_multiple = time_multiple
+        self._heap = []
+        self._seq = itertools.count()
+        self._pending = {}   # kind -> ScheduledEvent
+        self._handlers = {}  # kind -> [async handler]
+        self._running = set()
+        self._wakeup = asyncio.Event()
+
+    def on(self, kind):
+        """Decorator registering an async handler for ``kind``."""
+        def decorator(handler):
+            self._handlers.setdefault(kind, []).append(handler)
+            return handler
+        return decorator
+
+    def schedule(self, kind, when, **payload):
+        """Fires ``kind`` at ``when`` (aware datetime), replacing its pending event."""
+        if kind not in self._handlers:
+            logger.warning("Scheduling %s, which has no handler", kind)
+        self.cancel(kind)
+        event = ScheduledEvent(kind, when, payload)
+        self._pending[kind] = event
+        heapq.heappush(self._heap, (when, next(self._seq), event))
+        logger.info("Scheduled %s at %s", kind, when.isoformat())
+        self._wakeup.set()
+        return event
+
+    def cancel(self, kind):
+        event = self._pending.pop(kind, None)
+        if event is not None:
+            event.cancelled = True
+
+    def pending(self):
+        """Pending events, earliest first."""
+        return sorted(self._pending.values(), key=lambda e: e.when)
+
+    def _pop_due(self, now):
+        due = []
+        while self._heap and (self._heap[0][2].cancelled or self._heap[0][0] <= now):
+            _, _, event = heapq.heappop(self._heap)
+            if event.cancelled:
+                continue
+            del self._pending[event.kind]
+            due.append(event)
+        return due
+
+    async def _dispatch(self, event):
+        lateness = (self._now() - event.when).total_seconds()
+        logger.info("Firing %s (%.0fs after its deadline)", event.kind, lateness)
+        for handler in self._handlers.get(event.kind, []):
+            try:
+                await handler(event)
+            except Exception:
+                logger.exception("Scheduler handler %s for %s failed", handler.__name__, event.kind)
+
+    async def run(self):
+        while True:
+            self._wakeup.clear()
+
+            for event in self._pop_due(self._now()):
+                task = asyncio.create_task(self._dispatch(event))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = (self._heap[0][0] - self._now()).total_seconds() / self._time_multiple
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=min(max(delay, 0), MAX_SLEEP))
+            except asyncio.TimeoutError:
+                pass
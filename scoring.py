@@ -1,12 +1,20 @@
-from database import safe_execute, safe_fetch_all, safe_fetch_one, has_led_championship
-import threading
+import psycopg2.extras
+from database import (safe_execute,
+                      safe_fetch_all,
+                      safe_fetch_one,
+                      transaction,
+                      refresh_leaderboard_users,
+                      refresh_leaderboards,
+                      has_led_championship)
 import logging
 from get_now import SEASON
 from config import CONSTRUCTOR_ERGAST_MAP
+from utils.lazy_import import LazyModule
 
-logger = logging.getLogger(__name__)
+# Only the batch scorers need numpy, keep it out of the bot's startup imports
+np = LazyModule("numpy")
 
-db_lock = threading.Lock()
+logger = logging.getLogger(__name__)
 
 def score_top3(pred, result):
     pred_set = {pred["pos1"], pred["pos2"], pred["pos3"]}
@@ -84,43 +92,239 @@ def score_weekend(pred, result):
 
     return points
 
+PREDICTION_COLUMNS = ("pos1", "pos2", "pos3", "pole", "fastest_lap",
+                      "constructor_winner", "sprint_winner", "sprint_pole")
+
+def predictions_to_columns(rows):
+    """Turns DictCursor rows into {column: object array} for score_weekend_batch."""
+    return {
+        col: np.array([row[col] for row in rows], dtype=object)
+        for col in PREDICTION_COLUMNS
+    }
+
+def score_weekend_batch(columns, result):
+    """Vectorized score_weekend.
+
+    `columns` maps each name in PREDICTION_COLUMNS to an equal-length sequence
+    (dict of arrays/lists or a pandas DataFrame); `result` is one race_results
+    row. Returns an int array of points with the exact same rules as the
+    scalar scorers.
+    """
+    def col(name):
+        return np.asarray(columns[name], dtype=object)
+
+    p1, p2, p3 = col("pos1"), col("pos2"), col("pos3")
+    r1, r2, r3 = result["pos1"], result["pos2"], result["pos3"]
+
+    e1, e2, e3 = p1 == r1, p2 == r2, p3 == r3
+    any_exact = e1 | e2 | e3
+
+    # Set equality without building sets: every prediction is in the result and vice versa
+    def in_result(p):
+        return (p == r1) | (p == r2) | (p == r3)
+
+    def in_pred(r):
+        return (p1 == r) | (p2 == r) | (p3 == r)
+
+    same_set = (in_result(p1) & in_result(p2) & in_result(p3) &
+                in_pred(r1) & in_pred(r2) & in_pred(r3))
+
+    top3 = np.select(
+        [e1 & e2 & e3,
+         (e1 & e2) | (e1 & e3) | (e2 & e3),
+         same_set & any_exact,
+         any_exact,
+         same_set],
+        [10, 7, 5, 2, 4],
+        default=0
+    )
+
+    pole = col("pole")
+    points = top3
+    points += np.where(pole == result["pole"], 3, np.where(pole == result["quali_second"], 1, 0))
+    points += np.where(col("fastest_lap") == result["fastest_lap"], 3, 0)
+    points += np.where(col("constructor_winner") == result["constructor"], 2, 0)
+
+    # Sprint automatically gives 0 if None
+    if result["sprint_winner"] is not None:
+        points += np.where(col("sprint_winner") == result["sprint_winner"], 3, 0)
+    if result["sprint_pole"] is not None:
+        points += np.where(col("sprint_pole") == result["sprint_pole"], 3, 0)
+
+    return points.astype(int)
+
 def score_race_for_guild(race_number, guild_id):
     try:
-        predictions = safe_fetch_all(
-            "SELECT * FROM race_predictions WHERE race_number=%s AND guild_id=%s",
-            (race_number, guild_id)
-        )
-
         result = safe_fetch_one(
             "SELECT * FROM race_results WHERE race_number=%s",
             (race_number,)
         )
         if not result:
             return
-        
-        race_name = result['race_name']
 
+        predictions = safe_fetch_all(
+            "SELECT * FROM race_predictions WHERE race_number=%s AND guild_id=%s",
+            (race_number, guild_id)
+        )
         if not predictions:
             return
-        
-        for pred in predictions:
-            points = score_weekend(pred, result)
-            safe_execute(
-                """
+
+        race_name = result['race_name']
+        points = score_weekend_batch(predictions_to_columns(predictions), result)
+        rows = [
+            (guild_id, pred['user_id'], pred['username'], race_number, race_name, int(pts))
+            for pred, pts in zip(predictions, points)
+        ]
+
+        # One transaction for the whole guild instead of a round trip per user,
+        # and only the users who predicted this race get their leaderboard rows refreshed
+        with transaction() as cur:
+            psycopg2.extras.execute_values(cur, """
                 INSERT INTO race_scores (
                     guild_id, user_id, username, race_number, race_name, points
                 )
-                VALUES (%s, %s, %s, %s, %s, %s)
+                VALUES %s
                 ON CONFLICT(guild_id, user_id, race_number) DO UPDATE SET
                     username = excluded.username,
                     points = excluded.points
-                """,
-                (guild_id, pred['user_id'], pred['username'], race_number, race_name, points)
-            )
+            """, rows, page_size=1000)
+            refresh_leaderboard_users(cur, guild_id, [pred['user_id'] for pred in predictions])
 
     except Exception:
         logger.exception("score_race_for_guild error")
 
+def score_race_for_all_guilds(race_number, guild_ids):
+    """Scores a race for every given guild in one pass.
+
+    Guilds that already have the race in scored_races are skipped. Returns
+    {guild_id: summary} for the guilds scored now, or None if scoring failed.
+    """
+    try:
+        guild_ids = list(guild_ids)
+        if not guild_ids:
+            return {}
+
+        result = safe_fetch_one(
+            "SELECT * FROM race_results WHERE race_number=%s",
+            (race_number,)
+        )
+        if not result:
+            return {}
+
+        already_scored = safe_fetch_all(
+            "SELECT guild_id FROM scored_races WHERE race_number=%s AND guild_id = ANY(%s)",
+            (race_number, guild_ids)
+        )
+        if already_scored is None:
+            return None
+        already_scored = {row['guild_id'] for row in already_scored}
+        pending = [g for g in guild_ids if g not in already_scored]
+        if not pending:
+            return {}
+
+        predictions = safe_fetch_all(
+            "SELECT * FROM race_predictions WHERE race_number=%s AND guild_id = ANY(%s)",
+            (race_number, pending)
+        )
+        if predictions is None:
+            return None
+
+        race_name = result['race_name']
+        summaries = {g: {"race_name": race_name, "predictions": 0, "top_points": None} for g in pending}
+        score_rows = []
+        scored_users = {g: [] for g in pending}
+        all_points = score_weekend_batch(predictions_to_columns(predictions), result)
+        for pred, points in zip(predictions, all_points):
+            points = int(points)
+            score_rows.append((pred['guild_id'], pred['user_id'], pred['username'], race_number, race_name, points))
+            scored_users[pred['guild_id']].append(pred['user_id'])
+
+            summary = summaries[pred['guild_id']]
+            summary["predictions"] += 1
+            if summary["top_points"] is None or points > summary["top_points"]:
+                summary["top_points"] = points
+
+        # Scores, scored_races markers and the leaderboard rows of the scored users land
+        # together, so a crash can't leave a guild half scored
+        with transaction() as cur:
+            if score_rows:
+                psycopg2.extras.execute_values(cur, """
+                    INSERT INTO race_scores (
+                        guild_id, user_id, username, race_number, race_name, points
+                    )
+                    VALUES %s
+                    ON CONFLICT(guild_id, user_id, race_number) DO UPDATE SET
+                        username = excluded.username,
+                        points = excluded.points
+                """, score_rows, page_size=1000)
+            psycopg2.extras.execute_values(cur, """
+                INSERT INTO scored_races (guild_id, race_number)
+                VALUES %s
+                ON CONFLICT DO NOTHING
+            """, [(g, race_number) for g in pending], page_size=1000)
+            refresh_leaderboards(cur, scored_users)
+
+        return summaries
+
+    except Exception:
+        logger.exception("score_race_for_all_guilds error for race %s", race_number)
+        return None
+
+def rescore_races_for_guild(guild_id, race_numbers):
+    """Rescores the given races for one guild from scratch in a single transaction.
+
+    Returns the number of race_scores rows written, or None if rescoring failed.
+    """
+    try:
+        race_numbers = list(race_numbers)
+        results = safe_fetch_all(
+            "SELECT * FROM race_results WHERE race_number = ANY(%s)",
+            (race_numbers,)
+        )
+        predictions = safe_fetch_all(
+            "SELECT * FROM race_predictions WHERE guild_id=%s AND race_number = ANY(%s)",
+            (guild_id, race_numbers)
+        )
+        if results is None or predictions is None:
+            return None
+
+        preds_by_race = {}
+        for pred in predictions:
+            preds_by_race.setdefault(pred['race_number'], []).append(pred)
+
+        score_rows = []
+        for result in results:
+            race_preds = preds_by_race.get(result['race_number'])
+            if not race_preds:
+                continue
+            points = score_weekend_batch(predictions_to_columns(race_preds), result)
+            score_rows.extend(
+                (guild_id, pred['user_id'], pred['username'], result['race_number'], result['race_name'], int(pts))
+                for pred, pts in zip(race_preds, points)
+            )
+
+        with transaction() as cur:
+            cur.execute("DELETE FROM race_scores WHERE guild_id = %s", (guild_id,))
+            cur.execute("DELETE FROM scored_races WHERE guild_id = %s", (guild_id,))
+            if score_rows:
+                psycopg2.extras.execute_values(cur, """
+                    INSERT INTO race_scores (
+                        guild_id, user_id, username, race_number, race_name, points
+                    )
+                    VALUES %s
+                """, score_rows, page_size=1000)
+            psycopg2.extras.execute_values(cur, """
+                INSERT INTO scored_races (guild_id, race_number)
+                VALUES %s
+                ON CONFLICT DO NOTHING
+            """, [(guild_id, race_number) for race_number in race_numbers], page_size=1000)
+
+        return len(score_rows)
+
+    except Exception:
+        logger.exception("rescore_races_for_guild error for guild %s", guild_id)
+        return None
+
 def normalize_constructor(name):
     return CONSTRUCTOR_ERGAST_MAP.get(name, name.lower().replace(" ", "_"))
 
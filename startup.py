@@ -0,0 +1,123 @@
+# startup.py
+"""on_ready pipeline.
+
+Steps declare what they run after; everything else runs concurrently. on_ready
+fires again on every gateway reconnect, so steps marked once (the default)
+only run until they first succeed in this process. A failed step is retried on
+the next on_ready and the steps depending on it are skipped.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+COMMAND_HASH_FILE = Path(".command_tree_hash")
+
+class StartupStep:
+    __slots__ = ("name", "func", "after", "once")
+
+    def __init__(self, name, func, after, once):
+        self.name = name
+        self.func = func
+        self.after = tuple(after)
+        self.once = once
+
+class StartupPipeline:
+    def __init__(self):
+        self._steps = {}
+        self._done = set()
+        self._lock = asyncio.Lock()
+        self.runs = 0
+
+    def step(self, name, after=(), once=True):
+        """Decorator registering an async step ``name`` that starts once ``after`` succeeded."""
+        def decorator(func):
+            if name in self._steps:
+                raise ValueError(f"Startup step {name!r} registered twice")
+            missing = [dep for dep in after if dep not in self._steps]
+            if missing:
+                raise ValueError(f"Startup step {name!r} depends on unknown steps {missing}")
+            self._steps[name] = StartupStep(name, func, after, once)
+            return func
+        return decorator
+
+    async def run(self):
+        """Runs the pipeline; returns {name: (status, seconds)}."""
+        # A reconnect during a slow startup waits instead of starting a second run
+        async with self._lock:
+            self.runs += 1
+            started = time.monotonic()
+            report = {}
+            tasks = {}
+
+            async def run_step(step):
+                for dep in step.after:
+                    if not await tasks[dep]:
+                        report[step.name] = (f"skipped ({dep} failed)", 0.0)
+                        return False
+                if step.once and step.name in self._done:
+                    report[step.name] = ("done earlier", 0.0)
+                    return True
+
+                step_started = time.monotonic()
+                try:
+                    result = await step.func()
+                except Exception:
+                    logger.exception("Startup step %s failed", step.name)
+                    report[step.name] = ("failed", time.monotonic() - step_started)
+                    return False
+                self._done.add(step.name)
+                # A step returning a string reports it instead of "ok", e.g. "skipped (unchanged)"
+                report[step.name] = (result if isinstance(result, str) else "ok",
+                                     time.monotonic() - step_started)
+                return True
+
+            # Registration order is a valid topological order, dependencies must exist first
+            for step in self._steps.values():
+                tasks[step.name] = asyncio.ensure_future(run_step(step))
+            await asyncio.gather(*tasks.values())
+
+            total = time.monotonic() - started
+            lines = [f"  {name:<20} {status:<24} {seconds * 1000:8.0f} ms"
+                     for name, (status, seconds) in report.items()]
+            logger.info("Startup run %s finished in %.0f ms\n%s", self.runs, total * 1000, "\n".join(lines))
+            return report
+
+def _command_payload(tree, command):
+    try:
+        return command.to_dict(tree)
+    except TypeError:  # discord.py < 2.4
+        return command.to_dict()
+
+def command_tree_hash(tree, application_id):
+    payload = sorted(
+        (_command_payload(tree, command) for command in tree.get_commands()),
+        key=lambda c: (c.get("type", 1), c["name"])
+    )
+    data = json.dumps({"application_id": application_id, "commands": payload},
+                      sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+async def sync_command_tree(tree, application_id):
+    """Syncs global commands unless they hash the same as at the last successful sync."""
+    digest = command_tree_hash(tree, application_id)
+    try:
+        previous = COMMAND_HASH_FILE.read_text().strip()
+    except OSError:
+        previous = None
+
+    if previous == digest:
+        logger.info("Command tree unchanged (%s), skipping sync", digest[:12])
+        return "skipped (unchanged)"
+
+    synced = await tree.sync()
+    try:
+        COMMAND_HASH_FILE.write_text(digest)
+    except OSError:
+        logger.warning("Could not write %s, commands will sync again next start", COMMAND_HASH_FILE)
+    logger.info("Synced %s commands (%s)", len(synced), digest[:12])
+    return f"synced {len(synced)}"
@@ -0,0 +1,72 @@
+"""score_weekend_batch must give every user exactly what score_weekend gives them."""
+import itertools
+import random
+
+import pytest
+
+# scoring imports database, which needs the driver installed (not a running server)
+pytest.importorskip("psycopg2")
+pytest.importorskip("dotenv")
+np = pytest.importorskip("numpy")
+
+from scoring import PREDICTION_COLUMNS, predictions_to_columns, score_weekend, score_weekend_batch
+
+DRIVERS = ["VER", "NOR", "LEC", "PIA", "HAM"]
+TEAMS = ["McLaren", "Ferrari", "Red Bull Racing"]
+
+RESULT = {
+    "pos1": "VER", "pos2": "NOR", "pos3": "LEC",
+    "pole": "NOR", "quali_second": "VER", "fastest_lap": "PIA",
+    "constructor": "McLaren", "sprint_winner": "LEC", "sprint_pole": "VER",
+}
+NO_SPRINT = {**RESULT, "sprint_winner": None, "sprint_pole": None}
+
+def _prediction(podium, pole="NOR", fastest_lap="PIA", constructor="McLaren",
+                sprint_winner="LEC", sprint_pole="HAM"):
+    pos1, pos2, pos3 = podium
+    return {"pos1": pos1, "pos2": pos2, "pos3": pos3, "pole": pole, "fastest_lap": fastest_lap,
+            "constructor_winner": constructor, "sprint_winner": sprint_winner, "sprint_pole": sprint_pole}
+
+def _assert_parity(predictions, result):
+    batch = score_weekend_batch(predictions_to_columns(predictions), result)
+    assert batch.tolist() == [score_weekend(p, result) for p in predictions]
+
+@pytest.mark.parametrize("result", [RESULT, NO_SPRINT], ids=["sprint", "no_sprint"])
+def test_every_podium(result):
+    # All orderings of the pool cover every score_top3 branch, 10 down to 0
+    predictions = [_prediction(podium) for podium in itertools.permutations(DRIVERS, 3)]
+    _assert_parity(predictions, result)
+
+@pytest.mark.parametrize("result", [RESULT, NO_SPRINT], ids=["sprint", "no_sprint"])
+def test_missing_picks(result):
+    predictions = [
+        _prediction((None, None, None), pole=None, fastest_lap=None, constructor=None,
+                    sprint_winner=None, sprint_pole=None),
+        _prediction(("VER", None, "LEC"), pole=None),
+        _prediction((None, "NOR", None), sprint_winner=None),
+        _prediction(("LEC", "VER", None), pole="VER", constructor=None),
+        _prediction(("VER", "VER", "VER")),
+    ]
+    _assert_parity(predictions, result)
+
+@pytest.mark.parametrize("result", [RESULT, NO_SPRINT], ids=["sprint", "no_sprint"])
+def test_random_predictions(result):
+    rng = random.Random(2026)
+    picks = DRIVERS + [None]
+    predictions = [
+        _prediction(
+            [rng.choice(picks) for _ in range(3)],
+            pole=rng.choice(picks),
+            fastest_lap=rng.choice(picks),
+            constructor=rng.choice(TEAMS + [None]),
+            sprint_winner=rng.choice(picks),
+            sprint_pole=rng.choice(picks),
+        )
+        for _ in range(500)
+    ]
+    _assert_parity(predictions, result)
+
+def test_accepts_plain_sequences():
+    predictions = [_prediction(("VER", "NOR", "LEC")), _prediction(("HAM", "PIA", None))]
+    columns = {col: [p[col] for p in predictions] for col in PREDICTION_COLUMNS}
+    assert score_weekend_batch(columns, RESULT).tolist() == [score_weekend(p, RESULT) for p in predictions]
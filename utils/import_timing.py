@@ -0,0 +1,100 @@
+"""Opt-in import profiling, enabled with IMPORT_TIMING=1.
+
+main.py imports this first; with the variable set, every module executed
+afterwards is timed and report() logs the slowest modules and top-level
+packages. mark() always logs the time since process start.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PROCESS_START = time.perf_counter()
+
+_records = {}  # module name -> (inclusive seconds, self seconds)
+_local = threading.local()
+_enabled = False
+
+class _TimedLoader:
+    def __init__(self, loader, name):
+        self._loader = loader
+        self._name = name
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            _records[self._name] = (elapsed, elapsed - children)
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+class _TimingFinder:
+    """Meta path finder that wraps the loader every other finder returns."""
+
+    @classmethod
+    def find_spec(cls, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is cls:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(name, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, name)
+            return spec
+        return None
+
+def enable_from_env():
+    global _enabled
+    if _enabled or os.getenv("IMPORT_TIMING", "").lower() not in ("1", "true", "yes"):
+        return False
+    sys.meta_path.insert(0, _TimingFinder)
+    _enabled = True
+    return True
+
+def mark(label):
+    """Logs seconds since process start, plus the import report when profiling is on."""
+    logger.info("Startup: %s after %.0f ms", label, (time.perf_counter() - PROCESS_START) * 1000)
+    if _enabled:
+        report()
+
+def report(top=20):
+    if not _records:
+        return
+    records = dict(_records)
+    _records.clear()
+
+    by_package = {}
+    for name, (_, self_time) in records.items():
+        package = name.split(".", 1)[0]
+        by_package[package] = by_package.get(package, 0.0) + self_time
+
+    packages = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+    modules = sorted(records.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    logger.info(
+        "Imported %s modules in %.0f ms\nBy package (self time):\n%s\nSlowest modules (self / cumulative):\n%s",
+        len(records),
+        sum(self_time for _, self_time in records.values()) * 1000,
+        "\n".join(f"  {package:<30} {seconds * 1000:8.1f} ms" for package, seconds in packages),
+        "\n".join(f"  {name:<45} {self_time * 1000:8.1f} / {inclusive * 1000:8.1f} ms"
+                  for name, (inclusive, self_time) in modules),
+    )